@@ -1,3 +1,4 @@
 pyside6-uic minesweeper_window.ui -o minesweeper_window_ui.py
 pyside6-uic minesweeper_settings.ui -o minesweeper_settings_ui.py
 pyside6-uic minesweeper_about.ui -o minesweeper_about_ui.py
+pyside6-uic minesweeper_stats.ui -o minesweeper_stats_ui.py
@@ -15,22 +15,23 @@ from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
     QFont, QFontDatabase, QGradient, QIcon,
     QImage, QKeySequence, QLinearGradient, QPainter,
     QPalette, QPixmap, QRadialGradient, QTransform)
-from PySide6.QtWidgets import (QAbstractButton, QApplication, QDialog, QDialogButtonBox,
-    QFrame, QGridLayout, QLabel, QLayout,
-    QSizePolicy, QSpacerItem, QSpinBox, QWidget)
+from PySide6.QtWidgets import (QAbstractButton, QApplication, QCheckBox, QDialog,
+    QDialogButtonBox, QFrame, QGridLayout, QLabel,
+    QLayout, QSizePolicy, QSpacerItem, QSpinBox,
+    QWidget)
 
 class Ui_MinesweeperSettings(object):
     def setupUi(self, MinesweeperSettings):
         if not MinesweeperSettings.objectName():
             MinesweeperSettings.setObjectName(u"MinesweeperSettings")
-        MinesweeperSettings.resize(174, 184)
+        MinesweeperSettings.resize(174, 208)
         self.gridLayout = QGridLayout(MinesweeperSettings)
         self.gridLayout.setObjectName(u"gridLayout")
         self.gridLayout.setSizeConstraint(QLayout.SizeConstraint.SetFixedSize)
         self.spinBox_animationPeriod = QSpinBox(MinesweeperSettings)
         self.spinBox_animationPeriod.setObjectName(u"spinBox_animationPeriod")
 
-        self.gridLayout.addWidget(self.spinBox_animationPeriod, 5, 2, 1, 1)
+        self.gridLayout.addWidget(self.spinBox_animationPeriod, 7, 2, 1, 1)
 
         self.label_mines = QLabel(MinesweeperSettings)
         self.label_mines.setObjectName(u"label_mines")
@@ -42,7 +43,7 @@ class Ui_MinesweeperSettings(object):
         self.buttonBox.setOrientation(Qt.Orientation.Horizontal)
         self.buttonBox.setStandardButtons(QDialogButtonBox.StandardButton.Cancel|QDialogButtonBox.StandardButton.Ok)
 
-        self.gridLayout.addWidget(self.buttonBox, 11, 0, 1, 3)
+        self.gridLayout.addWidget(self.buttonBox, 12, 0, 1, 3)
 
         self.spinBox_mines = QSpinBox(MinesweeperSettings)
         self.spinBox_mines.setObjectName(u"spinBox_mines")
@@ -52,7 +53,7 @@ class Ui_MinesweeperSettings(object):
         self.label_animationPeriod = QLabel(MinesweeperSettings)
         self.label_animationPeriod.setObjectName(u"label_animationPeriod")
 
-        self.gridLayout.addWidget(self.label_animationPeriod, 4, 0, 2, 2)
+        self.gridLayout.addWidget(self.label_animationPeriod, 6, 0, 2, 2)
 
         self.spinBox_rows = QSpinBox(MinesweeperSettings)
         self.spinBox_rows.setObjectName(u"spinBox_rows")
@@ -76,14 +77,24 @@ class Ui_MinesweeperSettings(object):
 
         self.verticalSpacer = QSpacerItem(20, 20, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Expanding)
 
-        self.gridLayout.addItem(self.verticalSpacer, 10, 0, 1, 1)
+        self.gridLayout.addItem(self.verticalSpacer, 11, 0, 1, 1)
+
+        self.checkBox_noGuess = QCheckBox(MinesweeperSettings)
+        self.checkBox_noGuess.setObjectName(u"checkBox_noGuess")
+
+        self.gridLayout.addWidget(self.checkBox_noGuess, 3, 0, 1, 3)
+
+        self.checkBox_endless = QCheckBox(MinesweeperSettings)
+        self.checkBox_endless.setObjectName(u"checkBox_endless")
+
+        self.gridLayout.addWidget(self.checkBox_endless, 4, 0, 1, 3)
 
         self.line = QFrame(MinesweeperSettings)
         self.line.setObjectName(u"line")
         self.line.setFrameShape(QFrame.Shape.HLine)
         self.line.setFrameShadow(QFrame.Shadow.Sunken)
 
-        self.gridLayout.addWidget(self.line, 3, 0, 1, 3)
+        self.gridLayout.addWidget(self.line, 5, 0, 1, 3)
 
 
         self.retranslateUi(MinesweeperSettings)
@@ -99,5 +110,13 @@ class Ui_MinesweeperSettings(object):
         self.label_animationPeriod.setText(QCoreApplication.translate("MinesweeperSettings", u"Animation period:", None))
         self.label_rows.setText(QCoreApplication.translate("MinesweeperSettings", u"Rows (height):", None))
         self.label_cols.setText(QCoreApplication.translate("MinesweeperSettings", u"Columns (width):", None))
+#if QT_CONFIG(tooltip)
+        self.checkBox_noGuess.setToolTip(QCoreApplication.translate("MinesweeperSettings", u"Every field can be solved by logic from the first click", None))
+#endif // QT_CONFIG(tooltip)
+        self.checkBox_noGuess.setText(QCoreApplication.translate("MinesweeperSettings", u"No guessing", None))
+#if QT_CONFIG(tooltip)
+        self.checkBox_endless.setToolTip(QCoreApplication.translate("MinesweeperSettings", u"Field without borders, mines density is taken from rows, columns and mines", None))
+#endif // QT_CONFIG(tooltip)
+        self.checkBox_endless.setText(QCoreApplication.translate("MinesweeperSettings", u"Endless field", None))
     # retranslateUi
 
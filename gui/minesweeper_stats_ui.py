@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'minesweeper_stats.ui'
+##
+## Created by: Qt User Interface Compiler version 6.9.2
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import (QCoreApplication, QDate, QDateTime, QLocale,
+    QMetaObject, QObject, QPoint, QRect,
+    QSize, QTime, QUrl, Qt)
+from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
+    QFont, QFontDatabase, QGradient, QIcon,
+    QImage, QKeySequence, QLinearGradient, QPainter,
+    QPalette, QPixmap, QRadialGradient, QTransform)
+from PySide6.QtWidgets import (QAbstractButton, QAbstractItemView, QApplication, QComboBox,
+    QDialog, QDialogButtonBox, QHBoxLayout, QHeaderView,
+    QLabel, QSizePolicy, QTableWidget, QTableWidgetItem,
+    QVBoxLayout, QWidget)
+
+class Ui_MinesweeperStats(object):
+    def setupUi(self, MinesweeperStats):
+        if not MinesweeperStats.objectName():
+            MinesweeperStats.setObjectName(u"MinesweeperStats")
+        MinesweeperStats.resize(480, 400)
+        self.verticalLayout = QVBoxLayout(MinesweeperStats)
+        self.verticalLayout.setObjectName(u"verticalLayout")
+        self.horizontalLayout_preset = QHBoxLayout()
+        self.horizontalLayout_preset.setObjectName(u"horizontalLayout_preset")
+        self.label_preset = QLabel(MinesweeperStats)
+        self.label_preset.setObjectName(u"label_preset")
+
+        self.horizontalLayout_preset.addWidget(self.label_preset)
+
+        self.comboBox_preset = QComboBox(MinesweeperStats)
+        self.comboBox_preset.setObjectName(u"comboBox_preset")
+        sizePolicy = QSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.comboBox_preset.sizePolicy().hasHeightForWidth())
+        self.comboBox_preset.setSizePolicy(sizePolicy)
+
+        self.horizontalLayout_preset.addWidget(self.comboBox_preset)
+
+
+        self.verticalLayout.addLayout(self.horizontalLayout_preset)
+
+        self.label_summary = QLabel(MinesweeperStats)
+        self.label_summary.setObjectName(u"label_summary")
+
+        self.verticalLayout.addWidget(self.label_summary)
+
+        self.tableWidget_leaderboard = QTableWidget(MinesweeperStats)
+        if (self.tableWidget_leaderboard.columnCount() < 5):
+            self.tableWidget_leaderboard.setColumnCount(5)
+        __qtablewidgetitem = QTableWidgetItem()
+        self.tableWidget_leaderboard.setHorizontalHeaderItem(0, __qtablewidgetitem)
+        __qtablewidgetitem1 = QTableWidgetItem()
+        self.tableWidget_leaderboard.setHorizontalHeaderItem(1, __qtablewidgetitem1)
+        __qtablewidgetitem2 = QTableWidgetItem()
+        self.tableWidget_leaderboard.setHorizontalHeaderItem(2, __qtablewidgetitem2)
+        __qtablewidgetitem3 = QTableWidgetItem()
+        self.tableWidget_leaderboard.setHorizontalHeaderItem(3, __qtablewidgetitem3)
+        __qtablewidgetitem4 = QTableWidgetItem()
+        self.tableWidget_leaderboard.setHorizontalHeaderItem(4, __qtablewidgetitem4)
+        self.tableWidget_leaderboard.setObjectName(u"tableWidget_leaderboard")
+        self.tableWidget_leaderboard.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.tableWidget_leaderboard.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+
+        self.verticalLayout.addWidget(self.tableWidget_leaderboard)
+
+        self.buttonBox = QDialogButtonBox(MinesweeperStats)
+        self.buttonBox.setObjectName(u"buttonBox")
+        self.buttonBox.setOrientation(Qt.Orientation.Horizontal)
+        self.buttonBox.setStandardButtons(QDialogButtonBox.StandardButton.Close)
+
+        self.verticalLayout.addWidget(self.buttonBox)
+
+
+        self.retranslateUi(MinesweeperStats)
+        self.buttonBox.rejected.connect(MinesweeperStats.reject)
+
+        QMetaObject.connectSlotsByName(MinesweeperStats)
+    # setupUi
+
+    def retranslateUi(self, MinesweeperStats):
+        MinesweeperStats.setWindowTitle(QCoreApplication.translate("MinesweeperStats", u"Dialog", None))
+        self.label_preset.setText(QCoreApplication.translate("MinesweeperStats", u"Field (rows x columns, mines):", None))
+        self.label_summary.setText(QCoreApplication.translate("MinesweeperStats", u"No finished games", None))
+        ___qtablewidgetitem = self.tableWidget_leaderboard.horizontalHeaderItem(0)
+        ___qtablewidgetitem.setText(QCoreApplication.translate("MinesweeperStats", u"Time", None));
+        ___qtablewidgetitem1 = self.tableWidget_leaderboard.horizontalHeaderItem(1)
+        ___qtablewidgetitem1.setText(QCoreApplication.translate("MinesweeperStats", u"3BV", None));
+        ___qtablewidgetitem2 = self.tableWidget_leaderboard.horizontalHeaderItem(2)
+        ___qtablewidgetitem2.setText(QCoreApplication.translate("MinesweeperStats", u"3BV/s", None));
+        ___qtablewidgetitem3 = self.tableWidget_leaderboard.horizontalHeaderItem(3)
+        ___qtablewidgetitem3.setText(QCoreApplication.translate("MinesweeperStats", u"Clicks", None));
+        ___qtablewidgetitem4 = self.tableWidget_leaderboard.horizontalHeaderItem(4)
+        ___qtablewidgetitem4.setText(QCoreApplication.translate("MinesweeperStats", u"Date", None));
+    # retranslateUi
+
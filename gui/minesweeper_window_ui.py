@@ -19,8 +19,8 @@ from PySide6.QtGui import (QAction, QBrush, QColor, QConicalGradient,
 from PySide6.QtWidgets import (QAbstractSpinBox, QApplication, QFrame, QGridLayout,
     QHBoxLayout, QHeaderView, QLCDNumber, QLabel,
     QMainWindow, QMenu, QMenuBar, QSizePolicy,
-    QSpacerItem, QTableWidget, QTableWidgetItem, QTimeEdit,
-    QVBoxLayout, QWidget)
+    QSpacerItem, QTableView, QTimeEdit, QVBoxLayout,
+    QWidget)
 
 class Ui_MinesweeperWindow(object):
     def setupUi(self, MinesweeperWindow):
@@ -29,8 +29,14 @@ class Ui_MinesweeperWindow(object):
         MinesweeperWindow.resize(800, 600)
         self.action_restartGame = QAction(MinesweeperWindow)
         self.action_restartGame.setObjectName(u"action_restartGame")
+        self.action_resolveObvious = QAction(MinesweeperWindow)
+        self.action_resolveObvious.setObjectName(u"action_resolveObvious")
         self.action_settings = QAction(MinesweeperWindow)
         self.action_settings.setObjectName(u"action_settings")
+        self.action_statistics = QAction(MinesweeperWindow)
+        self.action_statistics.setObjectName(u"action_statistics")
+        self.action_spectate = QAction(MinesweeperWindow)
+        self.action_spectate.setObjectName(u"action_spectate")
         self.action_aboutProgram = QAction(MinesweeperWindow)
         self.action_aboutProgram.setObjectName(u"action_aboutProgram")
         self.action_themeLight = QAction(MinesweeperWindow)
@@ -39,6 +45,14 @@ class Ui_MinesweeperWindow(object):
         self.action_themeDark = QAction(MinesweeperWindow)
         self.action_themeDark.setObjectName(u"action_themeDark")
         self.action_themeDark.setCheckable(True)
+        self.action_showProbabilities = QAction(MinesweeperWindow)
+        self.action_showProbabilities.setObjectName(u"action_showProbabilities")
+        self.action_showProbabilities.setCheckable(True)
+        self.action_performanceOverlay = QAction(MinesweeperWindow)
+        self.action_performanceOverlay.setObjectName(u"action_performanceOverlay")
+        self.action_performanceOverlay.setCheckable(True)
+        self.action_exportProfile = QAction(MinesweeperWindow)
+        self.action_exportProfile.setObjectName(u"action_exportProfile")
         self.centralwidget = QWidget(MinesweeperWindow)
         self.centralwidget.setObjectName(u"centralwidget")
         self.verticalLayout = QVBoxLayout(self.centralwidget)
@@ -132,15 +146,15 @@ class Ui_MinesweeperWindow(object):
         self.gridLayout_field = QGridLayout()
         self.gridLayout_field.setSpacing(0)
         self.gridLayout_field.setObjectName(u"gridLayout_field")
-        self.tableWidget = QTableWidget(self.centralwidget)
-        self.tableWidget.setObjectName(u"tableWidget")
-        self.tableWidget.viewport().setProperty(u"cursor", QCursor(Qt.CursorShape.PointingHandCursor))
-        self.tableWidget.horizontalHeader().setMinimumSectionSize(25)
-        self.tableWidget.horizontalHeader().setDefaultSectionSize(50)
-        self.tableWidget.verticalHeader().setMinimumSectionSize(25)
-        self.tableWidget.verticalHeader().setDefaultSectionSize(50)
+        self.tableView = QTableView(self.centralwidget)
+        self.tableView.setObjectName(u"tableView")
+        self.tableView.viewport().setProperty(u"cursor", QCursor(Qt.CursorShape.PointingHandCursor))
+        self.tableView.horizontalHeader().setMinimumSectionSize(25)
+        self.tableView.horizontalHeader().setDefaultSectionSize(50)
+        self.tableView.verticalHeader().setMinimumSectionSize(25)
+        self.tableView.verticalHeader().setDefaultSectionSize(50)
 
-        self.gridLayout_field.addWidget(self.tableWidget, 0, 0, 1, 1)
+        self.gridLayout_field.addWidget(self.tableView, 0, 0, 1, 1)
 
 
         self.verticalLayout.addLayout(self.gridLayout_field)
@@ -163,10 +177,19 @@ class Ui_MinesweeperWindow(object):
         self.menubar.addAction(self.menu_vIew.menuAction())
         self.menubar.addAction(self.menu_help.menuAction())
         self.menu_settings.addAction(self.action_restartGame)
+        self.menu_settings.addAction(self.action_resolveObvious)
         self.menu_settings.addSeparator()
         self.menu_settings.addAction(self.action_settings)
+        self.menu_settings.addAction(self.action_statistics)
+        self.menu_settings.addSeparator()
+        self.menu_settings.addAction(self.action_spectate)
+        self.menu_help.addAction(self.action_performanceOverlay)
+        self.menu_help.addAction(self.action_exportProfile)
+        self.menu_help.addSeparator()
         self.menu_help.addAction(self.action_aboutProgram)
         self.menu_vIew.addAction(self.menu_theme.menuAction())
+        self.menu_vIew.addSeparator()
+        self.menu_vIew.addAction(self.action_showProbabilities)
         self.menu_theme.addAction(self.action_themeLight)
         self.menu_theme.addAction(self.action_themeDark)
 
@@ -178,10 +201,16 @@ class Ui_MinesweeperWindow(object):
     def retranslateUi(self, MinesweeperWindow):
         MinesweeperWindow.setWindowTitle(QCoreApplication.translate("MinesweeperWindow", u"MainWindow", None))
         self.action_restartGame.setText(QCoreApplication.translate("MinesweeperWindow", u"Restart game", None))
+        self.action_resolveObvious.setText(QCoreApplication.translate("MinesweeperWindow", u"Flag and uncover obvious cells", None))
         self.action_settings.setText(QCoreApplication.translate("MinesweeperWindow", u"Settings", None))
+        self.action_statistics.setText(QCoreApplication.translate("MinesweeperWindow", u"Statistics", None))
+        self.action_spectate.setText(QCoreApplication.translate("MinesweeperWindow", u"Spectate server game...", None))
         self.action_aboutProgram.setText(QCoreApplication.translate("MinesweeperWindow", u"About program", None))
         self.action_themeLight.setText(QCoreApplication.translate("MinesweeperWindow", u"Light", None))
         self.action_themeDark.setText(QCoreApplication.translate("MinesweeperWindow", u"Dark", None))
+        self.action_showProbabilities.setText(QCoreApplication.translate("MinesweeperWindow", u"Mine probabilities", None))
+        self.action_performanceOverlay.setText(QCoreApplication.translate("MinesweeperWindow", u"Performance overlay", None))
+        self.action_exportProfile.setText(QCoreApplication.translate("MinesweeperWindow", u"Export profile...", None))
         self.label_cellsUncovered.setText(QCoreApplication.translate("MinesweeperWindow", u"Uncovered cells:", None))
         self.label_1.setText(QCoreApplication.translate("MinesweeperWindow", u"/", None))
         self.label_cellsFlagged.setText(QCoreApplication.translate("MinesweeperWindow", u"Flagged cells:", None))
@@ -1,19 +1,38 @@
-"""Minesweeper game based on PySide6."""
+"""Minesweeper game based on PySide6.
 
+Set MINESWEEPER_STARTUP_LOG environment variable to print duration of startup phases.
+"""
+
+import time
+
+STARTUP_TIME = time.perf_counter()  # before other imports, to include them into startup log
+
+import collections
 import enum
+import functools
+import json
+import math
+import os
 import platform
+import sys
 from configparser import ConfigParser
 from pathlib import Path
 from types import MappingProxyType
 
-import darkdetect
 import numpy as np
-import qdarktheme
-from PySide6 import QtCore, QtGui, QtWidgets, QtTest
+from PySide6 import QtCore, QtGui, QtWidgets
 
 from gui.minesweeper_about_ui import Ui_MinesweeperAbout
 from gui.minesweeper_settings_ui import Ui_MinesweeperSettings
+from gui.minesweeper_stats_ui import Ui_MinesweeperStats
 from gui.minesweeper_window_ui import Ui_MinesweeperWindow
+from minesweeper_endless import EndlessBoard, EndlessView
+from minesweeper_engine import CellState, MoveResult, defuse_frames, explode_frames
+from minesweeper_generator import BoardPool
+from minesweeper_profiler import PROFILER, profiled
+from minesweeper_savegame import MoveKind, MoveLog, load_game, save_game
+from minesweeper_solver import CalculationCancelledError, NoGuessGenerator, find_moves, mine_probabilities
+from minesweeper_stats import GameRecord, StatsError, StatsStore
 
 if platform.system() == "Windows":
     import ctypes
@@ -23,34 +42,41 @@ if platform.system() == "Windows":
 
 BASE_PATH = Path(__file__).parent
 
-CELL_COVERED = "c"             # cell is covered, default
-CELL_COVERED_FLAG = "f"        # cell is covered, flag
-CELL_UNCOVERED = "u"           # cell is uncovered, default
-CELL_UNCOVERED_MINE = "m"      # cell is uncovered, mine
-CELL_UNCOVERED_MINE_OK = "o"   # cell is uncovered, mine defused
-CELL_UNCOVERED_MINE_BAD = "b"  # cell is uncovered, mine exploded
-
-PICT_DICT = MappingProxyType({
-    CELL_COVERED:            QtGui.QImage(BASE_PATH / "images" / "cell_white.png"),
-    CELL_UNCOVERED:          QtGui.QImage(),
-    CELL_COVERED_FLAG:       QtGui.QImage(BASE_PATH / "images" / "cell_flag_white.png"),
-    CELL_UNCOVERED_MINE:     QtGui.QImage(BASE_PATH / "images" / "pig.png"),
-    CELL_UNCOVERED_MINE_OK:  QtGui.QImage(BASE_PATH / "images" / "pig_ok.png"),
-    CELL_UNCOVERED_MINE_BAD: QtGui.QImage(BASE_PATH / "images" / "pig_bad.png"),
+PICT_DICT = MappingProxyType({  # images are loaded on first paint
+    CellState.COVERED:            BASE_PATH / "images" / "cell_white.png",
+    CellState.UNCOVERED:          None,
+    CellState.COVERED_FLAG:       BASE_PATH / "images" / "cell_flag_white.png",
+    CellState.UNCOVERED_MINE:     BASE_PATH / "images" / "pig.png",
+    CellState.UNCOVERED_MINE_OK:  BASE_PATH / "images" / "pig_ok.png",
+    CellState.UNCOVERED_MINE_BAD: BASE_PATH / "images" / "pig_bad.png",
 })
 
 DEFAULT_CONFIG_PATH = BASE_PATH / "minesweeper.ini"
+DEFAULT_SAVE_PATH = BASE_PATH / "minesweeper.sav"  # unfinished game saved on exit
+DEFAULT_MOVE_LOG_PATH = BASE_PATH / "minesweeper_moves.log"  # moves of the current game
+DEFAULT_STATS_PATH = BASE_PATH / "minesweeper_stats.db"  # results of finished games
 DEFAULT_ROW_COUNT = 10
 DEFAULT_COL_COUNT = 10
 DEFAULT_MINE_COUNT = 12
 DEFAULT_ANIMATION_PERIOD = 75
+DEFAULT_NO_GUESS = False
+DEFAULT_ENDLESS = False
 
 MIN_ROWS = 4
-MAX_ROWS = 30
+MAX_ROWS = 1000
 MIN_COLS = 4
-MAX_COLS = 30
+MAX_COLS = 1000
+MIN_CELL_SIZE = 25  # field becomes scrollable if cells don't fit
 MIN_ANIMATION_PERIOD = 0
 MAX_ANIMATION_PERIOD = 250
+MAX_ANIMATION_TIME = 5000  # ms, squares or rows of mines are merged on big fields to end animation in time
+ENDLESS_VIEW_SIZE = 256  # rows and cols of endless field window, window is moved when scrolled near its edge
+ENDLESS_SCROLL_MARGIN = 32  # cells
+ENDLESS_DIGIT_COUNT = 7
+
+STARTUP_LOG = bool(os.environ.get("MINESWEEPER_STARTUP_LOG"))
+PERFORMANCE_OVERLAY_PERIOD = 500  # ms
+DEFAULT_SERVER_ADDRESS = "127.0.0.1:8765"  # see minesweeper_server.py
 
 
 class ThemeState(enum.IntEnum):
@@ -59,9 +85,26 @@ class ThemeState(enum.IntEnum):
 
 
 class GameState(enum.IntEnum):
-    BLOCK = 0
-    RUNNING = 1
-    END = 2
+    RUNNING = 0
+    END = 1
+    SPECTATE = 2
+    GENERATING = 3  # no-guess board for the first move is generated, input is disabled
+
+
+def log_startup(phase):
+    """Print time elapsed since program start at the end of startup phase (if startup log is enabled)."""
+    if STARTUP_LOG:
+        print(f"[startup] {phase}: {(time.perf_counter() - STARTUP_TIME) * 1000:.1f} ms", file=sys.stderr)
+
+
+@functools.cache
+def detect_system_theme():
+    """Detect theme of the OS once (darkdetect may start a subprocess on every call)."""
+    import darkdetect
+    return ThemeState.DARK if darkdetect.theme() == "Dark" else ThemeState.LIGHT
+
+
+log_startup("modules imported")
 
 
 class MinesweeperConfig:
@@ -105,6 +148,16 @@ class MinesweeperConfig:
 
         self._config.read(path)
         rows, cols, mines, animation_period = self.rows, self.cols, self.mines, self.animation_period
+        try:
+            self._config.getboolean("ALL", "no_guess", fallback=DEFAULT_NO_GUESS)
+        except ValueError:
+            msg = "Error in config file: no_guess must be a boolean value"
+            raise ValueError(msg) from None
+        try:
+            self._config.getboolean("ALL", "endless", fallback=DEFAULT_ENDLESS)
+        except ValueError:
+            msg = "Error in config file: endless must be a boolean value"
+            raise ValueError(msg) from None
         if not (MIN_ROWS <= rows <= MAX_ROWS):
             msg = f"Error in config file: rows must be between {MIN_ROWS} and {MAX_ROWS}"
             raise ValueError(msg)
@@ -218,67 +271,456 @@ class MinesweeperConfig:
         self._config.remove_option("ALL", "animation_period")
         self._remove_section_if_empty("ALL")
 
+    @property
+    def no_guess(self):
+        """Get no_guess setting."""
+        return self._config.getboolean("ALL", "no_guess", fallback=DEFAULT_NO_GUESS)
+
+    @no_guess.setter
+    def no_guess(self, value: bool):
+        """Set no_guess setting."""
+        self._add_section_if_not_exist("ALL")
+        self._config.set("ALL", "no_guess", str(bool(value)))
+
+    @no_guess.deleter
+    def no_guess(self):
+        """Restore no_guess setting to default."""
+        self._config.remove_option("ALL", "no_guess")
+        self._remove_section_if_empty("ALL")
+
+    @property
+    def endless(self):
+        """Get endless setting."""
+        return self._config.getboolean("ALL", "endless", fallback=DEFAULT_ENDLESS)
+
+    @endless.setter
+    def endless(self, value: bool):
+        """Set endless setting."""
+        self._add_section_if_not_exist("ALL")
+        self._config.set("ALL", "endless", str(bool(value)))
+
+    @endless.deleter
+    def endless(self):
+        """Restore endless setting to default."""
+        self._config.remove_option("ALL", "endless")
+        self._remove_section_if_empty("ALL")
+
+
+class BoardModel(QtCore.QAbstractTableModel):
+    """Table model over cell states of the board (no per-cell items or widgets)."""
+
+    def __init__(self, parent=None):
+        """Initialize."""
+        QtCore.QAbstractTableModel.__init__(self, parent)
+        self.board = None
+        self.probabilities = None  # mine probabilities of covered cells for overlay
+
+    def set_board(self, board):
+        """Show new board (start of a new game)."""
+        self.beginResetModel()
+        self.board = board
+        self.probabilities = None
+        self.endResetModel()
+
+    def set_probabilities(self, probabilities):
+        """Show mine probabilities overlay (None to hide)."""
+        self.probabilities = probabilities
+        if self.board is not None:
+            self.dataChanged.emit(self.index(0, 0), self.index(self.board.rows - 1, self.board.cols - 1))
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        """Get number of board rows."""
+        if parent.isValid() or self.board is None:
+            return 0
+        return self.board.rows
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        """Get number of board columns."""
+        if parent.isValid() or self.board is None:
+            return 0
+        return self.board.cols
+
+    def data(self, index, role=QtCore.Qt.ItemDataRole.DisplayRole):
+        """Get number of mines around uncovered cell as display data."""
+        if role == QtCore.Qt.ItemDataRole.DisplayRole and index.isValid():
+            row, col = index.row(), index.column()
+            mines_in_area = self.board.neighbours[row, col]
+            if self.board.state[row, col] == CellState.UNCOVERED and mines_in_area:
+                return str(mines_in_area)
+        return None
+
+    def cells_changed(self, rows, cols):
+        """Notify view that cells were changed (single repaint of their bounding rectangle)."""
+        rows, cols = np.asarray(rows), np.asarray(cols)
+        if rows.size:
+            self.dataChanged.emit(self.index(int(rows.min()), int(cols.min())),
+                                  self.index(int(rows.max()), int(cols.max())))
+
+
+class PixmapCache:
+    """Cache of pre-scaled cell pixmaps keyed by (cell state, cell size, theme)."""
+
+    INVERTED_STATES = frozenset({CellState.COVERED, CellState.COVERED_FLAG})  # inverted for dark theme
+
+    def __init__(self):
+        """Initialize."""
+        self._base_images = {}  # cell state: image, loaded from file
+        self._theme_images = {}  # theme: {cell state: image}, built once for every theme
+        self._pixmaps = {}
+        self._cell_size = None
+
+    def set_cell_size(self, width, height):
+        """Drop pixmaps of other sizes (called when cell size is changed)."""
+        if (width, height) != self._cell_size:
+            self._pixmaps.clear()
+            self._cell_size = (width, height)
+
+    def pixmap(self, cell_state, width, height, theme, device_pixel_ratio=1.0):
+        """Get pixmap of cell state scaled to cell size in device pixels for theme (None if cell has no picture)."""
+        key = (cell_state, width, height, theme, device_pixel_ratio)
+        try:
+            return self._pixmaps[key]
+        except KeyError:
+            pass
+
+        image = self._images(theme)[cell_state]
+        pixmap = None
+        if not image.isNull():
+            pixmap = QtGui.QPixmap.fromImage(image.scaled(
+                round(width * device_pixel_ratio), round(height * device_pixel_ratio),
+                QtCore.Qt.AspectRatioMode.IgnoreAspectRatio, QtCore.Qt.TransformationMode.SmoothTransformation
+            ))
+            pixmap.setDevicePixelRatio(device_pixel_ratio)
+        self._pixmaps[key] = pixmap
+        return pixmap
+
+    def _images(self, theme):
+        """Get full-size images for theme (images are loaded from files on first call)."""
+        if theme not in self._theme_images:
+            if not self._theme_images:
+                self._base_images = {cell_state: QtGui.QImage(path) if path else QtGui.QImage()
+                                     for cell_state, path in PICT_DICT.items()}
+                log_startup("images loaded")
+            images = {}
+            for cell_state, image in self._base_images.items():
+                if theme == ThemeState.DARK and cell_state in self.INVERTED_STATES:
+                    image = image.copy()
+                    image.invertPixels(QtGui.QImage.InvertMode.InvertRgb)
+                images[cell_state] = image
+            self._theme_images[theme] = images
+        return self._theme_images[theme]
+
 
 class ItemDelegate(QtWidgets.QStyledItemDelegate):
     """Item delegate for drawing images in fields."""
 
-    def __init__(self, parent, table_widget):
+    def __init__(self, parent, pixmap_cache, theme_controller):
         """Initialize."""
         QtWidgets.QStyledItemDelegate.__init__(self, parent)
-        self.table_widget = table_widget
+        self.pixmap_cache = pixmap_cache
+        self.theme_controller = theme_controller
 
     def createEditor(self, parent, option, index):
         """Prevent item text editing."""
         return None
 
     def paint(self, painter, option, index):
-        """Paint picture based on code in item text."""
-        # painter.save()
-        text = self.table_widget.item(index.row(), index.column()).text()
-        painter.drawImage(option.rect, PICT_DICT[text])
-        # painter.restore()
+        """Paint picture and mines number based on cell state of the board, shade cells by mine probability."""
+        model = index.model()
+        board = model.board
+        row, col = index.row(), index.column()
+        cell_state = int(board.state[row, col])
+        rect = option.rect
+        pixmap = self.pixmap_cache.pixmap(cell_state, rect.width(), rect.height(), self.theme_controller.theme,
+                                          painter.device().devicePixelRatio())
+        if pixmap is not None:
+            painter.drawPixmap(rect.topLeft(), pixmap)
+        if cell_state == CellState.UNCOVERED and (mines_in_area := board.neighbours[row, col]):
+            painter.setPen(option.palette.color(QtGui.QPalette.ColorRole.Text))
+            painter.drawText(option.rect, QtCore.Qt.AlignmentFlag.AlignCenter, str(mines_in_area))
+        if model.probabilities is not None and cell_state == CellState.COVERED:
+            probability = float(model.probabilities[row, col])
+            if not math.isnan(probability):  # from green (safe) to red (mined)
+                painter.fillRect(rect, QtGui.QColor.fromRgbF(probability, 1 - probability, 0, 0.45))
+
+
+class AnimationScheduler(QtCore.QObject):
+    """Timer-driven animation, applies precomputed frames one by one without blocking the event loop."""
+
+    finished = QtCore.Signal()
+
+    def __init__(self, parent=None):
+        """Initialize."""
+        QtCore.QObject.__init__(self, parent)
+        self._timer = QtCore.QTimer(self)
+        self._timer.timeout.connect(self._next_frame)
+        self._frames = collections.deque()
+        self._apply_frame = None
+
+    @property
+    def running(self):
+        """Check if animation is running."""
+        return bool(self._frames)
+
+    def start(self, frames, period, apply_frame):
+        """Start animation, apply_frame(*frame) is called for every frame with period in milliseconds."""
+        self.cancel()
+        self._frames.extend(frames)
+        self._apply_frame = apply_frame
+        if period and self._frames:
+            self._next_frame()
+            if self._frames:
+                self._timer.start(period)
+        else:
+            self.fast_forward()
+
+    def cancel(self):
+        """Stop animation without applying remaining frames."""
+        self._timer.stop()
+        self._frames.clear()
+
+    def fast_forward(self):
+        """Apply all remaining frames at once and finish animation."""
+        self._timer.stop()
+        while self._frames:
+            self._apply_frame(*self._frames.popleft())
+        self.finished.emit()
+
+    def _next_frame(self):
+        """Apply next frame (executed by timer)."""
+        self._apply_frame(*self._frames.popleft())
+        if not self._frames:
+            self._timer.stop()
+            self.finished.emit()
+
+
+class ProbabilitySignals(QtCore.QObject):
+    """Signals of ProbabilityJob (QRunnable can't have signals)."""
+
+    finished = QtCore.Signal(int, object)  # job id, probabilities
+
+
+class ProbabilityJob(QtCore.QRunnable):
+    """Calculation of mine probabilities in thread pool."""
+
+    def __init__(self, job_id, board, is_cancelled):
+        """Initialize with snapshot of the board."""
+        QtCore.QRunnable.__init__(self)
+        self.signals = ProbabilitySignals()
+        self._job_id = job_id
+        self._state = board.state.copy()
+        self._neighbours = board.neighbours.copy()
+        self._num_mines = board.num_mines
+        self._is_cancelled = is_cancelled
+
+    def run(self):
+        """Calculate probabilities (flags are considered as mines)."""
+        known_mines = self._state == CellState.COVERED_FLAG
+        try:
+            with PROFILER.section("mine_probabilities"):
+                probabilities = mine_probabilities(self._state, self._neighbours, known_mines, self._num_mines,
+                                                   is_cancelled=self._is_cancelled)
+        except CalculationCancelledError:
+            return
+        self.signals.finished.emit(self._job_id, probabilities)
 
 
-class CustomLabel(QtWidgets.QLabel):
-    """Custom label for watching cell clicks, storing mines number and for other purposes."""
+class NoGuessSignals(QtCore.QObject):
+    """Signals of NoGuessJob (QRunnable can't have signals)."""
 
-    signal_cell_right_btn = QtCore.Signal(int, int)
+    finished = QtCore.Signal(int, object, int, int)  # job id, board or None, first uncovered cell
 
-    def __init__(self, item, text=None):
+
+class NoGuessJob(QtCore.QRunnable):
+    """Generation of no-guess board in thread pool (candidate boards are checked by processes of generator)."""
+
+    def __init__(self, job_id, generator, board, row, col, is_cancelled):
+        """Initialize with size of the board and the first uncovered cell."""
+        QtCore.QRunnable.__init__(self)
+        self.signals = NoGuessSignals()
+        self._job_id = job_id
+        self._generator = generator
+        self._size = board.rows, board.cols, board.num_mines
+        self._row, self._col = row, col
+        self._is_cancelled = is_cancelled
+
+    def run(self):
+        """Generate board, None is emitted on timeout."""
+        try:
+            board = self._generator.generate(*self._size, self._row, self._col, is_cancelled=self._is_cancelled)
+        except CalculationCancelledError:
+            return
+        self.signals.finished.emit(self._job_id, board, self._row, self._col)
+
+
+class ProbabilityOverlay(QtCore.QObject):
+    """Mine probabilities calculated off the GUI thread, stale calculations are cancelled by newer ones."""
+
+    updated = QtCore.Signal(object)  # probabilities or None
+
+    def __init__(self, parent=None):
         """Initialize."""
-        QtWidgets.QLabel.__init__(self, text)
-        self.setAlignment(QtGui.Qt.AlignmentFlag.AlignCenter)
-        self.setSizePolicy(QtWidgets.QSizePolicy(
-            QtWidgets.QSizePolicy.Policy.Expanding, QtWidgets.QSizePolicy.Policy.Expanding
-        ))
-
-        self.item = item  # item in same cell of tableWidget
-        if text:
-            self.setText(text)
-        self.mined = False
-        self.installEventFilter(self)
-
-    def row(self):
-        """Get row of current cell in tableWidget."""
-        return self.item.row()
-
-    def column(self):
-        """Get column of current cell in tableWidget."""
-        return self.item.column()
+        QtCore.QObject.__init__(self, parent)
+        self._thread_pool = QtCore.QThreadPool(self)
+        self._thread_pool.setMaxThreadCount(1)
+        self._job_id = 0
+        self.enabled = False
+
+    def request(self, board):
+        """Start calculation for current board state (previous calculation is cancelled)."""
+        self._job_id += 1
+        if not self.enabled:
+            return
+        job_id = self._job_id
+        job = ProbabilityJob(job_id, board, lambda: job_id != self._job_id)
+        job.signals.finished.connect(self._job_finished)
+        self._thread_pool.clear()  # queued stale jobs are dropped, the running one is cancelled by job id
+        self._thread_pool.start(job)
 
-    def eventFilter(self, watched, event):
-        """Filter mouse button clicks (left for uncover, right for flag)."""
-        if (event.type() == QtCore.QEvent.Type.MouseButtonRelease and
-                watched.rect().contains(event.position().toPoint())):
-            event_button = event.button()
-            if event_button == QtCore.Qt.MouseButton.RightButton:
-                self.signal_cell_right_btn.emit(watched.row(), watched.column())
+    def clear(self):
+        """Cancel calculation and hide probabilities."""
+        self._job_id += 1
+        self.updated.emit(None)
 
-        return False
+    def _job_finished(self, job_id, probabilities):
+        """Show probabilities if they are not stale."""
+        if job_id == self._job_id:
+            self.updated.emit(probabilities)
+
+
+class PerformanceOverlay(QtWidgets.QLabel):
+    """Label over the field with p50/p99 durations of profiled sections and last frame time."""
+
+    def __init__(self, parent):
+        """Initialize hidden overlay."""
+        QtWidgets.QLabel.__init__(self, parent)
+        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setStyleSheet("background-color: rgba(0, 0, 0, 160); color: white; padding: 4px;")
+        self.setFont(QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.SystemFont.FixedFont))
+        self._timer = QtCore.QTimer(self)
+        self._timer.timeout.connect(self.update_text)
+        self.hide()
+
+    def set_visible(self, visible):
+        """Show overlay (updated by timer) or hide it."""
+        self.setVisible(visible)
+        if visible:
+            self.update_text()
+            self._timer.start(PERFORMANCE_OVERLAY_PERIOD)
+        else:
+            self._timer.stop()
+
+    def update_text(self):
+        """Show current statistics of PROFILER (executed by timer)."""
+        summary = PROFILER.summary()
+        lines = [f"{'section':<20}{'p50, ms':>9}{'p99, ms':>9}{'count':>7}"]
+        for name, stats in sorted(summary["durations_us"].items()):
+            lines.append(f"{name:<20}{stats['p50'] / 1000:>9.2f}{stats['p99'] / 1000:>9.2f}{stats['count']:>7}")
+        for name, stats in sorted(summary["values"].items()):
+            lines.append(f"{name:<20}{stats['p50']:>9.0f}{stats['p99']:>9.0f}{stats['count']:>7}")
+        lines.append(f"last frame: {PROFILER.last_frame_time / 1000:.2f} ms")
+        self.setText("\n".join(lines))
+        self.adjustSize()
+        self.raise_()
+
+
+class SpectatorBoard:
+    """Visible state of a game hosted by server, with the same interface as Board for painting."""
+
+    def __init__(self, game_state):
+        """Initialize from state response of server."""
+        self.rows, self.cols, self.num_mines = game_state["rows"], game_state["cols"], game_state["mines"]
+        self.state = np.zeros((self.rows, self.cols), dtype=np.uint8)
+        self.neighbours = np.zeros((self.rows, self.cols), dtype=np.uint8)
+        codes = np.array([list(row) for row in game_state["cells"]]).reshape(self.rows, self.cols)
+        self.state[codes == "F"] = CellState.COVERED_FLAG
+        numbers = np.char.isdigit(codes)
+        self.state[numbers] = CellState.UNCOVERED
+        self.neighbours[numbers] = codes[numbers].astype(np.uint8)
+        self.result = game_state["result"]
+        if game_state.get("mined"):
+            self._show_mines(game_state["mined"])
+
+    @property
+    def uncovered_cells(self):
+        """Get number of uncovered cells."""
+        return int(np.count_nonzero(self.state == CellState.UNCOVERED))
 
-    def __str__(self):
-        """String object representation for convenience."""
-        return f"CustomLabel: row={self.row()}, column={self.column()}, mined={self.mined}, text={self.text()}"
+    @property
+    def flagged_cells(self):
+        """Get number of flagged cells."""
+        return int(np.count_nonzero(self.state == CellState.COVERED_FLAG))
+
+    def apply_move(self, event):
+        """Apply move event of server, return coordinates (rows, cols) of changed cells."""
+        changed = []
+        for row, col, number in event.get("uncovered", ()):
+            self.state[row, col] = CellState.UNCOVERED
+            self.neighbours[row, col] = number
+            changed.append((row, col))
+        for key, cell_state in (("flagged", CellState.COVERED_FLAG), ("unflagged", CellState.COVERED)):
+            for row, col in event.get(key, ()):
+                self.state[row, col] = cell_state
+                changed.append((row, col))
+        self.result = event["result"]
+        if event.get("mines"):
+            changed.extend(self._show_mines(event["mines"]))
+        return tuple(zip(*changed)) if changed else ((), ())
+
+    def _show_mines(self, mines):
+        """Show mines of finished game, return their coordinates."""
+        cells = [tuple(cell) for cell in mines]
+        rows, cols = zip(*cells)
+        self.state[rows, cols] = CellState.UNCOVERED_MINE
+        return cells
+
+
+class SpectatorClient(QtCore.QObject):
+    """Connection to minesweeper_server.py watching one game (TCP "host:port" or Unix socket path)."""
+
+    state_received = QtCore.Signal(object)
+    move_received = QtCore.Signal(object)
+    disconnected = QtCore.Signal(str)  # reason
+
+    def __init__(self, address, game_id, parent=None):
+        """Connect to server and start watching the game."""
+        QtCore.QObject.__init__(self, parent)
+        from PySide6 import QtNetwork
+        self._game_id = game_id
+        host, _sep, port = address.rpartition(":")
+        if host and port.isdigit():
+            self._socket = QtNetwork.QTcpSocket(self)
+            self._socket.connected.connect(self._watch)
+            self._socket.errorOccurred.connect(lambda _error: self.disconnected.emit(self._socket.errorString()))
+            self._socket.connectToHost(host, int(port))
+        else:
+            self._socket = QtNetwork.QLocalSocket(self)
+            self._socket.connected.connect(self._watch)
+            self._socket.errorOccurred.connect(lambda _error: self.disconnected.emit(self._socket.errorString()))
+            self._socket.connectToServer(address)
+        self._socket.readyRead.connect(self._read_lines)
+
+    def close(self):
+        """Stop watching."""
+        self._socket.blockSignals(True)
+        self._socket.abort()
+
+    def _watch(self):
+        """Send watch request after connection."""
+        self._socket.write(json.dumps({"id": 0, "op": "watch", "game": self._game_id}).encode() + b"\n")
+
+    def _read_lines(self):
+        """Process received messages."""
+        while self._socket.canReadLine():
+            message = json.loads(bytes(self._socket.readLine()))
+            if message.get("event") == "move":
+                self.move_received.emit(message)
+            elif message.get("event") == "closed":
+                self.disconnected.emit("Game is closed by server")
+            elif not message.get("ok", True):
+                self.disconnected.emit(message["error"])
+            elif "cells" in message:
+                self.state_received.emit(message)
 
 
 class MinesweeperSettings(QtWidgets.QDialog, Ui_MinesweeperSettings):
@@ -319,18 +761,80 @@ class MinesweeperAbout(QtWidgets.QDialog, Ui_MinesweeperAbout):
         self.label_2.linkActivated.connect(QtGui.QDesktopServices.openUrl)
 
 
+class MinesweeperStats(QtWidgets.QDialog, Ui_MinesweeperStats):
+    """Minesweeper statistics dialog with leaderboards of field presets."""
+
+    def __init__(self, parent, stats_store):
+        """Initialize minesweeper statistics dialog."""
+        QtWidgets.QDialog.__init__(self, parent, QtCore.Qt.WindowType.Dialog)
+        self.setupUi(self)
+        self.setWindowTitle("Statistics")
+        self._stats_store = stats_store
+        self._presets = []
+
+        self.tableWidget_leaderboard.horizontalHeader().setSectionResizeMode(
+            QtWidgets.QHeaderView.ResizeMode.Stretch)
+        self.comboBox_preset.currentIndexChanged.connect(self.show_preset)
+
+    @staticmethod
+    def _format_time(time_ms):
+        """Format game time as min:sec."""
+        minutes, seconds = divmod(time_ms // 1000, 60)
+        return f"{minutes}:{seconds:02}"
+
+    def update_stats(self, rows, cols, mines):
+        """Reload played presets and show preset of the field settings (or the most played one)."""
+        self._presets = self._stats_store.presets()
+        current = next((i for i, preset in enumerate(self._presets)
+                        if (preset.rows, preset.cols, preset.mines) == (rows, cols, mines)), 0)
+        self.comboBox_preset.blockSignals(True)
+        self.comboBox_preset.clear()
+        self.comboBox_preset.addItems([f"{preset.rows} x {preset.cols}, {preset.mines}" for preset in self._presets])
+        self.comboBox_preset.setCurrentIndex(current if self._presets else -1)
+        self.comboBox_preset.blockSignals(False)
+        self.show_preset(self.comboBox_preset.currentIndex())
+
+    def show_preset(self, index):
+        """Show summary and leaderboard of preset."""
+        table = self.tableWidget_leaderboard
+        table.setRowCount(0)
+        if not (0 <= index < len(self._presets)):
+            self.label_summary.setText("No finished games")
+            return
+
+        preset = self._presets[index]
+        best_time = "-" if preset.best_time_ms is None else self._format_time(preset.best_time_ms)
+        self.label_summary.setText(
+            f"Games: {preset.games}, wins: {preset.wins} ({preset.wins / preset.games:.0%}), best time: {best_time}\n"
+            f"Win streak: {preset.current_streak}, best win streak: {preset.best_streak}"
+        )
+        leaderboard = self._stats_store.leaderboard(preset.rows, preset.cols, preset.mines)
+        table.setRowCount(len(leaderboard))
+        for row, game in enumerate(leaderboard):
+            bbbv_per_second = f"{game.bbbv * 1000 / game.time_ms:.2f}" if game.time_ms else "-"
+            finished_at = QtCore.QDateTime.fromSecsSinceEpoch(int(game.finished_at)).toString("yyyy-MM-dd hh:mm")
+            for col, text in enumerate((self._format_time(game.time_ms), str(game.bbbv), bbbv_per_second,
+                                        str(game.clicks), finished_at)):
+                table.setItem(row, col, QtWidgets.QTableWidgetItem(text))
+
+
 class MinesweeperWindow(QtWidgets.QMainWindow, Ui_MinesweeperWindow):
     """Minesweeper main window."""
 
-    def __init__(self, parent=None, flags=QtCore.Qt.WindowFlags()):
-        """Initialize minesweeper main window."""
+    def __init__(self, parent=None, flags=QtCore.Qt.WindowFlags(), *, save_path=DEFAULT_SAVE_PATH,
+                 move_log_path=DEFAULT_MOVE_LOG_PATH, stats_path=DEFAULT_STATS_PATH):
+        """Initialize minesweeper main window.
+
+        Unfinished game is saved to save_path on exit, moves of the current game are logged to move_log_path,
+        results of finished games are recorded into stats_path.
+        """
         QtWidgets.QMainWindow.__init__(self, parent, flags)
-        self.settings_dialog = MinesweeperSettings(self)
-        self.settings_dialog.setWindowModality(QtCore.Qt.WindowModality.ApplicationModal)
-        self.settings_dialog.buttonBox.accepted.connect(self.update_settings)
-        self.about_dialog = MinesweeperAbout(self)
-        self.about_dialog.setWindowModality(QtCore.Qt.WindowModality.ApplicationModal)
+        self._save_path = Path(save_path)
+        self._settings_dialog = None  # dialogs are created on first use
+        self._about_dialog = None
+        self._stats_dialog = None
         self._theme_controller = ThemeController()
+        log_startup("theme set")
 
         self.setupUi(self)
         self.setWindowTitle("Minesweeper")
@@ -343,29 +847,60 @@ class MinesweeperWindow(QtWidgets.QMainWindow, Ui_MinesweeperWindow):
         self.settings_cols = self._config.cols  # default number of columns
         self.settings_mines = self._config.mines  # default number of mines
         self.settings_animation_period = self._config.animation_period  # animation period
+        self.settings_no_guess = self._config.no_guess  # every field can be solved without guessing
+        self.settings_endless = self._config.endless  # field without borders, generated by chunks
 
         # Init widgets
-        self.tableWidget.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Stretch)
-        self.tableWidget.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Stretch)
-
-        self.tableWidget.cellClicked.connect(self.cell_uncover)
-        self.tableWidget.keyPressEvent = self.tableKeyPressEvent
-
-        self.item_delegate = ItemDelegate(self.tableWidget.itemDelegate(), self.tableWidget)
-        self.tableWidget.setItemDelegate(self.item_delegate)
+        self.tableView.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Fixed)
+        self.tableView.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Fixed)
+        self.tableView.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+
+        self.board_model = BoardModel(self)
+        self.tableView.setModel(self.board_model)
+        self.tableView.clicked.connect(lambda index: self.cell_uncover(index.row(), index.column()))
+        self.tableView.keyPressEvent = self.tableKeyPressEvent
+        self.tableView.paintEvent = self.tablePaintEvent
+        self.tableView.viewport().installEventFilter(self)
+        self.tableView.verticalScrollBar().valueChanged.connect(self._scroll_endless_field)
+        self.tableView.horizontalScrollBar().valueChanged.connect(self._scroll_endless_field)
+        self._right_btn_pressed_index = None
+        self._middle_btn_pressed_index = None
+        self._chord_pressed = False  # left and right buttons are pressed together
+        self._endless_recentering = False
+
+        self._pixmap_cache = PixmapCache()
+        self.item_delegate = ItemDelegate(self.tableView.itemDelegate(), self._pixmap_cache, self._theme_controller)
+        self.tableView.setItemDelegate(self.item_delegate)
 
         self.timer = QtCore.QTimer(self)
         self.timer.timeout.connect(self._timer_job)
 
+        self.probability_overlay = ProbabilityOverlay(self)
+        self.probability_overlay.updated.connect(self.board_model.set_probabilities)
+        self.action_showProbabilities.toggled.connect(self.show_probabilities)
+
+        self.performance_overlay = PerformanceOverlay(self.centralwidget)
+        self.action_performanceOverlay.toggled.connect(self.show_performance_overlay)
+        self.action_exportProfile.triggered.connect(self.export_profile)
+
+        self.animation = AnimationScheduler(self)
+        self.animation.finished.connect(self._show_end_message)
+        self._defeat = False
+
         self.action_restartGame.triggered.connect(self.restart_game)
+        self.action_resolveObvious.triggered.connect(self.resolve_obvious_cells)
         self.action_settings.triggered.connect(self.show_settings_dialog)
-        self.action_aboutProgram.triggered.connect(self.about_dialog.show)
+        self.action_aboutProgram.triggered.connect(self.show_about_dialog)
+        self.action_statistics.triggered.connect(self.show_stats_dialog)
+        self.action_spectate.triggered.connect(self.spectate_game)
         self.action_themeLight.triggered.connect(lambda: (self._theme_controller.set_light(),
                                                           self.action_themeLight.setChecked(True),
-                                                          self.action_themeDark.setChecked(False)))
+                                                          self.action_themeDark.setChecked(False),
+                                                          self.tableView.viewport().update()))
         self.action_themeDark.triggered.connect(lambda: (self._theme_controller.set_dark(),
                                                          self.action_themeLight.setChecked(False),
-                                                         self.action_themeDark.setChecked(True)))
+                                                         self.action_themeDark.setChecked(True),
+                                                         self.tableView.viewport().update()))
         if self._theme_controller.theme == ThemeState.LIGHT:
             self.action_themeLight.setChecked(True)
         elif self._theme_controller.theme == ThemeState.DARK:
@@ -381,32 +916,47 @@ class MinesweeperWindow(QtWidgets.QMainWindow, Ui_MinesweeperWindow):
 
         # Init shortcuts
         self.action_restartGame.setShortcut(QtGui.QKeySequence("Alt+R"))
+        self.action_resolveObvious.setShortcut(QtGui.QKeySequence("Alt+O"))
         self.action_settings.setShortcut(QtGui.QKeySequence("Alt+S"))
         self.action_aboutProgram.setShortcut(QtGui.QKeySequence("Alt+A"))
+        self.action_statistics.setShortcut(QtGui.QKeySequence("Alt+T"))
         self.action_themeLight.setShortcut(QtGui.QKeySequence("Alt+1"))
         self.action_themeDark.setShortcut(QtGui.QKeySequence("Alt+2"))
+        self.action_showProbabilities.setShortcut(QtGui.QKeySequence("Alt+P"))
+        self.action_performanceOverlay.setChecked(PROFILER.enabled)  # profiling enabled by environment variable
 
         # Init minesweeper logic
-        self._num_rows = 0
-        self._num_cols = 0
-        self._num_mines = 0
-        self._mines_preset = None
-        self._uncovered_cells = 0
-        self._flagged_cells = 0
-
-        self._set_field()
+        self._board = None
+        self._board_pool = BoardPool()
+        self._board_pool.set_settings(self.settings_rows, self.settings_cols, self.settings_mines)
+        self._no_guess_generator = NoGuessGenerator()
+        self._no_guess_thread_pool = QtCore.QThreadPool(self)
+        self._no_guess_thread_pool.setMaxThreadCount(1)  # generator is used by one job at a time
+        self._no_guess_job_id = 0
+        self._move_log = MoveLog(move_log_path)
+        self._stats_path = stats_path
+        self._stats_store = None
+        self._clicks = 0  # uncover and flag clicks of the current game
+        self._spectator = None
+
+        log_startup("window initialized")
         self._game_state = GameState.RUNNING
-
-        self._ignore_animation_period = False
+        if not self._restore_game():
+            self._set_field()
+        self._game_state = GameState.RUNNING
+        log_startup("field set")
 
         self.gridLayout_field.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
 
         self.show()
         self._resize_table_widget()
+        self._center_endless_field()
+        log_startup("window shown")
 
     def keyPressEvent(self, event):
-        if event.key() == QtCore.Qt.Key.Key_Escape and self._game_state == GameState.BLOCK:
-            self._ignore_animation_period = True
+        """Skip end game animation by Escape."""
+        if event.key() == QtCore.Qt.Key.Key_Escape and self.animation.running:
+            self.animation.fast_forward()
 
     def _timer_job(self):
         """Update data for timeEdit_timer widget (executed by timer)."""
@@ -415,23 +965,49 @@ class MinesweeperWindow(QtWidgets.QMainWindow, Ui_MinesweeperWindow):
 
     def restart_game(self):
         """Start a new game."""
-        if self._game_state == GameState.BLOCK:
-            return
-        prev_game_state = self._game_state
-        self._game_state = GameState.BLOCK
-
         # ask only after game started
         if (
-                (not self._uncovered_cells and prev_game_state == GameState.RUNNING) or
-                prev_game_state == GameState.END or QtWidgets.QMessageBox.question(
+                (not self._board.uncovered_cells and self._game_state == GameState.RUNNING) or
+                self._game_state in {GameState.END, GameState.SPECTATE, GameState.GENERATING} or
+                QtWidgets.QMessageBox.question(
                     self, "Confirm", "Are you sure you want to restart the game?",
                     QtWidgets.QMessageBox.StandardButton.Yes, QtWidgets.QMessageBox.StandardButton.No
                 ) == QtWidgets.QMessageBox.StandardButton.Yes
         ):
             self._set_field()
             self._game_state = GameState.RUNNING
-        else:
-            self._game_state = prev_game_state
+
+    @property
+    def settings_dialog(self):
+        """Get settings dialog (created on first use)."""
+        if self._settings_dialog is None:
+            self._settings_dialog = MinesweeperSettings(self)
+            self._settings_dialog.setWindowModality(QtCore.Qt.WindowModality.ApplicationModal)
+            self._settings_dialog.buttonBox.accepted.connect(self.update_settings)
+        return self._settings_dialog
+
+    @property
+    def about_dialog(self):
+        """Get about program dialog (created on first use)."""
+        if self._about_dialog is None:
+            self._about_dialog = MinesweeperAbout(self)
+            self._about_dialog.setWindowModality(QtCore.Qt.WindowModality.ApplicationModal)
+        return self._about_dialog
+
+    @property
+    def stats_store(self):
+        """Get statistics store (opened on first use, so startup doesn't wait for it)."""
+        if self._stats_store is None:
+            self._stats_store = StatsStore(self._stats_path)
+        return self._stats_store
+
+    @property
+    def stats_dialog(self):
+        """Get statistics dialog (created on first use)."""
+        if self._stats_dialog is None:
+            self._stats_dialog = MinesweeperStats(self, self.stats_store)
+            self._stats_dialog.setWindowModality(QtCore.Qt.WindowModality.ApplicationModal)
+        return self._stats_dialog
 
     def show_settings_dialog(self):
         """Show settings dialog."""
@@ -439,281 +1015,463 @@ class MinesweeperWindow(QtWidgets.QMainWindow, Ui_MinesweeperWindow):
         self.settings_dialog.spinBox_cols.setValue(self.settings_cols)
         self.settings_dialog.spinBox_mines.setValue(self.settings_mines)
         self.settings_dialog.spinBox_animationPeriod.setValue(self.settings_animation_period)
+        self.settings_dialog.checkBox_noGuess.setChecked(self.settings_no_guess)
+        self.settings_dialog.checkBox_endless.setChecked(self.settings_endless)
         self.settings_dialog.show()
 
+    def show_about_dialog(self):
+        """Show about program dialog."""
+        self.about_dialog.show()
+
+    def show_stats_dialog(self):
+        """Show statistics dialog."""
+        try:
+            self.stats_dialog.update_stats(self.settings_rows, self.settings_cols, self.settings_mines)
+        except StatsError as e:
+            QtWidgets.QMessageBox.warning(self, "Statistics error", f"Statistics can't be read: {e}",
+                                          QtWidgets.QMessageBox.StandardButton.Ok)
+            return
+        self.stats_dialog.show()
+
     def update_settings(self):
         """Update settings if settings dialog was accepted."""
-        rows, cols, mines, animation_period = (
+        rows, cols, mines, animation_period, no_guess, endless = (
             self.settings_dialog.spinBox_rows.value(),
             self.settings_dialog.spinBox_cols.value(),
             self.settings_dialog.spinBox_mines.value(),
             self.settings_dialog.spinBox_animationPeriod.value(),
+            self.settings_dialog.checkBox_noGuess.isChecked(),
+            self.settings_dialog.checkBox_endless.isChecked(),
         )
 
         self.settings_animation_period = animation_period
 
         # Check if field settings changed
-        if (self.settings_rows, self.settings_cols, self.settings_mines) != (rows, cols, mines):
+        if (
+                (self.settings_rows, self.settings_cols, self.settings_mines, self.settings_no_guess,
+                 self.settings_endless) != (rows, cols, mines, no_guess, endless)
+        ):
             self.settings_rows, self.settings_cols, self.settings_mines = rows, cols, mines
+            self.settings_no_guess, self.settings_endless = no_guess, endless
+            self._board_pool.set_settings(rows, cols, mines)
             # Auto game restart
             if (
-                    (not self._uncovered_cells and self._game_state == GameState.RUNNING) or
-                    self._game_state == GameState.END
+                    (not self._board.uncovered_cells and self._game_state == GameState.RUNNING) or
+                    self._game_state in {GameState.END, GameState.GENERATING}
             ):
-                self._game_state = GameState.BLOCK
                 self._set_field()
                 self._game_state = GameState.RUNNING
 
-    def _animation_sleep(self):
-        if not self._ignore_animation_period:
-            QtTest.QTest.qWait(self.settings_animation_period)  # QTimer should be used, but this is much easier
-
     def _emit_uncovered_cells(self):
         """Update data for lineEdit_cellsUncovered widget."""
-        self.lcdNumber_cellsUncovered.display(self._uncovered_cells)
+        self.lcdNumber_cellsUncovered.display(self._board.uncovered_cells)
 
     def _emit_flagged_cells(self):
         """Update data for lineEdit_cellsFlagged widget."""
-        self.lcdNumber_cellsFlagged.display(self._flagged_cells)
+        self.lcdNumber_cellsFlagged.display(self._board.flagged_cells)
 
+    @profiled("_set_field")
     def _set_field(self):
         """Init field with size specified in settings (start a new game)."""
-        self.timer.stop()
+        if self.settings_endless:  # density of mines is the same as for field of settings size
+            self._move_log.close()  # endless field isn't logged
+            board = EndlessView(EndlessBoard(self.settings_mines / (self.settings_rows * self.settings_cols)),
+                                ENDLESS_VIEW_SIZE, ENDLESS_VIEW_SIZE)
+            self._show_board(board)
+            self._center_endless_field()
+            return
+        board = self._board_pool.take(self.settings_rows, self.settings_cols, self.settings_mines)
+        self._move_log.start(board)
+        self._show_board(board)
 
-        rows, cols, mines = self.settings_rows, self.settings_cols, self.settings_mines
-        self._num_rows = rows
-        self._num_cols = cols
-        self._num_mines = mines
-        self._uncovered_cells = 0
-        self._flagged_cells = 0
-        self.timeEdit_timer.setTime(QtCore.QTime(0, 0, 0, 0))
-        self.lcdNumber_cellsNotMined.display(self._num_rows * self._num_cols - self._num_mines)
-        self.lcdNumber_cellsMined.display(self._num_mines)
+    def _show_board(self, board, elapsed_ms=0):
+        """Show board of new, restored or spectated game, elapsed time of the game is shown by timer."""
+        self.timer.stop()
+        self.animation.cancel()
+        self._cancel_no_guess_mines()
+        if self._spectator is not None and not isinstance(board, SpectatorBoard):
+            self._stop_spectating()
+
+        self._board = board
+        self._clicks = 0
+        self.board_model.set_board(board)
+        self._request_probabilities()
+        self.timeEdit_timer.setTime(QtCore.QTime(0, 0, 0, 0).addMSecs(elapsed_ms))
+        if isinstance(board, EndlessView):
+            digit_count, not_mined, mined = ENDLESS_DIGIT_COUNT, "--", "--"
+        else:
+            rows, cols, mines = board.rows, board.cols, board.num_mines
+            digit_count, not_mined, mined = max(3, len(str(rows * cols))), rows * cols - mines, mines
+        for lcd_number in (self.lcdNumber_cellsUncovered, self.lcdNumber_cellsNotMined,
+                           self.lcdNumber_cellsFlagged, self.lcdNumber_cellsMined):
+            lcd_number.setDigitCount(digit_count)
+        self.lcdNumber_cellsNotMined.display(not_mined)
+        self.lcdNumber_cellsMined.display(mined)
         self._emit_uncovered_cells()
         self._emit_flagged_cells()
+        self._resize_table_widget()
 
-        table_widget = self.tableWidget
-        table_widget.setRowCount(rows)
-        table_widget.setColumnCount(cols)
-
-        mines_preset = np.full(rows * cols, False)
-        rand_choices = np.random.choice(range(rows * cols), size=mines, replace=False)
-        for choice in rand_choices:
-            mines_preset[choice] = True
-        mines_preset = mines_preset.reshape(rows, cols)
-        self._mines_preset = mines_preset
-
-        for i in range(rows):
-            for j in range(cols):
-                item = QtWidgets.QTableWidgetItem()
-                item.setText(CELL_COVERED)
-                table_widget.setItem(i, j, item)
-
-                label = CustomLabel(item)
-                label.signal_cell_right_btn.connect(self.cell_toggle_flag)
-                label.mined = mines_preset[i][j]
-                table_widget.setCellWidget(i, j, label)
-
-    def _recurse_uncover(self, row, col):
-        """Recursive uncover for cells in 3x3 area, stop if there are mines around."""
-        table_widget = self.tableWidget
-        this_label = table_widget.cellWidget(row, col)
-        this_item = this_label.item
-        if this_item.text() != CELL_COVERED:  # only covered cell can become uncovered
-            return
+    def _restore_game(self):
+        """Restore game saved on exit, return False if there is no saved game or it can't be loaded."""
+        try:
+            board, elapsed_ms = load_game(self._save_path)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError):
+            self._save_path.unlink(missing_ok=True)
+            return False
+        self._save_path.unlink(missing_ok=True)
+
+        self._move_log.start(board, elapsed_ms)
+        self._show_board(board, elapsed_ms)
+        if board.uncovered_cells:
+            self.timer.start(1000)
+        return True
+
+    def _save_game(self):
+        """Save unfinished game (started by uncover) to continue it after restart (endless field isn't saved)."""
+        if (self._game_state == GameState.RUNNING and self._board.uncovered_cells and
+                not isinstance(self._board, EndlessView)):
+            elapsed_ms = QtCore.QTime(0, 0, 0, 0).msecsTo(self.timeEdit_timer.time())
+            save_game(self._save_path, self._board, elapsed_ms)
+        else:
+            self._save_path.unlink(missing_ok=True)
 
-        # Call function for 3x3 area
-        start_row = max(0, row - 1)
-        end_row = min(self._num_rows - 1, row + 1)
-        start_col = max(0, col - 1)
-        end_col = min(self._num_cols - 1, col + 1)
-
-        mines_in_area = 0
-        coordinates = []
-        for i in range(start_row, end_row + 1, 1):
-            for j in range(start_col, end_col + 1, 1):
-                if (i, j) != (row, col):
-                    label = table_widget.cellWidget(i, j)
-                    coordinates.append((label.row(), label.column()))
-                    if label.mined:
-                        mines_in_area += 1
-
-        this_item.setText(CELL_UNCOVERED)
-        self._uncovered_cells += 1
+    @profiled("_show_uncovered")
+    def _show_uncovered(self, revealed):
+        """Show uncovered cells and update uncovered cells counter."""
+        self.board_model.cells_changed(*revealed)
         self._emit_uncovered_cells()
-        if mines_in_area:
-            this_label.setText(str(mines_in_area))
-        else:
-            for i, j in coordinates:
-                self._recurse_uncover(i, j)
 
+    @profiled("cell_uncover")
     def cell_uncover(self, row, col):
         """Uncover covered cell."""
         if self._game_state != GameState.RUNNING:
             return
-        self._game_state = GameState.BLOCK
-
-        if not self._uncovered_cells:  # start timer only after first uncover
+        PROFILER.begin_action()
+        self._clicks += 1
+
+        if not self._board.uncovered_cells:  # start timer only after first uncover
+            if isinstance(self._board, EndlessView):
+                if not self._board.flagged_cells:  # the first move is made in safe area around the origin
+                    self._board.set_origin(row, col)
+            elif (self.settings_no_guess and self._board.state[row, col] == CellState.COVERED and
+                  self._set_no_guess_mines(row, col)):
+                return  # cell is uncovered when no-guess board is generated
             self.timer.start(1000)
+        self._uncover_cell(row, col)
+
+    def _uncover_cell(self, row, col):
+        """Log and show uncover of the cell."""
+        self._move_log.write_move(MoveKind.UNCOVER, row, col)
+        with PROFILER.section("reveal"):
+            result, revealed = self._board.uncover(row, col)
+        PROFILER.add_value("cells revealed", len(revealed[0]))
+        self._show_move(result, revealed, row, col)
+
+    @profiled("cell_chord")
+    def cell_chord(self, row, col):
+        """Uncover all not flagged cells around uncovered cell if its number equals to number of flags around."""
+        if self._game_state != GameState.RUNNING:
+            return
+        PROFILER.begin_action()
+        self._clicks += 1
+
+        self._move_log.write_move(MoveKind.CHORD, row, col)
+        with PROFILER.section("reveal"):
+            result, revealed = self._board.chord(row, col)
+        PROFILER.add_value("cells revealed", len(revealed[0]))
+        self._show_move(result, revealed, *(self._board.exploded_cell or (row, col)))
+
+    @profiled("resolve_obvious_cells")
+    def resolve_obvious_cells(self):
+        """Flag surely mined cells and uncover surely safe cells found by visible numbers (flags are trusted)."""
+        board = self._board
+        if self._game_state != GameState.RUNNING or not board.uncovered_cells or isinstance(board, EndlessView):
+            return
+        PROFILER.begin_action()
+        self._clicks += 1
+
+        with PROFILER.section("find_moves"):
+            safe, mines = find_moves(board.state, board.neighbours, board.state == CellState.COVERED_FLAG,
+                                     board.num_mines)
+        flagged = board.flag_cells(*np.nonzero(mines))
+        safe_rows, safe_cols = np.nonzero(safe)
+        self._move_log.write_moves(MoveKind.FLAG, *flagged)
+        self._move_log.write_uncover_cells(safe_rows, safe_cols)
+        with PROFILER.section("reveal"):
+            result, revealed = board.uncover_cells(safe_rows, safe_cols)
+        PROFILER.add_value("cells revealed", len(revealed[0]))
+        if flagged[0].size and result == MoveResult.IGNORED:
+            result = board.result
+        self._emit_flagged_cells()
+        row, col = board.exploded_cell or (-1, -1)  # explosion starts from the mined cell (wrong flag was trusted)
+        self._show_move(result, tuple(np.concatenate(cells) for cells in zip(flagged, revealed)), row, col)
+
+    def _show_move(self, result, changed, row=-1, col=-1):
+        """Show cells changed by move with a single repaint, end the game if it's finished by the move."""
+        self._show_uncovered(changed)
+        if result == MoveResult.DEFEAT:
+            self._end_game(row, col, defeat=True)
+        elif result == MoveResult.VICTORY:
+            self._end_game(defeat=False)
+        elif result == MoveResult.CONTINUE:
+            self._request_probabilities()
+
+        if self._board.finished:
+            self._game_state = GameState.END
 
-        item = self.tableWidget.item(row, col)
-        label = self.tableWidget.cellWidget(row, col)
-        item_text = item.text()
-
-        game_continue = True
-        if item_text == CELL_COVERED:  # process only if default covered cell
-            if label.mined:
-                self._end_game(row, col, defeat=True)
-                game_continue = False
-            else:
-                self._recurse_uncover(row, col)
-                if self._num_rows * self._num_cols - self._uncovered_cells == self._num_mines:
-                    self._end_game(defeat=False)
-                    game_continue = False
-
-        if game_continue:
-            self._game_state = GameState.RUNNING
+    def _set_no_guess_mines(self, row, col):
+        """Start generation of board which can be solved without guessing from the first uncovered cell.
+
+        Input is disabled until the board is generated, return False if random board is kept (too many mines).
+        """
+        board = self._board
+        if not self._no_guess_generator.can_generate(board.rows, board.cols, board.num_mines):
+            QtWidgets.QMessageBox.information(
+                self, "No-guess board", "There are too many mines for a board solvable without guessing, "
+                "the game is played on a random board.", QtWidgets.QMessageBox.StandardButton.Ok
+            )
+            return False
+
+        self._no_guess_job_id += 1
+        job_id = self._no_guess_job_id
+        job = NoGuessJob(job_id, self._no_guess_generator, board, row, col, lambda: job_id != self._no_guess_job_id)
+        job.signals.finished.connect(self._no_guess_mines_generated)
+        self._game_state = GameState.GENERATING
+        QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.CursorShape.WaitCursor)
+        self._no_guess_thread_pool.start(job)
+        return True
+
+    def _no_guess_mines_generated(self, job_id, no_guess_board, row, col):
+        """Replace board with generated no-guess board (random board is kept on timeout) and uncover the cell."""
+        if job_id != self._no_guess_job_id or self._game_state != GameState.GENERATING:
+            return
+        QtWidgets.QApplication.restoreOverrideCursor()
+        self._game_state = GameState.RUNNING
+        if no_guess_board is None:
+            QtWidgets.QMessageBox.information(
+                self, "No-guess board", "Board solvable without guessing isn't found in time, "
+                "the game is played on a random board.", QtWidgets.QMessageBox.StandardButton.Ok
+            )
         else:
-            self._game_state = GameState.END
+            for i, j in zip(*np.nonzero(self._board.state == CellState.COVERED_FLAG)):
+                no_guess_board.toggle_flag(i, j)
+            self._board = no_guess_board
+            self._move_log.write_board(no_guess_board)
+            self.board_model.set_board(no_guess_board)
+        self.timer.start(1000)
+        self._uncover_cell(row, col)
+
+    def _cancel_no_guess_mines(self):
+        """Cancel generation of no-guess board (game is restarted, restored or spectated)."""
+        self._no_guess_job_id += 1
+        if self._game_state == GameState.GENERATING:
+            QtWidgets.QApplication.restoreOverrideCursor()
+            self._game_state = GameState.RUNNING
 
+    @profiled("cell_toggle_flag")
     def cell_toggle_flag(self, row, col):
         """Toggle flag on covered cell."""
         if self._game_state != GameState.RUNNING:
             return
-        self._game_state = GameState.BLOCK
+        PROFILER.begin_action()
+        self._clicks += 1
 
-        item = self.tableWidget.item(row, col)
-        item_text = item.text()
-        if item_text == CELL_COVERED:
-            item.setText(CELL_COVERED_FLAG)
-            self._flagged_cells += 1
-        elif item_text == CELL_COVERED_FLAG:
-            item.setText(CELL_COVERED)
-            self._flagged_cells -= 1
+        if self._board.toggle_flag(row, col):
+            self._move_log.write_move(MoveKind.FLAG, row, col)
+            self.board_model.cells_changed((row,), (col,))
+            self._request_probabilities()
 
         self._emit_flagged_cells()
-        self._game_state = GameState.RUNNING
+
+    def spectate_game(self):
+        """Ask server address and game id, then show moves of the game played on server."""
+        # ask only if started game would be dropped
+        if (
+                self._board.uncovered_cells and self._game_state == GameState.RUNNING and
+                QtWidgets.QMessageBox.question(
+                    self, "Confirm", "Are you sure you want to leave the current game?",
+                    QtWidgets.QMessageBox.StandardButton.Yes, QtWidgets.QMessageBox.StandardButton.No
+                ) != QtWidgets.QMessageBox.StandardButton.Yes
+        ):
+            return
+        address, ok = QtWidgets.QInputDialog.getText(self, "Spectate", "Server address (host:port or socket path):",
+                                                     text=DEFAULT_SERVER_ADDRESS)
+        if not ok or not address:
+            return
+        game_id, ok = QtWidgets.QInputDialog.getInt(self, "Spectate", "Game id:", 1, 1)
+        if not ok:
+            return
+
+        if self._spectator is not None:
+            self._stop_spectating()
+        self.timer.stop()
+        self.animation.cancel()
+        self._cancel_no_guess_mines()
+        self._game_state = GameState.SPECTATE
+        self._spectator = SpectatorClient(address, game_id, self)
+        self._spectator.state_received.connect(self._show_spectated_board)
+        self._spectator.move_received.connect(self._show_spectated_move)
+        self._spectator.disconnected.connect(self._spectator_disconnected)
+        self.setWindowTitle(f"Minesweeper - spectating game {game_id} on {address}")
+
+    def _show_spectated_board(self, game_state):
+        """Show current state of spectated game."""
+        self._show_board(SpectatorBoard(game_state))
+
+    def _show_spectated_move(self, event):
+        """Show cells changed by move of spectated game."""
+        if isinstance(self._board, SpectatorBoard):
+            self.board_model.cells_changed(*self._board.apply_move(event))
+            self._emit_uncovered_cells()
+            self._emit_flagged_cells()
+            self._request_probabilities()
+
+    def _spectator_disconnected(self, reason):
+        """Show reason of spectating end, the last state of the game stays on the field."""
+        self._stop_spectating()
+        QtWidgets.QMessageBox.information(self, "Spectate", f"Spectating is finished: {reason}",
+                                          QtWidgets.QMessageBox.StandardButton.Ok)
+
+    def _stop_spectating(self):
+        """Close connection to server."""
+        self._spectator.close()
+        self._spectator.deleteLater()
+        self._spectator = None
+        self.setWindowTitle("Minesweeper")
+
+    def show_probabilities(self, checked):
+        """Show or hide mine probabilities overlay."""
+        self.probability_overlay.enabled = checked
+        if checked:
+            self._request_probabilities()
+        else:
+            self.probability_overlay.clear()
+
+    def show_performance_overlay(self, checked):
+        """Enable profiling and show its statistics over the field, or disable and hide it."""
+        PROFILER.enabled = checked
+        self.performance_overlay.set_visible(checked)
+
+    def export_profile(self):
+        """Save collected profiling data as JSON summary or Chrome trace."""
+        summary_filter, trace_filter = "Profile summary (*.json)", "Chrome trace (*.json)"
+        path, selected_filter = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Export profile", "minesweeper_profile.json", f"{summary_filter};;{trace_filter}"
+        )
+        if not path:
+            return
+        try:
+            if selected_filter == trace_filter:
+                PROFILER.export_chrome_trace(path)
+            else:
+                PROFILER.export_json(path)
+        except OSError as e:
+            QtWidgets.QMessageBox.warning(self, "Export error", str(e), QtWidgets.QMessageBox.StandardButton.Ok)
+
+    def _request_probabilities(self):
+        """Recalculate mine probabilities in background after the move (not available for endless field)."""
+        if isinstance(self._board, EndlessView):
+            self.probability_overlay.clear()
+            return
+        self.probability_overlay.request(self._board)
 
     def _end_game(self, row=-1, col=-1, *, defeat):
-        """Game end."""
+        """Game end, record result into statistics, show mines animation and then message."""
         self.timer.stop()
+        self.probability_overlay.clear()
+        if not isinstance(self._board, EndlessView):  # endless field has no preset to compare results
+            board = self._board
+            elapsed_ms = QtCore.QTime(0, 0, 0, 0).msecsTo(self.timeEdit_timer.time())
+            self.stats_store.record(GameRecord(board.rows, board.cols, board.num_mines, not defeat, elapsed_ms,
+                                               self._clicks, board.bbbv))
+
+        self._defeat = defeat
+        max_frames = MAX_ANIMATION_TIME // max(1, self.settings_animation_period)
+        if defeat:
+            frames = explode_frames(self._board, row, col, max_frames)
+        else:
+            frames = defuse_frames(self._board, max_frames)
+        self.animation.start(frames, self.settings_animation_period, self._apply_animation_frame)
+
+    def _apply_animation_frame(self, rows, cols, cell_state):
+        """Set state for cells of animation frame and repaint them."""
+        self._board.set_state(rows, cols, cell_state)
+        self.board_model.cells_changed(rows, cols)
 
+    def _show_end_message(self):
+        """Show game result message (after end game animation)."""
         title = "Info"
-        if defeat:
-            self._show_mines_explode(row, col)
+        if self._defeat:
             text = "DEFEAT!"
             QtWidgets.QMessageBox.warning(self, title, text, QtWidgets.QMessageBox.StandardButton.Ok)
         else:
-            self._show_mines_defused()
             text = "VICTORY!"
             QtWidgets.QMessageBox.information(self, title, text, QtWidgets.QMessageBox.StandardButton.Ok)
 
-    def _show_mines_explode(self, row, col):
-        """Shows all mines exploding."""
-        self._ignore_animation_period = False
-
-        # Serial explodes in increasing square
-        table_widget = self.tableWidget
-
-        rows, cols = table_widget.rowCount(), table_widget.columnCount()
-        # Calc maximum distance from point to tabWidget border
-        max_loops = max(row - 1, rows - row - 1, col - 1, cols - col - 1)
-
-        mines_exploded = 0
-
-        def get_item(_row, _col):
-            label = table_widget.cellWidget(_row, _col)
-            if label and label.mined:
-                nonlocal mines_exploded
-                mines_exploded += 1
-                return label.item
-            return None
-
-        if item := get_item(row, col):
-            item.setText(CELL_UNCOVERED_MINE)
-            self._animation_sleep()
-            item.setText(CELL_UNCOVERED_MINE_BAD)
-        if self._num_mines == mines_exploded:  # return if it was the only one
-            return
-        self._animation_sleep()
-
-        square_items = []
-        bias = 1
-        while bias <= max_loops:
-            start_row, end_row = row - bias, row + bias
-            start_col, end_col = col - bias, col + bias
-
-            for i in range(start_row, end_row + 1, 1):
-                if item := get_item(i, start_col):
-                    square_items.append(item)
-                if item := get_item(i, end_col):
-                    square_items.append(item)
-
-            for j in range(start_col + 1, end_col, 1):
-                if item := get_item(start_row, j):
-                    square_items.append(item)
-                if item := get_item(end_row, j):
-                    square_items.append(item)
-
-            if square_items:
-                for item in square_items:
-                    item.setText(CELL_UNCOVERED_MINE)
-                self._animation_sleep()
-                for item in square_items:
-                    item.setText(CELL_UNCOVERED_MINE_BAD)
-
-            if mines_exploded == self._num_mines:
-                break
-            if square_items:
-                square_items.clear()
-                self._animation_sleep()
-            bias += 1
-
-    def _show_mines_defused(self):
-        """Shows all mines being defused."""
-        self._ignore_animation_period = False
-
-        # Serial defuse from up to down
-        table_widget = self.tableWidget
-        rows, cols = table_widget.rowCount(), table_widget.columnCount()
-
-        mines_defused = 0
-        for i in range(rows):
-            is_row_mined = False
-            for j in range(cols):
-                label = table_widget.cellWidget(i, j)
-                if label.mined:
-                    is_row_mined = True
-                    label.item.setText(CELL_UNCOVERED_MINE_OK)
-                    mines_defused += 1
-            if mines_defused == self._num_mines or i == rows - 1:
-                break
-            if is_row_mined:
-                self._animation_sleep()
-
+    @profiled("_resize_table_widget")
     def _resize_table_widget(self):
-        """Resize tableWidget to maximum available size."""
+        """Resize cells of tableView to maximum available size (scrollable if cells don't fit)."""
         available_size = self.gridLayout_field.geometry().size()
         height, width = available_size.height(), available_size.width()
         if height and width:
-            table_widget = self.tableWidget
-            height_cnt, width_cnt = table_widget.rowCount(), table_widget.columnCount()
-            coef = min(height // height_cnt, width // width_cnt)
-            table_widget.setMaximumHeight(height_cnt * coef)
-            table_widget.setMaximumWidth(width_cnt * coef)
+            table_view = self.tableView
+            h_header, v_header = table_view.horizontalHeader(), table_view.verticalHeader()
+            frame = 2 * table_view.frameWidth()
+            header_height = h_header.sizeHint().height() + frame
+            header_width = v_header.sizeHint().width() + frame
+            height_cnt, width_cnt = self._board.rows, self._board.cols
+            if isinstance(self._board, EndlessView):  # visible part of endless field has size from settings
+                height_cnt, width_cnt = self.settings_rows, self.settings_cols
+            coef = max(MIN_CELL_SIZE,
+                       min((height - header_height) // height_cnt, (width - header_width) // width_cnt))
+            h_header.setDefaultSectionSize(coef)
+            v_header.setDefaultSectionSize(coef)
+            self._pixmap_cache.set_cell_size(coef, coef)
+            table_view.setMaximumHeight(height_cnt * coef + header_height)
+            table_view.setMaximumWidth(width_cnt * coef + header_width)
+
+    def _center_endless_field(self):
+        """Scroll endless field to the center of its window."""
+        if isinstance(self._board, EndlessView):
+            self.tableView.scrollTo(self.board_model.index(self._board.rows // 2, self._board.cols // 2),
+                                    QtWidgets.QAbstractItemView.ScrollHint.PositionAtCenter)
+
+    def _scroll_endless_field(self):
+        """Move window of endless field when it's scrolled near the window edge, so it can be scrolled endlessly."""
+        board = self._board
+        if not isinstance(board, EndlessView) or self.animation.running or self._endless_recentering:
+            return  # animation frames use window cells
+        v_bar, h_bar = self.tableView.verticalScrollBar(), self.tableView.horizontalScrollBar()
+        row, col = v_bar.value(), h_bar.value()  # first visible cell (scrolled per item)
+        if (ENDLESS_SCROLL_MARGIN <= row <= v_bar.maximum() - ENDLESS_SCROLL_MARGIN and
+                ENDLESS_SCROLL_MARGIN <= col <= h_bar.maximum() - ENDLESS_SCROLL_MARGIN):
+            return
+        shift_rows, shift_cols = board.recenter(row + v_bar.pageStep() // 2, col + h_bar.pageStep() // 2)
+        self._endless_recentering = True
+        try:
+            self.board_model.cells_changed((0, board.rows - 1), (0, board.cols - 1))
+            v_bar.setValue(row - shift_rows)
+            h_bar.setValue(col - shift_cols)
+        finally:
+            self._endless_recentering = False
 
     def tableKeyPressEvent(self, event):
-        """Reimplementation of keyPressEvent for tableWidget, handles key pressing."""
-        if event.key() in {QtCore.Qt.Key.Key_Space, QtCore.Qt.Key.Key_Return, QtCore.Qt.Key.Key_Enter}:
-            item = self.tableWidget.currentItem()
-            self.tableWidget.cellClicked.emit(item.row(), item.column())
-        elif event.key() == QtCore.Qt.Key.Key_Backspace:
-            table_widget = self.tableWidget
-            row, col = table_widget.currentRow(), table_widget.currentColumn()
-            label = table_widget.cellWidget(row, col)
-            label.signal_cell_right_btn.emit(row, col)
-
-        QtWidgets.QTableWidget.keyPressEvent(self.tableWidget, event)
+        """Reimplementation of keyPressEvent for tableView, handles key pressing."""
+        index = self.tableView.currentIndex()
+        if index.isValid():
+            if event.key() in {QtCore.Qt.Key.Key_Space, QtCore.Qt.Key.Key_Return, QtCore.Qt.Key.Key_Enter}:
+                self.cell_uncover(index.row(), index.column())
+            elif event.key() == QtCore.Qt.Key.Key_Backspace:
+                self.cell_toggle_flag(index.row(), index.column())
+
+        QtWidgets.QTableView.keyPressEvent(self.tableView, event)
+
+    def tablePaintEvent(self, event):
+        """Reimplementation of paintEvent for tableView, painting of every frame is profiled."""
+        with PROFILER.frame():
+            QtWidgets.QTableView.paintEvent(self.tableView, event)
 
     def resizeEvent(self, event):
         """Resize event reimplementation."""
@@ -722,11 +1480,48 @@ class MinesweeperWindow(QtWidgets.QMainWindow, Ui_MinesweeperWindow):
         return result
 
     def eventFilter(self, watched, event):
-        """Event filter for timeEdit_timer widget, ignore all mouse events."""
+        """Event filter for tableView (right button clicks for flag) and timeEdit_timer (ignore mouse events)."""
+        if watched is self.tableView.viewport():
+            if event.type() in {QtCore.QEvent.Type.MouseButtonPress, QtCore.QEvent.Type.MouseButtonRelease}:
+                return self._table_mouse_button_event(event)
+            return False
         if isinstance(event, QtGui.QMouseEvent):
             return True
         return False
 
+    def _table_mouse_button_event(self, event):
+        """Handle mouse buttons on tableView: right click for flag, middle or left+right click for chord.
+
+        Return True if event is consumed (buttons of left+right click don't uncover or flag cell).
+        """
+        index = self.tableView.indexAt(event.position().toPoint())
+        button, buttons = event.button(), event.buttons()
+        left_right = QtCore.Qt.MouseButton.LeftButton | QtCore.Qt.MouseButton.RightButton
+        if event.type() == QtCore.QEvent.Type.MouseButtonPress:
+            if buttons & left_right == left_right:
+                self._chord_pressed = True
+                return True
+            if button == QtCore.Qt.MouseButton.RightButton:
+                self._right_btn_pressed_index = index
+            elif button == QtCore.Qt.MouseButton.MiddleButton:
+                self._middle_btn_pressed_index = index
+            return False
+
+        if self._chord_pressed:
+            if not button & left_right:
+                return False
+            if not buttons & left_right:  # chord is made when both buttons are released
+                self._chord_pressed = False
+                if index.isValid():
+                    self.cell_chord(index.row(), index.column())
+            return True
+        if index.isValid():
+            if button == QtCore.Qt.MouseButton.RightButton and index == self._right_btn_pressed_index:
+                self.cell_toggle_flag(index.row(), index.column())
+            elif button == QtCore.Qt.MouseButton.MiddleButton and index == self._middle_btn_pressed_index:
+                self.cell_chord(index.row(), index.column())
+        return False
+
     def closeEvent(self, event):
         """Catch close event and ask confirmation."""
         if QtWidgets.QMessageBox.question(
@@ -735,7 +1530,22 @@ class MinesweeperWindow(QtWidgets.QMainWindow, Ui_MinesweeperWindow):
         ) == QtWidgets.QMessageBox.StandardButton.Yes:
             self._config.rows, self._config.cols, self._config.mines, self._config.animation_period = \
                 self.settings_rows, self.settings_cols, self.settings_mines, self.settings_animation_period
+            self._config.no_guess, self._config.endless = self.settings_no_guess, self.settings_endless
             self._config.save_config()
+            try:
+                self._save_game()
+            except OSError as e:
+                QtWidgets.QMessageBox.warning(self, "Minesweeper error", f"Game isn't saved: {e}",
+                                              QtWidgets.QMessageBox.StandardButton.Ok)
+            self._move_log.close()
+            if self._spectator is not None:
+                self._stop_spectating()
+            self._board_pool.close()
+            self._cancel_no_guess_mines()
+            self._no_guess_thread_pool.waitForDone()  # generator isn't used by cancelled job after it's finished
+            self._no_guess_generator.close()
+            if self._stats_store is not None:
+                self._stats_store.close()
             event.accept()
         else:
             event.ignore()
@@ -745,39 +1555,33 @@ class ThemeController:
     """Theme controller, can set light or dark theme."""
 
     def __init__(self):
-        """Initialize theme controller."""
-        qdarktheme.setup_theme("auto")
-        if darkdetect.theme() == "Dark":
-            self.theme = ThemeState.DARK
-            self.invert_images_colors()
-        else:
-            self.theme = ThemeState.LIGHT
+        """Initialize theme controller with theme of the OS."""
+        self.theme = detect_system_theme()
+        self._setup_theme(self.theme)
 
     def set_dark(self):
         """Set dark theme."""
         if self.theme != ThemeState.DARK:
-            qdarktheme.setup_theme("dark")
+            self._setup_theme(ThemeState.DARK)
             self.theme = ThemeState.DARK
-            self.invert_images_colors()
 
     def set_light(self):
         """Set light theme."""
         if self.theme != ThemeState.LIGHT:
-            qdarktheme.setup_theme("light")
+            self._setup_theme(ThemeState.LIGHT)
             self.theme = ThemeState.LIGHT
-            self.invert_images_colors()
 
     @staticmethod
-    def invert_images_colors():
-        """Invert covered images for light/dark theme."""
-        for _code, _img in PICT_DICT.items():
-            if _code in {CELL_COVERED, CELL_COVERED_FLAG}:
-                _img.invertPixels(QtGui.QImage.InvertMode.InvertRgb)
+    def _setup_theme(theme):
+        """Apply theme stylesheet (qdarktheme is imported on first use)."""
+        import qdarktheme
+        qdarktheme.setup_theme("dark" if theme == ThemeState.DARK else "light")
 
 
 def main(sys_argv):
     """Start minesweeper application."""
     app = QtWidgets.QApplication(sys_argv)
+    log_startup("application created")
     # app.setStyle(QtWidgets.QStyleFactory.create("Fusion"))
 
     try:
@@ -787,9 +1591,9 @@ def main(sys_argv):
         QtWidgets.QMessageBox.critical(window, "Minesweeper error", str(e), QtWidgets.QMessageBox.StandardButton.Ok)
         return -1
 
+    QtCore.QTimer.singleShot(0, lambda: log_startup("event loop started"))
     return app.exec()
 
 
 if __name__ == "__main__":
-    import sys
     sys.exit(main(sys.argv))
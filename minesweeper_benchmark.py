@@ -0,0 +1,290 @@
+"""Benchmarks of minesweeper board setup, uncover, painting and startup (run without display).
+
+Usage example:
+    python minesweeper_benchmark.py --output baseline.json
+    python minesweeper_benchmark.py --output current.json --compare baseline.json
+
+Every benchmark is repeated and its median time is written to the output JSON file. In compare mode
+benchmarks which became slower than baseline by more than threshold are reported as regressions
+and exit code is 1.
+"""
+
+import argparse
+import importlib.machinery
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np  # noqa: E402
+
+from minesweeper_engine import Board, CellState  # noqa: E402
+from minesweeper_generator import BoardPool  # noqa: E402
+
+BASE_PATH = Path(__file__).parent
+FIELD_SIZES = ((10, 10, 12), (100, 100, 1500), (1000, 1000, 150000))
+FLOOD_SIZE = (1000, 1000)
+PAINT_SIZE = (30, 40)
+WINDOW_SIZE = (1280, 1024)
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.2
+
+COLD_START_CODE = """
+import importlib.machinery, importlib.util, os, sys, time
+start_time = time.perf_counter()
+sys.path.insert(0, {base_path!r})
+loader = importlib.machinery.SourceFileLoader("minesweeper", {script!r})
+module = importlib.util.module_from_spec(importlib.util.spec_from_loader("minesweeper", loader))
+loader.exec_module(module)
+app = module.QtWidgets.QApplication(sys.argv)
+window = module.MinesweeperWindow(save_path={save_path!r}, move_log_path={move_log_path!r},
+                                  stats_path={stats_path!r})
+app.processEvents()
+print(time.perf_counter() - start_time, flush=True)
+os._exit(0)
+"""
+
+
+def load_minesweeper():
+    """Load minesweeper.pyw as module (.pyw files can't be imported on every platform)."""
+    loader = importlib.machinery.SourceFileLoader("minesweeper", str(BASE_PATH / "minesweeper.pyw"))
+    module = importlib.util.module_from_spec(importlib.util.spec_from_loader("minesweeper", loader))
+    loader.exec_module(module)
+    return module
+
+
+def game_file_paths(data_path):
+    """Get paths of files written by the game window (save, move log, statistics) inside data_path."""
+    data_path = Path(data_path)
+    return {"save_path": data_path / "minesweeper.sav", "move_log_path": data_path / "minesweeper_moves.log",
+            "stats_path": data_path / "minesweeper_stats.db"}
+
+
+def measure(function, repeat, setup=None):
+    """Call function repeat times (setup() before every call isn't measured), return list of times."""
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start_time = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start_time)
+    return times
+
+
+class WindowBenchmarks:
+    """Benchmarks of MinesweeperWindow methods, all of them share one window."""
+
+    def __init__(self, minesweeper, data_path):
+        """Create window with reproducible boards, without animation and end game messages.
+
+        Game files of the window are kept in data_path, so files of the player are not touched.
+        """
+        self.ms = minesweeper
+        self.app = minesweeper.QtWidgets.QApplication.instance() or minesweeper.QtWidgets.QApplication([])
+        self.window = minesweeper.MinesweeperWindow(**game_file_paths(data_path))
+        self.window.resize(*WINDOW_SIZE)
+        self.window.settings_animation_period = 0
+        self.window.animation.finished.disconnect(self.window._show_end_message)
+        self.window._board_pool.close()
+        self.window._board_pool = BoardPool(size=0, seed=0)  # every board is generated by take
+        self.app.processEvents()
+
+    def close(self):
+        """Close window without confirmation and saving config."""
+        self.window._board_pool.close()
+        self.window._no_guess_generator.close()
+        if self.window._stats_store is not None:  # database is in temporary directory removed after benchmarks
+            self.window._stats_store.close()
+        self.window.hide()
+        self.window.deleteLater()
+        self.app.processEvents()
+
+    def set_field(self, rows, cols, mines, repeat):
+        """Start a new game with field size (board generation, model reset, resize)."""
+        window = self.window
+        window.settings_rows, window.settings_cols, window.settings_mines = rows, cols, mines
+        return measure(lambda: (window._set_field(), self.app.processEvents()), repeat)
+
+    def flood_uncover(self, repeat):
+        """Uncover the whole field by one click (two mines in the corner keep the game running)."""
+        window = self.window
+        rows, cols = FLOOD_SIZE
+        mines = np.zeros(FLOOD_SIZE, dtype=bool)
+        mines[0, 0] = mines[0, 2] = True
+
+        def setup():
+            window._board = Board(mines)
+            window.board_model.set_board(window._board)
+            window._game_state = self.ms.GameState.RUNNING
+            self.app.processEvents()
+
+        return measure(lambda: (window.cell_uncover(rows - 1, cols - 1), self.app.processEvents()), repeat, setup)
+
+    def _show_paint_board(self):
+        """Show board which fits to the window with all cells uncovered."""
+        window = self.window
+        window._board = Board.random(*PAINT_SIZE, PAINT_SIZE[0] * PAINT_SIZE[1] // 6, seed=0)
+        window._board.set_state(*np.indices(PAINT_SIZE).reshape(2, -1), CellState.UNCOVERED)
+        window.board_model.set_board(window._board)
+        window._resize_table_widget()
+        self.app.processEvents()
+
+    def repaint(self, repeat):
+        """Repaint all cells of the field by ItemDelegate."""
+        self._show_paint_board()
+        return measure(self.window.tableView.viewport().repaint, repeat)
+
+    def theme_toggle(self, repeat):
+        """Switch to the other theme and back, field is repainted after every switch."""
+        self._show_paint_board()
+        window = self.window
+
+        def toggle():
+            for action in (window.action_themeDark, window.action_themeLight):
+                action.trigger()
+                window.tableView.viewport().repaint()
+
+        return measure(toggle, repeat)
+
+    def explode(self, repeat):
+        """End game by defeat on the biggest field with zero animation period."""
+        window = self.window
+        rows, cols, mines = FIELD_SIZES[-1]
+        board = Board.random(rows, cols, mines, seed=0)
+        row, col = np.argwhere(board.mines)[0]
+
+        def setup():
+            window._board = Board(board.mines)
+            window.board_model.set_board(window._board)
+            window._board.uncover(row, col)
+            self.app.processEvents()
+
+        return measure(lambda: (window._end_game(row, col, defeat=True), self.app.processEvents()), repeat, setup)
+
+
+def cold_start(repeat, data_path):
+    """Start new Python process and measure time to the first shown window (game files are kept in data_path)."""
+    paths = {name: str(path) for name, path in game_file_paths(data_path).items()}
+    code = COLD_START_CODE.format(base_path=str(BASE_PATH), script=str(BASE_PATH / "minesweeper.pyw"), **paths)
+    times = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        with subprocess.Popen([sys.executable, "-c", code], stdout=subprocess.PIPE, text=True) as process:
+            line = process.stdout.readline()
+            elapsed = time.perf_counter() - start_time
+        if process.returncode:
+            msg = f"Cold start failed with exit code {process.returncode}"
+            raise RuntimeError(msg)
+        times.append(elapsed)
+        print(f"  (window shown {float(line):.3f} s after interpreter start)", file=sys.stderr)
+    return times
+
+
+def run_benchmarks(repeat, names=None):
+    """Run benchmarks (all or selected by names), return dict name -> list of times."""
+    with tempfile.TemporaryDirectory(prefix="minesweeper_benchmark_") as data_path:
+        return _run_benchmarks(repeat, names, data_path)
+
+
+def _run_benchmarks(repeat, names, data_path):
+    """Run benchmarks with game files kept in data_path."""
+    minesweeper = load_minesweeper()
+    window_benchmarks = WindowBenchmarks(minesweeper, data_path)
+    benchmarks = {}
+    for rows, cols, mines in FIELD_SIZES:
+        benchmarks[f"set_field_{rows}x{cols}"] = (
+            lambda rows=rows, cols=cols, mines=mines: window_benchmarks.set_field(rows, cols, mines, repeat)
+        )
+    benchmarks.update({
+        "flood_uncover_{}x{}".format(*FLOOD_SIZE): lambda: window_benchmarks.flood_uncover(repeat),
+        "repaint_{}x{}".format(*PAINT_SIZE): lambda: window_benchmarks.repaint(repeat),
+        "theme_toggle_{}x{}".format(*PAINT_SIZE): lambda: window_benchmarks.theme_toggle(repeat),
+        "explode_{}x{}".format(*FIELD_SIZES[-1][:2]): lambda: window_benchmarks.explode(repeat),
+        "cold_start": lambda: cold_start(repeat, data_path),
+    })
+
+    results = {}
+    try:
+        for name, benchmark in benchmarks.items():
+            if names and name not in names:
+                continue
+            print(f"{name}...", file=sys.stderr)
+            results[name] = benchmark()
+    finally:
+        window_benchmarks.close()
+    return results
+
+
+def summarize(results):
+    """Get JSON-serializable results with median and minimum times."""
+    import PySide6
+    return {
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pyside6": PySide6.__version__,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "benchmarks": {
+            name: {"median": statistics.median(times), "min": min(times), "times": times}
+            for name, times in results.items()
+        },
+    }
+
+
+def compare(current, baseline, threshold):
+    """Print comparison of median times with baseline, return names of regressed benchmarks."""
+    regressions = []
+    print(f"{'benchmark':<28}{'baseline, ms':>14}{'current, ms':>14}{'ratio':>8}")
+    for name, result in current["benchmarks"].items():
+        if name not in baseline["benchmarks"]:
+            print(f"{name:<28}{'-':>14}{result['median'] * 1000:>14.2f}{'-':>8}")
+            continue
+        base_median = baseline["benchmarks"][name]["median"]
+        ratio = result["median"] / base_median if base_median else float("inf")
+        mark = ""
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            mark = "  REGRESSION"
+        print(f"{name:<28}{base_median * 1000:>14.2f}{result['median'] * 1000:>14.2f}{ratio:>8.2f}{mark}")
+    return regressions
+
+
+def parse_args(args):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Run minesweeper benchmarks.")
+    parser.add_argument("--output", type=Path, default=Path("benchmark_results.json"),
+                        help="JSON file for results (default: %(default)s)")
+    parser.add_argument("--compare", type=Path, metavar="BASELINE", help="JSON file with baseline results")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown relative to baseline (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="number of runs of every benchmark (default: %(default)s)")
+    parser.add_argument("--only", nargs="+", metavar="NAME", help="run only benchmarks with these names")
+    return parser.parse_args(args)
+
+
+def main(args):
+    """Run benchmarks, save results and compare them with baseline."""
+    args = parse_args(args)
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    current = summarize(run_benchmarks(args.repeat, args.only))
+    args.output.write_text(json.dumps(current, indent=2))
+
+    if baseline is None:
+        for name, result in current["benchmarks"].items():
+            print(f"{name:<28}{result['median'] * 1000:>12.2f} ms")
+        return 0
+    return 1 if compare(current, baseline, args.threshold) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,388 @@
+"""Endless minesweeper field generated lazily by chunks.
+
+Mines of every chunk are generated by numpy.random.Generator seeded by (field seed, chunk position),
+so any chunk can be regenerated at any time. Loaded chunks are kept in LRU order, least recently used
+chunks are evicted when their number exceeds the limit: mines and numbers are dropped (they are
+regenerated from seed), cell states are kept as 2-bit packed delta only if some cells were changed.
+"""
+
+import collections
+
+import numpy as np
+
+from minesweeper_engine import CellState, MoveResult, count_neighbours, dilate, label_zero_regions
+from minesweeper_savegame import pack_states, unpack_states
+
+CHUNK_SIZE = 32
+MAX_LOADED_CHUNKS = 1024  # about 3 KB per chunk of 32x32 cells
+MAX_FLOOD_CELLS = 100000  # safety limit of cells uncovered by one move (regions are much smaller at MIN_DENSITY)
+MIN_DENSITY = 0.12  # regions without mines around grow to tens of thousands of cells near density 0.1
+MAX_DENSITY = 0.9
+
+
+def _border_parts(size):
+    """Get (chunk shift, rows of dilated chunk, rows of shifted chunk) for parts of chunk dilated by 1 cell.
+
+    The same parts are used for columns.
+    """
+    return ((-1, slice(0, 1), slice(size - 1, size)), (0, slice(1, size + 1), slice(0, size)),
+            (1, slice(size + 1, size + 2), slice(0, 1)))
+
+
+def _zigzag(value):
+    """Map integer to non-negative integer (0, -1, 1, -2, ... -> 0, 1, 2, 3, ...) for seeding."""
+    return 2 * value if value >= 0 else -2 * value - 1
+
+
+class Chunk:
+    """Loaded chunk: mines, numbers of mines around (including mines of neighbour chunks) and cell states."""
+
+    def __init__(self, mines, neighbours, state):
+        """Initialize."""
+        self.mines = mines
+        self.neighbours = neighbours
+        self.state = state
+
+
+class EndlessBoard:
+    """Endless minesweeper board, cells are addressed by any integer (row, col).
+
+    Area 3x3 around cell (0, 0) has no mines, so the game can be started from it.
+    The game can be lost only, number of uncovered cells is the score.
+    """
+
+    def __init__(self, density, seed=None, chunk_size=CHUNK_SIZE, max_chunks=MAX_LOADED_CHUNKS):
+        """Initialize board with probability of mine in every cell (limited by MIN_DENSITY and MAX_DENSITY)."""
+        self.density = min(MAX_DENSITY, max(MIN_DENSITY, density))
+        self.seed = np.random.SeedSequence().entropy if seed is None else seed
+        self._chunk_size = chunk_size
+        self._max_chunks = max_chunks
+        self._chunks = collections.OrderedDict()  # (chunk row, chunk col): Chunk, in LRU order
+        self._deltas = {}  # (chunk row, chunk col): packed states of evicted changed chunks
+        self._uncovered_cells = 0
+        self._flagged_cells = 0
+        self._result = MoveResult.CONTINUE
+        self._exploded_cell = None
+        self._flood_seeds = {}  # seeds of the flood stopped by MAX_FLOOD_CELLS, continued by the next flood
+
+    @property
+    def uncovered_cells(self):
+        """Get number of uncovered cells."""
+        return self._uncovered_cells
+
+    @property
+    def flagged_cells(self):
+        """Get number of flagged cells."""
+        return self._flagged_cells
+
+    @property
+    def result(self):
+        """Get result of the game (CONTINUE until a mine is uncovered)."""
+        return self._result
+
+    @property
+    def finished(self):
+        """Check if game is finished (by defeat)."""
+        return self._result == MoveResult.DEFEAT
+
+    @property
+    def exploded_cell(self):
+        """Get mined cell (row, col) uncovered by the last move (None if game isn't lost)."""
+        return self._exploded_cell
+
+    @property
+    def loaded_chunks(self):
+        """Get number of loaded chunks."""
+        return len(self._chunks)
+
+    @property
+    def stored_deltas(self):
+        """Get number of evicted chunks with stored cell states."""
+        return len(self._deltas)
+
+    def chunk_mines(self, chunk_row, chunk_col):
+        """Generate mines of chunk (the same mines for the same seed and chunk)."""
+        size = self._chunk_size
+        rng = np.random.default_rng([self.seed, _zigzag(chunk_row), _zigzag(chunk_col)])
+        mines = rng.random((size, size)) < self.density
+        if chunk_row in {-1, 0} and chunk_col in {-1, 0}:  # safe start area around (0, 0)
+            rows = np.arange(size) + chunk_row * size
+            cols = np.arange(size) + chunk_col * size
+            mines[np.ix_(np.abs(rows) <= 1, np.abs(cols) <= 1)] = False
+        return mines
+
+    def _chunk(self, chunk_row, chunk_col):
+        """Get chunk (loaded if needed, least recently used chunks are evicted)."""
+        key = (chunk_row, chunk_col)
+        chunk = self._chunks.get(key)
+        if chunk is not None:
+            self._chunks.move_to_end(key)
+            return chunk
+
+        size = self._chunk_size
+        padded = np.zeros((3 * size, 3 * size), dtype=bool)  # chunk with its 8 neighbour chunks
+        for i in range(3):
+            for j in range(3):
+                padded[i * size:(i + 1) * size, j * size:(j + 1) * size] = self.chunk_mines(
+                    chunk_row + i - 1, chunk_col + j - 1)
+        area = padded[size - 1:2 * size + 1, size - 1:2 * size + 1]  # 1 cell border is enough for numbers
+        neighbours = count_neighbours(area)[1:-1, 1:-1]
+        delta = self._deltas.pop(key, None)
+        if delta is None:
+            state = np.zeros((size, size), dtype=np.uint8)
+        elif delta.ndim == 2:
+            state = delta
+        else:
+            state = unpack_states(delta, size, size).copy()
+        chunk = self._chunks[key] = Chunk(area[1:-1, 1:-1].copy(), neighbours.copy(), state)
+
+        while len(self._chunks) > self._max_chunks:
+            evicted_key, evicted = self._chunks.popitem(last=False)
+            if evicted.state.max() > CellState.UNCOVERED_MINE:  # end game states don't fit into 2 bits
+                self._deltas[evicted_key] = evicted.state
+            elif evicted.state.any():
+                self._deltas[evicted_key] = pack_states(evicted.state)
+        return chunk
+
+    def _locate(self, row, col):
+        """Get chunk of cell and cell position in the chunk."""
+        chunk_row, chunk_cell_row = divmod(row, self._chunk_size)
+        chunk_col, chunk_cell_col = divmod(col, self._chunk_size)
+        return self._chunk(chunk_row, chunk_col), chunk_cell_row, chunk_cell_col
+
+    def cell_state(self, row, col):
+        """Get state of cell."""
+        chunk, i, j = self._locate(row, col)
+        return chunk.state[i, j]
+
+    def cell_neighbours(self, row, col):
+        """Get number of mines around cell."""
+        chunk, i, j = self._locate(row, col)
+        return chunk.neighbours[i, j]
+
+    def region(self, row, col, rows, cols):
+        """Get (state, neighbours, mines) grids of rectangular region."""
+        state = np.empty((rows, cols), dtype=np.uint8)
+        neighbours = np.empty((rows, cols), dtype=np.uint8)
+        mines = np.empty((rows, cols), dtype=bool)
+        size = self._chunk_size
+        for chunk_row in range(row // size, (row + rows - 1) // size + 1):
+            for chunk_col in range(col // size, (col + cols - 1) // size + 1):
+                chunk = self._chunk(chunk_row, chunk_col)
+                top, left = max(row, chunk_row * size), max(col, chunk_col * size)
+                bottom, right = min(row + rows, (chunk_row + 1) * size), min(col + cols, (chunk_col + 1) * size)
+                target = (slice(top - row, bottom - row), slice(left - col, right - col))
+                source = (slice(top - chunk_row * size, bottom - chunk_row * size),
+                          slice(left - chunk_col * size, right - chunk_col * size))
+                state[target], neighbours[target], mines[target] = (
+                    chunk.state[source], chunk.neighbours[source], chunk.mines[source])
+        return state, neighbours, mines
+
+    def set_state(self, rows, cols, state):
+        """Set state for cells (used to show mines in the end of the game)."""
+        for row, col in zip(np.ravel(rows).tolist(), np.ravel(cols).tolist()):
+            chunk, i, j = self._locate(row, col)
+            chunk.state[i, j] = state
+
+    def uncover(self, row, col):
+        """Uncover covered cell, return move result and coordinates (rows, cols) of uncovered cells."""
+        chunk, i, j = self._locate(row, col)
+        if self.finished or chunk.state[i, j] != CellState.COVERED:
+            return MoveResult.IGNORED, ((), ())
+        if chunk.mines[i, j]:
+            self._result = MoveResult.DEFEAT
+            self._exploded_cell = (row, col)
+            return self._result, ((), ())
+        return self._flood([(row, col)])
+
+    def chord(self, row, col):
+        """Uncover all not flagged cells around uncovered cell if its number equals to number of flags around."""
+        chunk, i, j = self._locate(row, col)
+        if self.finished or chunk.state[i, j] != CellState.UNCOVERED:
+            return MoveResult.IGNORED, ((), ())
+        number = chunk.neighbours[i, j]
+
+        flags, covered, mined = 0, [], None
+        for cell_row in (row - 1, row, row + 1):
+            for cell_col in (col - 1, col, col + 1):
+                chunk, i, j = self._locate(cell_row, cell_col)
+                if chunk.state[i, j] == CellState.COVERED_FLAG:
+                    flags += 1
+                elif chunk.state[i, j] == CellState.COVERED:
+                    covered.append((cell_row, cell_col))
+                    if mined is None and chunk.mines[i, j]:
+                        mined = (cell_row, cell_col)
+        if flags != number or not covered:
+            return MoveResult.IGNORED, ((), ())
+        if mined is not None:  # wrong flag
+            self._result = MoveResult.DEFEAT
+            self._exploded_cell = mined
+            return self._result, ((), ())
+        return self._flood(covered)
+
+    def _flood(self, seeds):
+        """Uncover not mined covered seed cells and cells around regions without mines around, chunk by chunk.
+
+        Every chunk is processed by array operations: covered cells without mines around are labeled,
+        regions of the seeds are dilated, dilated cells out of the chunk become seeds of neighbour chunks.
+        If MAX_FLOOD_CELLS is reached, the rest of seeds is kept and the next flood continues it
+        after its own seeds.
+        """
+        size = self._chunk_size
+        parts = _border_parts(size)
+        pending = self._flood_seeds  # (chunk row, chunk col): mask of seed cells, the last one is processed first
+        self._flood_seeds = {}
+        for row, col in seeds:
+            (chunk_row, i), (chunk_col, j) = divmod(row, size), divmod(col, size)
+            mask = pending.pop((chunk_row, chunk_col), None)
+            if mask is None:
+                mask = np.zeros((size, size), dtype=bool)
+            mask[i, j] = True
+            pending[(chunk_row, chunk_col)] = mask
+
+        revealed_rows, revealed_cols = [], []
+        uncovered = 0
+        while pending and uncovered < MAX_FLOOD_CELLS:
+            (chunk_row, chunk_col), chunk_seeds = pending.popitem()
+            chunk = self._chunk(chunk_row, chunk_col)
+            covered = chunk.state == CellState.COVERED
+            revealed = chunk_seeds & covered
+            if not revealed.any():
+                continue
+            zero = covered & (chunk.neighbours == 0) & ~chunk.mines
+            if (revealed & zero).any():
+                labels = label_zero_regions(zero)
+                dilated = dilate(np.pad(np.isin(labels, labels[revealed & zero]), 1))  # with 1 cell border
+                revealed |= dilated[1:-1, 1:-1] & covered
+                for shift_row, dilated_rows, seed_rows in parts:
+                    for shift_col, dilated_cols, seed_cols in parts:
+                        border = dilated[dilated_rows, dilated_cols]
+                        if (shift_row or shift_col) and border.any():
+                            key = (chunk_row + shift_row, chunk_col + shift_col)
+                            if key not in pending:
+                                pending[key] = np.zeros((size, size), dtype=bool)
+                            pending[key][seed_rows, seed_cols] |= border
+
+            chunk.state[revealed] = CellState.UNCOVERED
+            rows, cols = np.nonzero(revealed)
+            revealed_rows.append(rows + chunk_row * size)
+            revealed_cols.append(cols + chunk_col * size)
+            uncovered += rows.size
+
+        self._flood_seeds = pending
+        self._uncovered_cells += uncovered
+        if not revealed_rows:
+            return self._result, ((), ())
+        return self._result, (np.concatenate(revealed_rows), np.concatenate(revealed_cols))
+
+    def toggle_flag(self, row, col):
+        """Toggle flag on covered cell, return True if cell state was changed."""
+        if self.finished:
+            return False
+        chunk, i, j = self._locate(row, col)
+        if chunk.state[i, j] == CellState.COVERED:
+            chunk.state[i, j] = CellState.COVERED_FLAG
+            self._flagged_cells += 1
+        elif chunk.state[i, j] == CellState.COVERED_FLAG:
+            chunk.state[i, j] = CellState.COVERED
+            self._flagged_cells -= 1
+        else:
+            return False
+        return True
+
+
+class _GridView:
+    """Read-only grid of view cells, indexed by (row, col) like numpy array."""
+
+    def __init__(self, view, getter):
+        """Initialize."""
+        self._view = view
+        self._getter = getter
+
+    def __getitem__(self, index):
+        """Get value of cell (row, col) of view."""
+        row, col = index
+        return self._getter(row + self._view.top, col + self._view.left)
+
+
+class EndlessView:
+    """Window of endless board with rows x cols cells and Board-like interface in window coordinates.
+
+    Window is moved over the board by recenter, so the field can be scrolled without limits.
+    """
+
+    def __init__(self, board, rows, cols):
+        """Initialize window with cell (0, 0) of the board in the center."""
+        self.board = board
+        self.rows, self.cols = rows, cols
+        self.top, self.left = -(rows // 2), -(cols // 2)
+        self.state = _GridView(self, board.cell_state)
+        self.neighbours = _GridView(self, board.cell_neighbours)
+
+    @property
+    def uncovered_cells(self):
+        """Get number of uncovered cells."""
+        return self.board.uncovered_cells
+
+    @property
+    def flagged_cells(self):
+        """Get number of flagged cells."""
+        return self.board.flagged_cells
+
+    @property
+    def result(self):
+        """Get result of the game."""
+        return self.board.result
+
+    @property
+    def finished(self):
+        """Check if game is finished."""
+        return self.board.finished
+
+    @property
+    def exploded_cell(self):
+        """Get exploded cell in window coordinates (None if game isn't lost)."""
+        if self.board.exploded_cell is None:
+            return None
+        row, col = self.board.exploded_cell
+        return row - self.top, col - self.left
+
+    @property
+    def mines(self):
+        """Get mines mask of window."""
+        return self.board.region(self.top, self.left, self.rows, self.cols)[2]
+
+    def set_origin(self, row, col):
+        """Move window to put board cell (0, 0) (center of the safe start area) at window cell (row, col)."""
+        self.top, self.left = -row, -col
+
+    def recenter(self, row, col):
+        """Move window to put its cell (row, col) in the center, return shift (rows, cols) of the window."""
+        shift_rows, shift_cols = row - self.rows // 2, col - self.cols // 2
+        self.top += shift_rows
+        self.left += shift_cols
+        return shift_rows, shift_cols
+
+    def uncover(self, row, col):
+        """Uncover cell of window, return move result and uncovered cells inside window."""
+        result, (rows, cols) = self.board.uncover(row + self.top, col + self.left)
+        return result, self._to_window(rows, cols)
+
+    def chord(self, row, col):
+        """Chord on cell of window, return move result and uncovered cells inside window."""
+        result, (rows, cols) = self.board.chord(row + self.top, col + self.left)
+        return result, self._to_window(rows, cols)
+
+    def toggle_flag(self, row, col):
+        """Toggle flag on cell of window."""
+        return self.board.toggle_flag(row + self.top, col + self.left)
+
+    def set_state(self, rows, cols, state):
+        """Set state for cells of window."""
+        self.board.set_state(np.asarray(rows) + self.top, np.asarray(cols) + self.left, state)
+
+    def _to_window(self, rows, cols):
+        """Convert board coordinates to window coordinates, cells out of window are dropped."""
+        rows, cols = np.asarray(rows, dtype=np.intp) - self.top, np.asarray(cols, dtype=np.intp) - self.left
+        inside = (rows >= 0) & (rows < self.rows) & (cols >= 0) & (cols < self.cols)
+        return rows[inside], cols[inside]
@@ -0,0 +1,454 @@
+"""Headless minesweeper board engine based on NumPy.
+
+Qt is used only by the game window: the engine and the modules built on it (solver, generator, save games,
+server, endless field, statistics) run in scripts and tests without display.
+"""
+
+import collections
+import enum
+
+import numpy as np
+
+
+class CellState(enum.IntEnum):
+    COVERED = 0             # cell is covered, default
+    COVERED_FLAG = 1        # cell is covered, flag
+    UNCOVERED = 2           # cell is uncovered, default
+    UNCOVERED_MINE = 3      # cell is uncovered, mine
+    UNCOVERED_MINE_OK = 4   # cell is uncovered, mine defused
+    UNCOVERED_MINE_BAD = 5  # cell is uncovered, mine exploded
+
+
+class MoveResult(enum.IntEnum):
+    IGNORED = 0   # move changed nothing
+    CONTINUE = 1  # move is done, game continues
+    DEFEAT = 2    # mined cell was uncovered
+    VICTORY = 3   # all not mined cells are uncovered
+
+
+NO_CELLS = (np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp))
+
+
+def count_neighbours(mask):
+    """Count set cells in 3x3 area around every cell, cell itself isn't counted (3x3 convolution)."""
+    rows, cols = mask.shape
+    padded = np.pad(mask.astype(np.uint8), 1)
+    counts = np.zeros((rows, cols), dtype=np.uint8)
+    for i in range(3):
+        for j in range(3):
+            if (i, j) != (1, 1):
+                counts += padded[i:i + rows, j:j + cols]
+    return counts
+
+
+def dilate(mask):
+    """Extend boolean mask by 3x3 area around every set cell."""
+    rows, cols = mask.shape
+    padded = np.pad(mask, 1)
+    dilated = np.zeros((rows, cols), dtype=bool)
+    for i in range(3):
+        for j in range(3):
+            dilated |= padded[i:i + rows, j:j + cols]
+    return dilated
+
+
+def label_zero_regions(zero):
+    """Label 8-connected regions of cells without mines around.
+
+    Every cell of a region gets flat index of one region cell as its label, other cells get -1.
+    Cells of horizontal runs are joined at once, then runs are joined by edges to the next row
+    with union-find (roots are hooked to smaller roots, then paths are compressed by pointer jumping).
+    """
+    rows, cols = zero.shape
+    index = np.arange(rows * cols, dtype=np.int32).reshape(rows, cols)
+
+    # Every cell points to the start of its horizontal run
+    run_starts = zero.copy()
+    run_starts[:, 1:] &= ~zero[:, :-1]
+    parent = np.where(run_starts, index, 0)
+    np.maximum.accumulate(parent, axis=1, out=parent)
+    parent = np.where(zero, parent, index).ravel()
+
+    # Edges between cells of neighbouring rows: down-left, down, down-right
+    edges_from, edges_to = [], []
+    for shift in (-1, 0, 1):
+        upper = (slice(0, rows - 1), slice(max(0, -shift), cols - max(0, shift)))
+        lower = (slice(1, rows), slice(max(0, shift), cols - max(0, -shift)))
+        connected = zero[upper] & zero[lower]
+        edges_from.append(index[upper][connected])
+        edges_to.append(index[lower][connected])
+    edges_from, edges_to = np.concatenate(edges_from), np.concatenate(edges_to)
+
+    while True:
+        roots_from, roots_to = parent[edges_from], parent[edges_to]
+        not_joined = roots_from != roots_to
+        if not not_joined.any():
+            break
+        edges_from, edges_to = edges_from[not_joined], edges_to[not_joined]
+        roots_from, roots_to = roots_from[not_joined], roots_to[not_joined]
+        np.minimum.at(parent, np.maximum(roots_from, roots_to), np.minimum(roots_from, roots_to))
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+
+    return np.where(zero.ravel(), parent, -1).reshape(rows, cols)
+
+
+class Board:
+    """Minesweeper board: cell states, mines and neighbour mines counts.
+
+    Cell states are stored in uint8 grid (values of CellState), mines are stored as bit-packed mask,
+    number of mines around every cell is calculated once per board.
+    """
+
+    def __init__(self, mines, seed=None, first_move_safe=False):
+        """Initialize board from boolean mines mask with shape (rows, cols).
+
+        If first_move_safe is set, mine is moved away from the first uncovered cell (see move_mine).
+        """
+        mines = np.asarray(mines, dtype=bool)
+        if mines.ndim != 2:
+            msg = "Mines mask must be 2-dimensional"
+            raise ValueError(msg)
+        self._rows, self._cols = mines.shape
+        self._num_mines = int(np.count_nonzero(mines))
+        self._mines_packed = np.packbits(mines, axis=None)
+        self._neighbours = count_neighbours(mines)
+        self._state = np.zeros(mines.shape, dtype=np.uint8)
+        self._zero_labels = None  # calculated on first uncover of a cell without mines around
+        self._uncovered_cells = 0
+        self._flagged_cells = 0
+        self._result = MoveResult.CONTINUE
+        self._exploded_cell = None
+        self.seed = seed  # seed used for mines generation (if known)
+        self.first_move_safe = first_move_safe
+
+    @classmethod
+    def random(cls, rows, cols, mines, seed=None, first_move_safe=False):
+        """Create board with randomly placed mines, generated by numpy.random.Generator with seed."""
+        if not (1 <= mines <= rows * cols - 1):
+            msg = f"Mines must be between 1 and {rows * cols - 1}"
+            raise ValueError(msg)
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        rng = np.random.default_rng(seed)
+        mines_mask = np.zeros(rows * cols, dtype=bool)
+        mines_mask[rng.choice(rows * cols, size=mines, replace=False)] = True
+        return cls(mines_mask.reshape(rows, cols), seed=seed, first_move_safe=first_move_safe)
+
+    @property
+    def rows(self):
+        """Get number of rows."""
+        return self._rows
+
+    @property
+    def cols(self):
+        """Get number of columns."""
+        return self._cols
+
+    @property
+    def num_mines(self):
+        """Get number of mines."""
+        return self._num_mines
+
+    @property
+    def uncovered_cells(self):
+        """Get number of uncovered not mined cells."""
+        return self._uncovered_cells
+
+    @property
+    def flagged_cells(self):
+        """Get number of flagged cells."""
+        return self._flagged_cells
+
+    @property
+    def result(self):
+        """Get result of the game (CONTINUE while game isn't finished)."""
+        return self._result
+
+    @property
+    def finished(self):
+        """Check if game is finished (victory or defeat)."""
+        return self._result in {MoveResult.DEFEAT, MoveResult.VICTORY}
+
+    @property
+    def exploded_cell(self):
+        """Get mined cell (row, col) uncovered by the last move (None if game isn't lost)."""
+        return self._exploded_cell
+
+    @property
+    def state(self):
+        """Get read-only grid of cell states."""
+        state = self._state.view()
+        state.flags.writeable = False
+        return state
+
+    @property
+    def neighbours(self):
+        """Get read-only grid of mines numbers in 3x3 area around cells."""
+        neighbours = self._neighbours.view()
+        neighbours.flags.writeable = False
+        return neighbours
+
+    @property
+    def zero_labels(self):
+        """Get labels of regions of cells without mines around (see label_zero_regions)."""
+        if self._zero_labels is None:
+            self._zero_labels = label_zero_regions((self._neighbours == 0) & ~self.mines)
+        return self._zero_labels
+
+    @property
+    def bbbv(self):
+        """Get 3BV: minimum number of clicks to uncover all not mined cells without chording.
+
+        Every region without mines around takes one click, every numbered cell not bordering such region too.
+        """
+        zero_labels = self.zero_labels
+        zero = zero_labels >= 0
+        isolated = ~self.mines & ~dilate(zero)
+        return len(np.unique(zero_labels[zero])) + int(np.count_nonzero(isolated))
+
+    @property
+    def mines(self):
+        """Get unpacked boolean mines mask."""
+        unpacked = np.unpackbits(self._mines_packed, count=self._rows * self._cols)
+        return unpacked.reshape(self._rows, self._cols).view(bool)
+
+    @property
+    def mines_packed(self):
+        """Get bit-packed mines mask (row-major order)."""
+        return self._mines_packed
+
+    def is_mined(self, row, col):
+        """Check if cell is mined."""
+        index = row * self._cols + col
+        return bool((self._mines_packed[index >> 3] >> (7 - (index & 7))) & 1)
+
+    def is_won(self):
+        """Check if all not mined cells are uncovered."""
+        return self._rows * self._cols - self._uncovered_cells == self._num_mines
+
+    def move_mine(self, row, col):
+        """Move mine from the cell to the first not mined cell (in row-major order)."""
+        mines = self.mines.ravel()
+        new_index = int(np.argmin(mines))
+        mines[row * self._cols + col] = False
+        mines[new_index] = True
+        self._mines_packed = np.packbits(mines)
+
+        # Update mines numbers in 3x3 areas (cell itself isn't counted in its number)
+        new_row, new_col = divmod(new_index, self._cols)
+        self._neighbours[row, col] += 1
+        self._neighbours[self._area(row, col)] -= 1
+        self._neighbours[self._area(new_row, new_col)] += 1
+        self._neighbours[new_row, new_col] -= 1
+        self._zero_labels = None
+
+    def restore_state(self, state):
+        """Restore cell states of unfinished game (saved game), counters are recalculated."""
+        state = np.asarray(state, dtype=np.uint8)
+        if state.shape != self._state.shape:
+            msg = f"State shape {state.shape} doesn't match board shape {self._state.shape}"
+            raise ValueError(msg)
+        if state.max(initial=0) > CellState.UNCOVERED:
+            msg = "State of unfinished game can contain only covered, flagged and uncovered cells"
+            raise ValueError(msg)
+        uncovered = state == CellState.UNCOVERED
+        if (uncovered & self.mines).any():
+            msg = "Mined cell can't be uncovered in unfinished game"
+            raise ValueError(msg)
+        self._state = state.copy()
+        self._uncovered_cells = int(np.count_nonzero(uncovered))
+        self._flagged_cells = int(np.count_nonzero(state == CellState.COVERED_FLAG))
+        self._result = MoveResult.CONTINUE
+        self._exploded_cell = None
+        self._check_victory()
+
+    def set_state(self, rows, cols, state):
+        """Set state for cells (used to show mines in the end of the game)."""
+        self._state[rows, cols] = state
+
+    def uncover(self, row, col):
+        """Uncover covered cell, return move result and coordinates (rows, cols) of uncovered cells."""
+        if self.finished or self._state[row, col] != CellState.COVERED:
+            return MoveResult.IGNORED, NO_CELLS
+        if self.is_mined(row, col):
+            if not (self.first_move_safe and not self._uncovered_cells):
+                self._result = MoveResult.DEFEAT
+                self._exploded_cell = (row, col)
+                return self._result, NO_CELLS
+            self.move_mine(row, col)
+        revealed = self._reveal([row], [col])
+        return self._check_victory(), revealed
+
+    def toggle_flag(self, row, col):
+        """Toggle flag on covered cell, return True if cell state was changed."""
+        if self.finished:
+            return False
+        cell_state = self._state[row, col]
+        if cell_state == CellState.COVERED:
+            self._state[row, col] = CellState.COVERED_FLAG
+            self._flagged_cells += 1
+        elif cell_state == CellState.COVERED_FLAG:
+            self._state[row, col] = CellState.COVERED
+            self._flagged_cells -= 1
+        else:
+            return False
+        return True
+
+    def chord(self, row, col):
+        """Uncover all not flagged cells around uncovered cell if its number equals to number of flags around."""
+        if self.finished or self._state[row, col] != CellState.UNCOVERED:
+            return MoveResult.IGNORED, NO_CELLS
+
+        area = self._area(row, col)
+        area_state = self._state[area]
+        if np.count_nonzero(area_state == CellState.COVERED_FLAG) != self._neighbours[row, col]:
+            return MoveResult.IGNORED, NO_CELLS
+        rows, cols = np.nonzero(area_state == CellState.COVERED)
+        return self.uncover_cells(rows + area[0].start, cols + area[1].start)
+
+    def uncover_cells(self, rows, cols):
+        """Uncover covered cells by one pass, return move result and coordinates (rows, cols) of uncovered cells.
+
+        Regions of all cells are revealed together. Repeated and not covered cells are skipped.
+        If any cell is mined, the game is lost, nothing is uncovered and the first mined cell is exploded_cell.
+        """
+        rows, cols = np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)
+        if self.finished or not rows.size:
+            return MoveResult.IGNORED, NO_CELLS
+        index = np.unique(rows * self._cols + cols)
+        index = index[self._state.ravel()[index] == CellState.COVERED]
+        if not index.size:
+            return MoveResult.IGNORED, NO_CELLS
+        mined = np.flatnonzero((self._mines_packed[index >> 3] >> (7 - (index & 7))) & 1)
+        if mined.size:
+            self._result = MoveResult.DEFEAT
+            self._exploded_cell = divmod(int(index[mined[0]]), self._cols)
+            return self._result, NO_CELLS
+        revealed = self._reveal(*np.divmod(index, self._cols))
+        return self._check_victory(), revealed
+
+    def flag_cells(self, rows, cols):
+        """Set flags on covered cells by one pass, return coordinates (rows, cols) of flagged cells."""
+        rows, cols = np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)
+        if self.finished or not rows.size:
+            return NO_CELLS
+        index = np.unique(rows * self._cols + cols)
+        index = index[self._state.ravel()[index] == CellState.COVERED]
+        self._state.ravel()[index] = CellState.COVERED_FLAG
+        self._flagged_cells += index.size
+        return np.divmod(index, self._cols)
+
+    def _area(self, row, col):
+        """Get slices of 3x3 area around cell (cut by board borders)."""
+        return (slice(max(0, row - 1), min(self._rows, row + 2)),
+                slice(max(0, col - 1), min(self._cols, col + 2)))
+
+    def _check_victory(self):
+        """Finish the game if it's won, return move result."""
+        if self.is_won():
+            self._result = MoveResult.VICTORY
+        return self._result
+
+    def _reveal(self, rows, cols):
+        """Uncover not mined seed cells and whole regions without mines around them (with region borders).
+
+        Regions are taken from precomputed labels, so uncover is done by a few array operations.
+        If some region cells are not covered (flags were set inside the region), region is
+        uncovered by work queue to stop at these cells.
+        """
+        rows, cols = np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)
+        state = self._state
+        zero_seeds = self._neighbours[rows, cols] == 0
+        if not zero_seeds.any():
+            covered = state[rows, cols] == CellState.COVERED
+            rows, cols = rows[covered], cols[covered]
+            state[rows, cols] = CellState.UNCOVERED
+            self._uncovered_cells += rows.size
+            return rows, cols
+
+        zero_labels = self.zero_labels
+        region = np.isin(zero_labels, zero_labels[rows[zero_seeds], cols[zero_seeds]])
+        region_rows, region_cols = np.nonzero(region)
+        if np.any(state[region_rows, region_cols] != CellState.COVERED):
+            return self._flood(list(zip(rows.tolist(), cols.tolist())))
+
+        # Work only inside bounding box of the regions (extended by 1 cell for region borders) and seeds
+        start_row = max(0, min(region_rows.min() - 1, rows.min()))
+        end_row = min(self._rows, max(region_rows.max() + 2, rows.max() + 1))
+        start_col = max(0, min(region_cols.min() - 1, cols.min()))
+        end_col = min(self._cols, max(region_cols.max() + 2, cols.max() + 1))
+        box = (slice(start_row, end_row), slice(start_col, end_col))
+        revealed = dilate(region[box])
+        revealed[rows[~zero_seeds] - start_row, cols[~zero_seeds] - start_col] = True
+        revealed &= state[box] == CellState.COVERED
+
+        state[box][revealed] = CellState.UNCOVERED
+        revealed_rows, revealed_cols = np.nonzero(revealed)
+        self._uncovered_cells += revealed_rows.size
+        return revealed_rows + start_row, revealed_cols + start_col
+
+    def _flood(self, seeds):
+        """Uncover seed cells and cells around them while there are no mines around (work queue)."""
+        state, neighbours = self._state, self._neighbours
+        revealed_rows, revealed_cols = [], []
+        queue = collections.deque(seeds)
+        while queue:
+            row, col = queue.popleft()
+            if state[row, col] != CellState.COVERED:  # only covered cell can become uncovered
+                continue
+            state[row, col] = CellState.UNCOVERED
+            revealed_rows.append(row)
+            revealed_cols.append(col)
+            if not neighbours[row, col]:
+                area_rows, area_cols = self._area(row, col)
+                for i in range(area_rows.start, area_rows.stop):
+                    for j in range(area_cols.start, area_cols.stop):
+                        if state[i, j] == CellState.COVERED:
+                            queue.append((i, j))
+
+        self._uncovered_cells += len(revealed_rows)
+        return np.array(revealed_rows, dtype=np.intp), np.array(revealed_cols, dtype=np.intp)
+
+
+def _group_bounds(keys, max_groups=None):
+    """Get split positions of sorted keys into groups of equal keys, merged into at most max_groups groups."""
+    if not keys.size:
+        return np.array([], dtype=np.intp)
+    group = np.cumsum(np.diff(keys, prepend=keys[0]) != 0)
+    if max_groups is not None:  # neighbouring groups are merged evenly
+        group = group * max(1, max_groups) // (group[-1] + 1)
+    return np.flatnonzero(np.diff(group)) + 1
+
+
+def explode_frames(board, row, col, max_frames=None):
+    """Get animation frames [(rows, cols, cell_state), ...] of mines exploding in increasing squares.
+
+    Mines are grouped by Chebyshev distance to exploded cell, every group is shown as mine first
+    and then as exploded mine. Neighbouring squares are merged to fit into max_frames frames.
+    """
+    mines_rows, mines_cols = np.nonzero(board.mines)
+    distance = np.maximum(np.abs(mines_rows - row), np.abs(mines_cols - col))
+    order = np.argsort(distance, kind="stable")
+    mines_rows, mines_cols, distance = mines_rows[order], mines_cols[order], distance[order]
+    bounds = _group_bounds(distance, None if max_frames is None else max_frames // 2)
+
+    frames = []
+    for rows, cols in zip(np.split(mines_rows, bounds), np.split(mines_cols, bounds)):
+        frames.append((rows, cols, CellState.UNCOVERED_MINE))
+        frames.append((rows, cols, CellState.UNCOVERED_MINE_BAD))
+    return frames
+
+
+def defuse_frames(board, max_frames=None):
+    """Get animation frames [(rows, cols, cell_state), ...] of mines being defused row by row from up to down.
+
+    Neighbouring rows are merged to fit into max_frames frames.
+    """
+    mines_rows, mines_cols = np.nonzero(board.mines)  # sorted by rows
+    bounds = _group_bounds(mines_rows, max_frames)
+    return [(rows, cols, CellState.UNCOVERED_MINE_OK)
+            for rows, cols in zip(np.split(mines_rows, bounds), np.split(mines_cols, bounds))]
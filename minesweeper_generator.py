@@ -0,0 +1,79 @@
+"""Background generation of minesweeper boards."""
+
+import collections
+import threading
+
+import numpy as np
+
+from minesweeper_engine import Board
+
+
+class BoardPool:
+    """Pool of ready boards for current field settings, filled by a worker thread.
+
+    Every board gets its own seed drawn from the pool generator (numpy.random.Generator),
+    so boards can be reproduced by seed. Regions without mines around are labelled in advance,
+    so the first uncover doesn't wait for it.
+    """
+
+    def __init__(self, size=3, seed=None, first_move_safe=True):
+        """Initialize pool keeping up to size boards."""
+        self._size = size
+        self._rng = np.random.default_rng(seed)
+        self._first_move_safe = first_move_safe
+        self._settings = None  # (rows, cols, mines)
+        self._boards = collections.deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._worker, name="BoardPool", daemon=True)
+        self._thread.start()
+
+    def set_settings(self, rows, cols, mines):
+        """Set field settings for the next boards (ready boards for other settings are dropped)."""
+        with self._condition:
+            if self._settings != (rows, cols, mines):
+                self._settings = (rows, cols, mines)
+                self._boards.clear()
+                self._condition.notify()
+
+    def take(self, rows, cols, mines):
+        """Take ready board for settings (board is generated in place if there are no ready boards)."""
+        with self._condition:
+            self.set_settings(rows, cols, mines)
+            board = self._boards.popleft() if self._boards else None
+            seed = None if board else self._next_seed()
+            self._condition.notify()
+        if board is None:
+            board = Board.random(rows, cols, mines, seed=seed, first_move_safe=self._first_move_safe)
+        return board
+
+    def close(self):
+        """Stop worker thread."""
+        with self._condition:
+            self._closed = True
+            self._boards.clear()
+            self._condition.notify()
+        self._thread.join()
+
+    def _next_seed(self):
+        """Get seed for the next board."""
+        return int(self._rng.integers(2 ** 63))
+
+    def _worker(self):
+        """Fill pool with boards for current settings (executed by worker thread)."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._closed or (self._settings and len(self._boards) < self._size)
+                )
+                if self._closed:
+                    return
+                settings = self._settings
+                seed = self._next_seed()
+
+            board = Board.random(*settings, seed=seed, first_move_safe=self._first_move_safe)
+            board.zero_labels  # label regions in advance
+
+            with self._condition:
+                if settings == self._settings and len(self._boards) < self._size:
+                    self._boards.append(board)
@@ -0,0 +1,192 @@
+"""Opt-in profiler of minesweeper hot paths.
+
+Durations of named sections are collected into log-scale histograms and into a bounded list of trace events,
+which can be exported as JSON or Chrome trace format (chrome://tracing, https://ui.perfetto.dev).
+"""
+
+import collections
+import contextlib
+import functools
+import json
+import math
+import os
+import threading
+import time
+
+HISTOGRAM_BUCKETS = 64  # bucket i > 0 holds values in [2 ** ((i - 1) / 2), 2 ** (i / 2)) microseconds, bucket 0 - below 1
+MAX_TRACE_EVENTS = 100000
+
+
+class Histogram:
+    """Histogram of values with log-scale buckets (about 41% width), percentiles are bucket upper bounds."""
+
+    def __init__(self):
+        """Initialize empty histogram."""
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @staticmethod
+    def _bucket(value):
+        """Get bucket index for value."""
+        if value < 1:
+            return 0
+        return min(HISTOGRAM_BUCKETS - 1, int(2 * math.log2(value)) + 1)
+
+    @staticmethod
+    def bucket_bound(index):
+        """Get upper bound of bucket values."""
+        return 2 ** (index / 2)
+
+    def add(self, value):
+        """Add value to histogram."""
+        self.buckets[self._bucket(value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, q):
+        """Get approximate percentile q (0..100) of values, 0 if histogram is empty."""
+        if not self.count:
+            return 0.0
+        rank = math.ceil(self.count * q / 100) or 1
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= rank:
+                return min(self.bucket_bound(index), self.max)
+        return self.max
+
+    def summary(self):
+        """Get JSON-serializable summary of histogram."""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "max": self.max,
+            "buckets": {f"<{self.bucket_bound(i):.0f}": n for i, n in enumerate(self.buckets) if n},
+        }
+
+
+class Profiler:
+    """Profiler collecting durations of sections (microseconds) and values per user action.
+
+    An action (click, key press) is started by begin_action, frames painted until the next action
+    are counted as repaints of this action.
+    """
+
+    def __init__(self, enabled=False):
+        """Initialize profiler."""
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._start_ns = time.perf_counter_ns()
+        self.durations = collections.defaultdict(Histogram)  # section name: histogram of durations
+        self.values = collections.defaultdict(Histogram)  # value name: histogram of values per action
+        self._events = collections.deque(maxlen=MAX_TRACE_EVENTS)  # (name, start ns, duration ns, thread id)
+        self._action_frames = None  # frames painted after the last action
+        self.last_frame_time = 0.0  # microseconds
+
+    def reset(self):
+        """Drop collected data."""
+        with self._lock:
+            self.durations.clear()
+            self.values.clear()
+            self._events.clear()
+            self._action_frames = None
+            self.last_frame_time = 0.0
+
+    @contextlib.contextmanager
+    def section(self, name):
+        """Measure duration of code block (nothing is measured if profiler is disabled)."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self._record(name, start, time.perf_counter_ns() - start)
+
+    @contextlib.contextmanager
+    def frame(self):
+        """Measure painting of frame, frame is counted as repaint of the current action."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter_ns() - start
+            self._record("paint frame", start, duration)
+            with self._lock:
+                self.last_frame_time = duration / 1000
+                if self._action_frames is not None:
+                    self._action_frames += 1
+
+    def _record(self, name, start, duration):
+        """Add section duration (nanoseconds) to histogram and trace events."""
+        with self._lock:
+            self.durations[name].add(duration / 1000)
+            self._events.append((name, start, duration, threading.get_ident()))
+
+    def add_value(self, name, value):
+        """Add value of the current action (for example number of revealed cells)."""
+        if self.enabled:
+            with self._lock:
+                self.values[name].add(value)
+
+    def begin_action(self):
+        """Start new user action, number of frames painted after the previous action is saved."""
+        if self.enabled:
+            with self._lock:
+                if self._action_frames is not None:
+                    self.values["repaints per action"].add(self._action_frames)
+                self._action_frames = 0
+
+    def summary(self):
+        """Get JSON-serializable summary of durations (microseconds) and values."""
+        with self._lock:
+            return {
+                "durations_us": {name: histogram.summary() for name, histogram in self.durations.items()},
+                "values": {name: histogram.summary() for name, histogram in self.values.items()},
+            }
+
+    def chrome_trace(self):
+        """Get collected events in Chrome trace event format."""
+        pid = os.getpid()
+        with self._lock:
+            events = [
+                {"name": name, "ph": "X", "ts": (start - self._start_ns) / 1000, "dur": duration / 1000,
+                 "pid": pid, "tid": tid}
+                for name, start, duration, tid in self._events
+            ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_json(self, path):
+        """Save summary of collected data to JSON file."""
+        with open(path, "w") as file:
+            json.dump(self.summary(), file, indent=2)
+
+    def export_chrome_trace(self, path):
+        """Save collected events to JSON file in Chrome trace event format."""
+        with open(path, "w") as file:
+            json.dump(self.chrome_trace(), file)
+
+
+PROFILER = Profiler(enabled=bool(os.environ.get("MINESWEEPER_PROFILE")))
+
+
+def profiled(name):
+    """Decorate function to measure its duration as section name of PROFILER."""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return function(*args, **kwargs)
+            with PROFILER.section(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
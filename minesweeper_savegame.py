@@ -0,0 +1,292 @@
+"""Compact binary save of the game and replayable move log.
+
+Saved game (little-endian):
+    header: magic b"MSWS", version u8, flags u8 (bit 0: first move safe), rows u32, cols u32,
+            elapsed time u32 (ms), seed size u8, seed (unsigned integer, empty if seed is unknown)
+    mines: bit-packed mines mask in row-major order, ceil(rows * cols / 8) bytes
+    states: 2 bits per cell (COVERED, COVERED_FLAG or UNCOVERED), ceil(rows * cols / 4) bytes
+Move log: magic b"MSWL", version u8 and records, which are appended while the game goes on:
+    board: kind u8 (BOARD), size u32, saved game (board at the start of the game or replaced board)
+    move: kind u8 (UNCOVER, FLAG, CHORD), row u32, col u32, time u32 (ms since start of the log)
+    batch uncover: kind u8 (UNCOVER_CELLS), count u32, time u32, count cells (row u32, col u32),
+                   cells are uncovered at once (a mine among them finishes the game before any cell is uncovered)
+
+Usage example (replay of the move log without GUI at double speed):
+    python minesweeper_savegame.py minesweeper_moves.log --speed 2
+"""
+
+import argparse
+import enum
+import os
+import struct
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from minesweeper_engine import Board, CellState, MoveResult
+
+SAVE_MAGIC = b"MSWS"
+LOG_MAGIC = b"MSWL"
+FORMAT_VERSION = 1
+
+SAVE_HEADER = struct.Struct("<4sBBIIIB")
+LOG_HEADER = struct.Struct("<4sB")
+BOARD_RECORD = struct.Struct("<BI")
+MOVE_RECORD = struct.Struct("<BIII")
+CELLS_RECORD = struct.Struct("<BII")
+CELL = struct.Struct("<II")
+
+FLAG_FIRST_MOVE_SAFE = 1
+
+
+class MoveKind(enum.IntEnum):
+    BOARD = 0
+    UNCOVER = 1
+    FLAG = 2
+    CHORD = 3
+    UNCOVER_CELLS = 4
+
+
+def pack_states(state):
+    """Pack cell states (values 0-3) into 2 bits per cell, 4 cells per byte in row-major order."""
+    flat = np.ravel(state).astype(np.uint8)
+    padded = np.zeros(-(-flat.size // 4) * 4, dtype=np.uint8)
+    padded[:flat.size] = flat
+    quads = padded.reshape(-1, 4)
+    return quads[:, 0] << 6 | quads[:, 1] << 4 | quads[:, 2] << 2 | quads[:, 3]
+
+
+def unpack_states(packed, rows, cols):
+    """Unpack cell states packed by pack_states."""
+    packed = np.frombuffer(packed, dtype=np.uint8)
+    quads = np.stack([packed >> 6, packed >> 4 & 3, packed >> 2 & 3, packed & 3], axis=1)
+    return quads.ravel()[:rows * cols].reshape(rows, cols)
+
+
+def dumps_game(board, elapsed_ms=0):
+    """Get saved game of unfinished board as bytes."""
+    if board.finished:
+        msg = "Finished game can't be saved"
+        raise ValueError(msg)
+    seed = board.seed if isinstance(board.seed, int) and board.seed >= 0 else None
+    seed_bytes = b"" if seed is None else seed.to_bytes((seed.bit_length() + 7) // 8 or 1, "little")
+    flags = FLAG_FIRST_MOVE_SAFE if board.first_move_safe else 0
+    header = SAVE_HEADER.pack(SAVE_MAGIC, FORMAT_VERSION, flags, board.rows, board.cols, elapsed_ms,
+                              len(seed_bytes))
+    return b"".join((header, seed_bytes, board.mines_packed.tobytes(), pack_states(board.state).tobytes()))
+
+
+def loads_game(data):
+    """Restore board and elapsed time (ms) from saved game bytes, raise ValueError if data is broken."""
+    if len(data) < SAVE_HEADER.size:
+        msg = "Saved game is truncated"
+        raise ValueError(msg)
+    magic, version, flags, rows, cols, elapsed_ms, seed_size = SAVE_HEADER.unpack_from(data)
+    if magic != SAVE_MAGIC or version != FORMAT_VERSION:
+        msg = "Unknown saved game format"
+        raise ValueError(msg)
+    cells = rows * cols
+    mines_offset = SAVE_HEADER.size + seed_size
+    states_offset = mines_offset + -(-cells // 8)
+    if not cells or len(data) != states_offset + -(-cells // 4):
+        msg = "Saved game size doesn't match field size"
+        raise ValueError(msg)
+
+    seed = int.from_bytes(data[SAVE_HEADER.size:mines_offset], "little") if seed_size else None
+    mines = np.unpackbits(np.frombuffer(data, dtype=np.uint8, count=states_offset - mines_offset,
+                                        offset=mines_offset), count=cells).reshape(rows, cols).view(bool)
+    board = Board(mines, seed=seed, first_move_safe=bool(flags & FLAG_FIRST_MOVE_SAFE))
+    board.restore_state(unpack_states(data[states_offset:], rows, cols))
+    return board, elapsed_ms
+
+
+def save_game(path, board, elapsed_ms=0):
+    """Save unfinished game to file (file is replaced atomically)."""
+    path = Path(path)
+    temp_path = path.with_name(path.name + ".tmp")
+    temp_path.write_bytes(dumps_game(board, elapsed_ms))
+    os.replace(temp_path, path)
+
+
+def load_game(path):
+    """Load board and elapsed time (ms) from file."""
+    return loads_game(Path(path).read_bytes())
+
+
+class MoveLog:
+    """Append-only log of moves, starts with the board, so the game can be replayed without GUI.
+
+    Logging is optional for the game: if the log file can't be written, logging is turned off
+    until the next game and the error is kept in the error attribute.
+    """
+
+    def __init__(self, path):
+        """Initialize log (file is created by start)."""
+        self._path = Path(path)
+        self._file = None
+        self._start_time = 0.0
+        self.error = None  # last error of log file
+
+    def start(self, board, elapsed_ms=0):
+        """Start log of a new game (previous log is overwritten), time of moves starts from elapsed_ms."""
+        self.close()
+        self._start_time = time.monotonic() - elapsed_ms / 1000
+        try:
+            self._file = open(self._path, "wb")
+        except OSError as e:
+            self.error = e
+            return
+        self._write(LOG_HEADER.pack(LOG_MAGIC, FORMAT_VERSION))
+        self.write_board(board)
+
+    def write_board(self, board):
+        """Append board (at the game start or when board is replaced)."""
+        if self._file is not None:
+            data = dumps_game(board, self._time_ms())
+            self._write(BOARD_RECORD.pack(MoveKind.BOARD, len(data)) + data)
+
+    def write_move(self, kind, row, col):
+        """Append move with current time."""
+        if self._file is not None:
+            self._write(MOVE_RECORD.pack(kind, row, col, self._time_ms()))
+
+    def write_moves(self, kind, rows, cols):
+        """Append moves of one kind made at once (single write)."""
+        if self._file is not None:
+            time_ms = self._time_ms()
+            self._write(b"".join(MOVE_RECORD.pack(kind, row, col, time_ms)
+                                 for row, col in zip(np.ravel(rows).tolist(), np.ravel(cols).tolist())))
+
+    def write_uncover_cells(self, rows, cols):
+        """Append batch uncover of cells (replayed by a single Board.uncover_cells)."""
+        if self._file is not None and np.size(rows):
+            cells = np.stack([np.ravel(rows), np.ravel(cols)], axis=1).astype("<u4")
+            self._write(CELLS_RECORD.pack(MoveKind.UNCOVER_CELLS, len(cells), self._time_ms()) + cells.tobytes())
+
+    def close(self):
+        """Close log file."""
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError as e:
+                self.error = e
+            self._file = None
+
+    def _write(self, data):
+        """Write data to log file, logging is turned off on error."""
+        try:
+            self._file.write(data)
+            self._file.flush()
+        except OSError as e:
+            self.error = e
+            self.close()
+
+    def _time_ms(self):
+        """Get time since start of the log in milliseconds."""
+        return int((time.monotonic() - self._start_time) * 1000)
+
+
+def read_log(path):
+    """Read records of move log, yield (MoveKind.BOARD, board, time ms) or (kind, row, col, time ms).
+
+    Batch uncover is yielded as (MoveKind.UNCOVER_CELLS, rows, cols, time ms) with arrays of rows and cols.
+    Truncated last record (log of crashed program) is ignored.
+    """
+    with open(path, "rb") as file:
+        header = file.read(LOG_HEADER.size)
+        if len(header) < LOG_HEADER.size or LOG_HEADER.unpack(header) != (LOG_MAGIC, FORMAT_VERSION):
+            msg = "Unknown move log format"
+            raise ValueError(msg)
+        while kind_data := file.read(1):
+            kind = MoveKind(kind_data[0])
+            if kind == MoveKind.BOARD:
+                size_data = file.read(BOARD_RECORD.size - 1)
+                if len(size_data) < BOARD_RECORD.size - 1:
+                    return
+                _kind, size = BOARD_RECORD.unpack(kind_data + size_data)
+                data = file.read(size)
+                if len(data) < size:
+                    return
+                board, time_ms = loads_game(data)
+                yield kind, board, time_ms
+            elif kind == MoveKind.UNCOVER_CELLS:
+                header_data = file.read(CELLS_RECORD.size - 1)
+                if len(header_data) < CELLS_RECORD.size - 1:
+                    return
+                _kind, count, time_ms = CELLS_RECORD.unpack(kind_data + header_data)
+                data = file.read(count * CELL.size)
+                if len(data) < count * CELL.size:
+                    return
+                cells = np.frombuffer(data, dtype="<u4").reshape(count, 2).astype(np.intp)
+                yield kind, cells[:, 0], cells[:, 1], time_ms
+            else:
+                move_data = file.read(MOVE_RECORD.size - 1)
+                if len(move_data) < MOVE_RECORD.size - 1:
+                    return
+                _kind, row, col, time_ms = MOVE_RECORD.unpack(kind_data + move_data)
+                yield kind, row, col, time_ms
+
+
+def replay(path, speed=0.0, on_move=None):
+    """Replay move log through the board logic, return the last board.
+
+    Moves are applied with their original timing divided by speed (as fast as possible if speed is 0).
+    on_move(kind, row, col, time_ms, result, revealed) is called after every move
+    (row and col are arrays for batch uncover).
+    """
+    board = None
+    replay_start = time.monotonic()
+    log_start = None
+    for record in read_log(path):
+        kind, *args, time_ms = record
+        if log_start is None:
+            log_start = time_ms
+        if speed:
+            delay = (time_ms - log_start) / 1000 / speed - (time.monotonic() - replay_start)
+            if delay > 0:
+                time.sleep(delay)
+
+        if kind == MoveKind.BOARD:
+            board = args[0]
+            continue
+        row, col = args
+        if kind == MoveKind.UNCOVER:
+            result, revealed = board.uncover(row, col)
+        elif kind == MoveKind.UNCOVER_CELLS:
+            result, revealed = board.uncover_cells(row, col)
+        elif kind == MoveKind.CHORD:
+            result, revealed = board.chord(row, col)
+        else:
+            changed = board.toggle_flag(row, col)
+            result, revealed = (board.result if changed else MoveResult.IGNORED), ((row,), (col,))
+        if on_move is not None:
+            on_move(kind, row, col, time_ms, result, revealed)
+    return board
+
+
+def main(args):
+    """Replay move log and print moves."""
+    parser = argparse.ArgumentParser(description="Replay minesweeper move log without GUI.")
+    parser.add_argument("log", type=Path, help="move log file")
+    parser.add_argument("--speed", type=float, default=0.0,
+                        help="replay speed relative to the original game, 0 - as fast as possible (default)")
+    parsed = parser.parse_args(args)
+
+    def print_move(kind, row, col, time_ms, result, revealed):
+        cell = f"{len(row)} cells" if kind == MoveKind.UNCOVER_CELLS else f"{row}, {col}"
+        print(f"{time_ms / 1000:9.3f} s  {kind.name.lower():<14}({cell})  "
+              f"{MoveResult(result).name.lower()}, {len(revealed[0])} cells")
+
+    board = replay(parsed.log, parsed.speed, print_move)
+    if board is None:
+        print("Move log is empty")
+        return 1
+    covered = np.count_nonzero(board.state <= CellState.COVERED_FLAG)
+    print(f"Result: {board.result.name.lower()}, uncovered cells: {board.uncovered_cells}, covered cells: {covered}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,246 @@
+"""Local JSON-lines server hosting many minesweeper games for bots.
+
+Every request is one JSON object per line, every request gets one response line with the same "id":
+    {"id": 1, "op": "new", "rows": 16, "cols": 30, "mines": 99, "seed": 42}
+        -> {"id": 1, "ok": true, "game": 1, "rows": 16, "cols": 30, "mines": 99, "seed": 42}
+    {"id": 2, "op": "uncover", "game": 1, "row": 3, "col": 4}  (also "flag" and "chord")
+        -> {"id": 2, "ok": true, "result": "continue", "uncovered": [[row, col, number], ...]}
+    {"id": 3, "op": "batch", "game": 1, "moves": [["uncover", 0, 0], ["flag", 1, 1]]}
+        -> {"id": 3, "ok": true, "results": [<move response>, ...]}  (moves after game end are skipped)
+        all moves are checked before the first one is made, so a batch with an invalid move changes nothing
+    {"id": 4, "op": "state", "game": 1}
+        -> {"id": 4, "ok": true, ..., "cells": ["..F12", ...]}  (row strings: . covered, F flag, digits)
+    {"id": 5, "op": "watch", "game": 1}  (spectator, every move is sent as {"event": "move", "game": 1, ...})
+    {"id": 6, "op": "close", "game": 1}
+    {"id": 7, "op": "list"}
+Move responses contain only changed cells: "uncovered", "flagged", "unflagged" and "mines" (all mines
+when the game is finished). Errors are reported as {"id": ..., "ok": false, "error": "..."}.
+
+Usage example:
+    python minesweeper_server.py --port 8765
+    python minesweeper_server.py --unix /tmp/minesweeper.sock
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+
+import numpy as np
+
+from minesweeper_engine import Board, CellState, MoveResult
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_LINE_SIZE = 16 * 1024 * 1024  # batches of moves can be long
+MAX_ROWS = 1000  # the same field size limits as in the game window
+MAX_COLS = 1000
+MOVE_KINDS = {"uncover", "flag", "chord"}
+CELL_CHARS = np.array(list(".F") + [str(number) for number in range(9)])
+
+
+class GameError(Exception):
+    """Error of request, reported to client."""
+
+
+class ServerGame:
+    """Game hosted by server with its spectators."""
+
+    def __init__(self, board):
+        """Initialize."""
+        self.board = board
+        self.watchers = set()  # stream writers of spectators
+
+    def check_move(self, kind, row, col):
+        """Raise GameError if move can't be made on the field."""
+        if kind not in MOVE_KINDS:
+            msg = f"Unknown move {kind!r}"
+            raise GameError(msg)
+        if not (0 <= row < self.board.rows and 0 <= col < self.board.cols):
+            msg = f"Cell ({row}, {col}) is out of field"
+            raise GameError(msg)
+
+    def move(self, kind, row, col):
+        """Make move, return response with changed cells."""
+        self.check_move(kind, row, col)
+        board = self.board
+        response = {}
+        if kind == "uncover":
+            result, revealed = board.uncover(row, col)
+        elif kind == "chord":
+            result, revealed = board.chord(row, col)
+        else:
+            result, revealed = MoveResult.IGNORED, ((), ())
+            if board.toggle_flag(row, col):
+                result = board.result
+                flagged = board.state[row, col] == CellState.COVERED_FLAG
+                response["flagged" if flagged else "unflagged"] = [[row, col]]
+
+        response["result"] = MoveResult(result).name.lower()
+        rows, cols = np.asarray(revealed[0], dtype=np.intp), np.asarray(revealed[1], dtype=np.intp)
+        if rows.size:
+            response["uncovered"] = np.stack([rows, cols, board.neighbours[rows, cols]], axis=1).tolist()
+        if board.finished:
+            response["mines"] = np.argwhere(board.mines).tolist()
+        return response
+
+    def state(self):
+        """Get visible state of the game (mines are shown only when the game is finished)."""
+        board = self.board
+        codes = np.where(board.state == CellState.UNCOVERED, board.neighbours.astype(np.intp) + 2,
+                         np.minimum(board.state, CellState.COVERED_FLAG))
+        state = {
+            "rows": board.rows,
+            "cols": board.cols,
+            "mines": board.num_mines,
+            "result": board.result.name.lower(),
+            "cells": ["".join(row) for row in CELL_CHARS[codes]],
+        }
+        if board.finished:
+            state["mined"] = np.argwhere(board.mines).tolist()
+        return state
+
+
+class GameServer:
+    """Server of independent games, every client can play and watch any game."""
+
+    def __init__(self):
+        """Initialize."""
+        self.games = {}
+        self._next_game_id = 1
+
+    async def handle_client(self, reader, writer):
+        """Process requests of one client until it disconnects."""
+        try:
+            while line := await reader.readline():
+                response = self.handle_line(line, writer)
+                writer.write(json.dumps(response, separators=(",", ":")).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            for game in self.games.values():
+                game.watchers.discard(writer)
+            writer.close()
+
+    def handle_line(self, line, writer):
+        """Process one request line, return response."""
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                msg = "Request must be JSON object"
+                raise GameError(msg)
+            request_id = request.get("id")
+            response = self.handle_request(request, writer)
+        except json.JSONDecodeError as e:
+            return {"id": None, "ok": False, "error": f"Invalid JSON: {e}"}
+        except (GameError, ValueError, TypeError, KeyError) as e:
+            return {"id": request_id, "ok": False, "error": str(e)}
+        return {"id": request_id, "ok": True, **response}
+
+    def handle_request(self, request, writer):
+        """Process request, return response fields."""
+        op = request.get("op")
+        if op == "new":
+            return self.new_game(int(request["rows"]), int(request["cols"]), int(request["mines"]),
+                                 request.get("seed"), bool(request.get("first_move_safe", True)))
+        if op == "list":
+            return {"games": sorted(self.games)}
+
+        game_id = request.get("game")
+        game = self.games.get(game_id)
+        if game is None:
+            msg = f"Unknown game {game_id!r}"
+            raise GameError(msg)
+        if op in MOVE_KINDS:
+            response = game.move(op, int(request["row"]), int(request["col"]))
+            self.notify(game_id, game, op, request["row"], request["col"], response)
+            return response
+        if op == "batch":
+            moves = [(kind, int(row), int(col)) for kind, row, col in request["moves"]]
+            for index, move in enumerate(moves):
+                try:
+                    game.check_move(*move)
+                except GameError as e:
+                    msg = f"Move {index}: {e}"
+                    raise GameError(msg) from e
+            results = []
+            for kind, row, col in moves:
+                if game.board.finished:
+                    break
+                results.append(game.move(kind, row, col))
+                self.notify(game_id, game, kind, row, col, results[-1])
+            return {"results": results}
+        if op == "state":
+            return game.state()
+        if op == "watch":
+            game.watchers.add(writer)
+            return game.state()
+        if op == "close":
+            for watcher in game.watchers:
+                self._send(watcher, {"event": "closed", "game": game_id})
+            del self.games[game_id]
+            return {}
+        msg = f"Unknown operation {op!r}"
+        raise GameError(msg)
+
+    def new_game(self, rows, cols, mines, seed=None, first_move_safe=True):
+        """Start new game, return response with game id."""
+        if not (1 <= rows <= MAX_ROWS and 1 <= cols <= MAX_COLS):
+            msg = f"Field size must be from 1x1 to {MAX_ROWS}x{MAX_COLS}"
+            raise GameError(msg)
+        if seed is not None and (not isinstance(seed, int) or seed < 0):
+            msg = "Seed must be non-negative integer"
+            raise GameError(msg)
+        board = Board.random(rows, cols, mines, seed=seed, first_move_safe=first_move_safe)
+        game_id = self._next_game_id
+        self._next_game_id += 1
+        self.games[game_id] = ServerGame(board)
+        return {"game": game_id, "rows": rows, "cols": cols, "mines": mines, "seed": board.seed}
+
+    def notify(self, game_id, game, kind, row, col, response):
+        """Send move to spectators of the game."""
+        if game.watchers:
+            event = {"event": "move", "game": game_id, "move": kind, "row": row, "col": col, **response}
+            for watcher in list(game.watchers):
+                self._send(watcher, event)
+
+    def _send(self, writer, message):
+        """Send message without waiting (spectator with broken connection is dropped)."""
+        if writer.is_closing():
+            for game in self.games.values():
+                game.watchers.discard(writer)
+            return
+        writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None):
+    """Run server forever on TCP host:port or Unix socket."""
+    game_server = GameServer()
+    if unix_path:
+        server = await asyncio.start_unix_server(game_server.handle_client, unix_path, limit=MAX_LINE_SIZE)
+    else:
+        server = await asyncio.start_server(game_server.handle_client, host, port, limit=MAX_LINE_SIZE)
+    addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"Serving minesweeper games on {addresses}", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def main(args):
+    """Start server."""
+    parser = argparse.ArgumentParser(description="Serve minesweeper games over JSON-lines protocol.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="TCP host (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="TCP port (default: %(default)s)")
+    parser.add_argument("--unix", metavar="PATH", help="listen on Unix socket instead of TCP")
+    parsed = parser.parse_args(args)
+    try:
+        asyncio.run(serve(parsed.host, parsed.port, parsed.unix))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
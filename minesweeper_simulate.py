@@ -0,0 +1,106 @@
+"""Batch simulation of minesweeper games played by the solver.
+
+Usage example:
+    python minesweeper_simulate.py --rows 16 --cols 16 --mines 40 --games 100000 --seed 1 > results.jsonl
+
+Results of every game are streamed to stdout as JSON lines, aggregate statistics are printed to stderr.
+"""
+
+import argparse
+import concurrent.futures
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from minesweeper_engine import Board, CellState, MoveResult
+from minesweeper_solver import find_moves, mine_probabilities
+
+GAMES_PER_JOB = 64
+
+
+def play_game(rows, cols, mines, seed):
+    """Play one game by the solver: logic moves while possible, otherwise the least probably mined cell.
+
+    First move is the center cell (first move is safe). Return dict with game results.
+    """
+    start_time = time.perf_counter()
+    board = Board.random(rows, cols, mines, seed=seed, first_move_safe=True)
+    known_mines = np.zeros((rows, cols), dtype=bool)
+    board.uncover(rows // 2, cols // 2)
+    moves, guesses = 1, 0
+    while not board.finished:
+        safe, mines_found = find_moves(board.state, board.neighbours, known_mines, mines)
+        new_mines = mines_found & ~known_mines
+        known_mines |= mines_found
+        if not safe.any() and not new_mines.any():
+            probabilities = mine_probabilities(board.state, board.neighbours, known_mines, mines)
+            safe = np.zeros_like(safe)
+            safe.flat[np.nanargmin(probabilities)] = True
+            guesses += 1
+        for i, j in zip(*np.nonzero(safe & (board.state == CellState.COVERED))):
+            if board.state[i, j] == CellState.COVERED:  # could be uncovered by the previous move
+                board.uncover(int(i), int(j))
+                moves += 1
+            if board.finished:
+                break
+
+    return {
+        "seed": seed,
+        "win": board.result == MoveResult.VICTORY,
+        "moves": moves,
+        "guesses": guesses,
+        "time": time.perf_counter() - start_time,
+    }
+
+
+def play_games(rows, cols, mines, seed, job, games):
+    """Play games of one job, seeds of games depend only on seed and job number."""
+    seeds = np.random.SeedSequence([seed, job]).generate_state(games, dtype=np.uint64).tolist()
+    return [play_game(rows, cols, mines, game_seed) for game_seed in seeds]
+
+
+def parse_args(args):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Play minesweeper games by the solver without GUI.")
+    parser.add_argument("--rows", type=int, default=10, help="number of rows (default: %(default)s)")
+    parser.add_argument("--cols", type=int, default=10, help="number of columns (default: %(default)s)")
+    parser.add_argument("--mines", type=int, default=12, help="number of mines (default: %(default)s)")
+    parser.add_argument("--games", type=int, default=1000, help="number of games (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for all games (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="number of worker processes (default: %(default)s)")
+    parsed = parser.parse_args(args)
+    if not (1 <= parsed.mines <= parsed.rows * parsed.cols - 1):
+        parser.error(f"mines must be between 1 and {parsed.rows * parsed.cols - 1}")
+    return parsed
+
+
+def main(args):
+    """Run simulation, stream game results as JSON lines and print aggregate statistics."""
+    args = parse_args(args)
+    start_time = time.perf_counter()
+    games = wins = 0
+    with concurrent.futures.ProcessPoolExecutor(args.workers) as executor:
+        futures = {}
+        for job, first_game in enumerate(range(0, args.games, GAMES_PER_JOB)):
+            job_games = min(GAMES_PER_JOB, args.games - first_game)
+            future = executor.submit(play_games, args.rows, args.cols, args.mines, args.seed, job, job_games)
+            futures[future] = first_game
+
+        for future in concurrent.futures.as_completed(futures):
+            for number, game in enumerate(future.result(), start=futures[future]):
+                sys.stdout.write(json.dumps({"game": number, **game}) + "\n")
+                games += 1
+                wins += game["win"]
+
+    elapsed = time.perf_counter() - start_time
+    print(f"Games: {games}, wins: {wins}, win rate: {wins / max(games, 1):.2%}, "
+          f"time: {elapsed:.2f} s, throughput: {games / elapsed:.1f} games/s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,441 @@
+"""Deterministic minesweeper solver and no-guess board generation."""
+
+import concurrent.futures
+import math
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+from minesweeper_engine import Board, CellState, MoveResult, count_neighbours, dilate
+
+MAX_COMPONENT_CELLS = 48      # bigger frontier components are not enumerated
+MAX_ENUMERATION_NODES = 200000  # search tree limit for enumeration of a single component
+NO_GUESS_ATTEMPTS = 20        # candidate boards checked by one no-guess job
+NO_GUESS_TIMEOUT = 10.0       # seconds to find no-guess board before falling back to random one
+NO_GUESS_POLL_PERIOD = 0.1    # seconds between checks that no-guess generation is cancelled
+CANCEL_CHECK_PERIOD = 4096    # constraints processed between checks of cancellation
+
+
+class EnumerationLimitError(Exception):
+    """Raised when enumeration of component solutions exceeds nodes limit."""
+
+
+class CalculationCancelledError(Exception):
+    """Raised when calculation is cancelled (newer calculation is requested)."""
+
+
+def _check_cancelled(is_cancelled):
+    """Raise CalculationCancelledError if is_cancelled() returns True."""
+    if is_cancelled is not None and is_cancelled():
+        raise CalculationCancelledError
+
+
+def frontier_constraints(state, neighbours, known_mines, is_cancelled=None):
+    """Get constraints of uncovered numbers: [(unknown neighbour cells (flat indices), mines among them), ...].
+
+    Unknown cells around all numbers are gathered by array operations, is_cancelled() is checked periodically.
+    """
+    cols = state.shape[1]
+    unknown = (state <= CellState.COVERED_FLAG) & ~known_mines
+    remaining = neighbours.astype(np.int16) - count_neighbours(known_mines)
+    active = (state == CellState.UNCOVERED) & (count_neighbours(unknown) > 0)
+    active_rows, active_cols = np.nonzero(active)
+
+    padded = np.pad(unknown, 1)
+    cells = np.full((active_rows.size, 9), -1, dtype=np.int64)  # flat indices of unknown cells around, or -1
+    for k, (i, j) in enumerate((i, j) for i in (-1, 0, 1) for j in (-1, 0, 1)):
+        cells[:, k] = np.where(padded[active_rows + 1 + i, active_cols + 1 + j],
+                               (active_rows + i) * cols + active_cols + j, -1)
+    mines = remaining[active_rows, active_cols].tolist()
+
+    constraints = []
+    for start in range(0, active_rows.size, CANCEL_CHECK_PERIOD):
+        _check_cancelled(is_cancelled)
+        end = start + CANCEL_CHECK_PERIOD
+        constraints.extend((frozenset(cell for cell in row if cell >= 0), constraint_mines)
+                           for row, constraint_mines in zip(cells[start:end].tolist(), mines[start:end]))
+    return constraints
+
+
+def split_components(constraints, is_cancelled=None):
+    """Split constraints into independent groups which don't share cells: [[constraint, ...], ...].
+
+    is_cancelled() is checked periodically.
+    """
+    cell_constraints = {}
+    for number, (cells, _mines) in enumerate(constraints):
+        if not number % CANCEL_CHECK_PERIOD:
+            _check_cancelled(is_cancelled)
+        for cell in cells:
+            cell_constraints.setdefault(cell, []).append(number)
+
+    components = []
+    visited = [False] * len(constraints)
+    for start in range(len(constraints)):
+        if not start % CANCEL_CHECK_PERIOD:
+            _check_cancelled(is_cancelled)
+        if visited[start]:
+            continue
+        visited[start] = True
+        stack, component = [start], []
+        while stack:
+            number = stack.pop()
+            component.append(constraints[number])
+            for cell in constraints[number][0]:
+                for other in cell_constraints[cell]:
+                    if not visited[other]:
+                        visited[other] = True
+                        stack.append(other)
+        components.append(component)
+    return components
+
+
+def enumerate_component(constraints, max_nodes=MAX_ENUMERATION_NODES):
+    """Enumerate all mines placements satisfying constraints of one component.
+
+    Return cells (flat indices, ordered) and dict {mines number: (solutions number, mines count for every cell)}.
+    Raise EnumerationLimitError if search tree exceeds max_nodes.
+    """
+    # Order cells by constraints so that constraints are closed as early as possible
+    cells, positions = [], {}
+    for constraint_cells, _mines in constraints:
+        for cell in sorted(constraint_cells):
+            if cell not in positions:
+                positions[cell] = len(cells)
+                cells.append(cell)
+    cell_count = len(cells)
+
+    required = [mines for _cells, mines in constraints]
+    placed = [0] * len(constraints)
+    left = [len(constraint_cells) for constraint_cells, _mines in constraints]
+    cell_constraints = [[] for _ in range(cell_count)]
+    for number, (constraint_cells, _mines) in enumerate(constraints):
+        for cell in constraint_cells:
+            cell_constraints[positions[cell]].append(number)
+
+    assignment = [0] * cell_count
+    solutions = {}
+    nodes = 0
+
+    def search(position, mines):
+        nonlocal nodes
+        nodes += 1
+        if nodes > max_nodes:
+            raise EnumerationLimitError
+        if position == cell_count:
+            count, cell_mines = solutions.get(mines, (0, None))
+            if cell_mines is None:
+                cell_mines = [0] * cell_count
+            for i in range(cell_count):
+                cell_mines[i] += assignment[i]
+            solutions[mines] = (count + 1, cell_mines)
+            return
+
+        numbers = cell_constraints[position]
+        for value in (0, 1):
+            if all(0 <= required[n] - placed[n] - value <= left[n] - 1 for n in numbers):
+                assignment[position] = value
+                for n in numbers:
+                    placed[n] += value
+                    left[n] -= 1
+                search(position + 1, mines + value)
+                for n in numbers:
+                    placed[n] -= value
+                    left[n] += 1
+        assignment[position] = 0
+
+    search(0, 0)
+    return cells, {mines: (count, np.array(cell_mines)) for mines, (count, cell_mines) in solutions.items()}
+
+
+def _single_cell_moves(state, neighbours, known_mines):
+    """Find safe cells and mines by numbers that are already satisfied or need all unknown cells."""
+    unknown = (state <= CellState.COVERED_FLAG) & ~known_mines
+    unknown_around = count_neighbours(unknown)
+    remaining = neighbours.astype(np.int16) - count_neighbours(known_mines)
+    active = (state == CellState.UNCOVERED) & (unknown_around > 0)
+    safe = dilate(active & (remaining == 0)) & unknown
+    mines = dilate(active & (remaining == unknown_around)) & unknown
+    return safe, mines
+
+
+def _subset_moves(constraints, size):
+    """Find safe cells and mines by pairs of constraints where one constraint cells are subset of other."""
+    safe, mines = np.zeros(size, dtype=bool), np.zeros(size, dtype=bool)
+    cell_constraints = {}
+    for constraint in constraints:
+        for cell in constraint[0]:
+            cell_constraints.setdefault(cell, []).append(constraint)
+
+    for cells, constraint_mines in constraints:
+        others = {other for cell in cells for other in cell_constraints[cell]}
+        for other_cells, other_mines in others:
+            if cells < other_cells:
+                rest = list(other_cells - cells)
+                if other_mines == constraint_mines:
+                    safe[rest] = True
+                elif other_mines - constraint_mines == len(rest):
+                    mines[rest] = True
+    return safe, mines
+
+
+def _enumeration_moves(constraints, unknown, remaining_mines):
+    """Find safe cells and mines by enumeration of frontier components and total number of mines."""
+    size = unknown.size
+    safe, mines = np.zeros(size, dtype=bool), np.zeros(size, dtype=bool)
+    frontier = np.zeros(size, dtype=bool)
+
+    enumerated = []  # (cells, solutions)
+    min_total, max_total = 0, 0
+    for component in split_components(constraints):
+        component_cells = list(set().union(*(cells for cells, _mines in component)))
+        frontier[component_cells] = True
+        solutions = None
+        if len(component_cells) <= MAX_COMPONENT_CELLS:
+            try:
+                cells, solutions = enumerate_component(component)
+            except EnumerationLimitError:
+                pass
+        if solutions:
+            enumerated.append((cells, solutions))
+            min_total += min(solutions)
+            max_total += max(solutions)
+        else:  # not enumerated, any number of mines
+            max_total += len(component_cells)
+
+    interior = unknown & ~frontier
+    interior_count = int(np.count_nonzero(interior))
+
+    for cells, solutions in enumerated:
+        # Mines numbers of the component allowed by total number of mines
+        others_min, others_max = min_total - min(solutions), max_total - max(solutions)
+        min_allowed, max_allowed = remaining_mines - interior_count - others_max, remaining_mines - others_min
+        allowed = [k for k in solutions if min_allowed <= k <= max_allowed]
+        if not allowed:
+            continue
+        count = sum(solutions[k][0] for k in allowed)
+        cell_mines = sum(solutions[k][1] for k in allowed)
+        cells = np.array(cells)
+        safe[cells[cell_mines == 0]] = True
+        mines[cells[cell_mines == count]] = True
+
+    if interior_count and remaining_mines == min_total:
+        safe |= interior
+    elif interior_count and remaining_mines - max_total == interior_count:
+        mines |= interior
+    return safe, mines
+
+
+def find_moves(state, neighbours, known_mines, num_mines):
+    """Find cells which are surely safe and surely mined by visible numbers.
+
+    Rules are tried from the cheapest: single numbers, pairs of numbers with subset cells,
+    enumeration of frontier components with total number of mines.
+    Return boolean grids (safe, mines), both are empty if there are no moves without guessing.
+    """
+    unknown = (state <= CellState.COVERED_FLAG) & ~known_mines
+    remaining_mines = num_mines - int(np.count_nonzero(known_mines))
+    if remaining_mines == 0:
+        return unknown, np.zeros_like(unknown)
+    if remaining_mines == np.count_nonzero(unknown):
+        return np.zeros_like(unknown), unknown
+
+    safe, mines = _single_cell_moves(state, neighbours, known_mines)
+    if safe.any() or mines.any():
+        return safe, mines
+
+    constraints = frontier_constraints(state, neighbours, known_mines)
+    safe, mines = _subset_moves(constraints, unknown.size)
+    if not (safe.any() or mines.any()):
+        safe, mines = _enumeration_moves(constraints, unknown.ravel(), remaining_mines)
+    return safe.reshape(state.shape) & unknown, mines.reshape(state.shape) & unknown
+
+
+def _log_comb(n, k):
+    """Get logarithm of binomial coefficient C(n, k) (-inf if k is out of range)."""
+    if not (0 <= k <= n):
+        return -math.inf
+    return math.lgamma(n + 1) - math.lgamma(k + 1) - math.lgamma(n - k + 1)
+
+
+def _convolve_normalized(first, second):
+    """Convolve weights (weights, log scale), result is normalized to maximum 1 to avoid overflow."""
+    weights = np.convolve(first[0], second[0])
+    peak = weights.max()
+    if peak <= 0:
+        return weights, first[1] + second[1]
+    return weights / peak, first[1] + second[1] + math.log(peak)
+
+
+def mine_probabilities(state, neighbours, known_mines, num_mines, is_cancelled=None):
+    """Calculate probability of mine for every unknown covered cell (NaN for other cells).
+
+    Frontier (unknown cells around uncovered numbers) is split into independent components,
+    every component is enumerated and weighted by number of placements of the remaining mines
+    into unconstrained interior cells: C(interior cells, remaining mines - component mines).
+    Components that are too long to enumerate are approximated by mines density of their numbers.
+    is_cancelled() is checked periodically, CalculationCancelledError is raised if it returns True.
+    """
+    unknown = ((state <= CellState.COVERED_FLAG) & ~known_mines).ravel()
+    probabilities = np.full(unknown.size, np.nan)
+    remaining_mines = num_mines - int(np.count_nonzero(known_mines))
+    frontier = np.zeros(unknown.size, dtype=bool)
+
+    enumerated = []  # (cells, weights by mines number, cell weights by mines number)
+    approximated_mines = 0.0
+    constraints = frontier_constraints(state, neighbours, known_mines, is_cancelled)
+    for component in split_components(constraints, is_cancelled):
+        _check_cancelled(is_cancelled)
+        component_cells = sorted(set().union(*(cells for cells, _mines in component)))
+        frontier[component_cells] = True
+        solutions = None
+        if len(component_cells) <= MAX_COMPONENT_CELLS:
+            try:
+                cells, solutions = enumerate_component(component)
+            except EnumerationLimitError:
+                pass
+
+        if solutions:
+            weights = np.zeros(max(solutions) + 1)
+            cell_weights = np.zeros((weights.size, len(cells)))
+            for mines, (count, cell_mines) in solutions.items():
+                weights[mines], cell_weights[mines] = count, cell_mines
+            peak = weights.max()
+            enumerated.append((np.array(cells), weights / peak, cell_weights / peak))
+        else:
+            densities = {}
+            for cells, mines in component:
+                for cell in cells:
+                    densities.setdefault(cell, []).append(mines / len(cells))
+            for cell, cell_densities in densities.items():
+                probabilities[cell] = min(1.0, max(0.0, sum(cell_densities) / len(cell_densities)))
+            approximated_mines += float(np.sum(probabilities[component_cells]))
+
+    interior = unknown & ~frontier
+    interior_count = int(np.count_nonzero(interior))
+    interior_mines = remaining_mines - round(approximated_mines)
+
+    # Weights of total number of mines in enumerated components, with prefix and suffix products
+    prefix = [(np.ones(1), 0.0)]
+    for _cells, weights, _cell_weights in enumerated:
+        prefix.append(_convolve_normalized(prefix[-1], (weights, 0.0)))
+    suffix = [(np.ones(1), 0.0)]
+    for _cells, weights, _cell_weights in reversed(enumerated):
+        suffix.append(_convolve_normalized(suffix[-1], (weights, 0.0)))
+    suffix.reverse()
+    total, total_log = prefix[-1]
+
+    log_interior = np.array([_log_comb(interior_count, interior_mines - mines) for mines in range(total.size)])
+    if np.isfinite(log_interior).any():
+        interior_weights = np.exp(log_interior - log_interior.max())
+        norm = float(total @ interior_weights)
+    else:
+        interior_weights, norm = np.zeros(total.size), 0.0
+
+    if norm <= 0:  # numbers contradict each other or flags, show local probabilities
+        for cells, weights, cell_weights in enumerated:
+            probabilities[cells] = cell_weights.sum(axis=0) / weights.sum()
+        if interior_count:
+            probabilities[interior] = min(1.0, max(0.0, interior_mines / interior_count))
+        return probabilities.reshape(state.shape)
+
+    if interior_count:
+        interior_expected = total * interior_weights @ (interior_mines - np.arange(total.size))
+        probabilities[interior] = interior_expected / norm / interior_count
+
+    for number, (cells, weights, cell_weights) in enumerate(enumerated):
+        _check_cancelled(is_cancelled)
+        others, others_log = _convolve_normalized(prefix[number], suffix[number + 1])
+        factors = np.array([others @ interior_weights[mines:mines + others.size] for mines in range(weights.size)])
+        scale = math.exp(others_log - total_log)
+        probabilities[cells] = factors @ cell_weights * scale / norm
+
+    return probabilities.reshape(state.shape)
+
+
+def solve(board, row, col):
+    """Play board from the cell using logic only, return True if the board is solved without guessing."""
+    result, _revealed = board.uncover(row, col)
+    known_mines = np.zeros((board.rows, board.cols), dtype=bool)
+    while result not in {MoveResult.DEFEAT, MoveResult.VICTORY}:
+        safe, mines = find_moves(board.state, board.neighbours, known_mines, board.num_mines)
+        if not safe.any() and not mines.any():
+            return False
+        known_mines |= mines
+        if safe.any():  # all safe cells are uncovered by one pass
+            result, _revealed = board.uncover_cells(*np.nonzero(safe))
+    return result == MoveResult.VICTORY
+
+
+def no_guess_mines(rows, cols, mines, row, col, seed):
+    """Place mines randomly out of 3x3 area around the first cell (so the first cell opens a region)."""
+    rng = np.random.default_rng(seed)
+    free = np.ones((rows, cols), dtype=bool)
+    free[max(0, row - 1):row + 2, max(0, col - 1):col + 2] = False
+    free_cells = np.flatnonzero(free)
+    mines_mask = np.zeros(rows * cols, dtype=bool)
+    mines_mask[rng.choice(free_cells, size=mines, replace=False)] = True
+    return mines_mask.reshape(rows, cols)
+
+
+def find_no_guess_seed(rows, cols, mines, row, col, seed, attempts=NO_GUESS_ATTEMPTS):
+    """Check candidate boards with seeds spawned from seed, return the first solvable seed or None."""
+    for candidate in np.random.SeedSequence(seed).generate_state(attempts, dtype=np.uint64).tolist():
+        if solve(Board(no_guess_mines(rows, cols, mines, row, col, candidate)), row, col):
+            return candidate
+    return None
+
+
+class NoGuessGenerator:
+    """Generator of boards solvable without guessing, candidates are checked by a process pool."""
+
+    def __init__(self, workers=None, seed=None):
+        """Initialize (process pool is started on first use)."""
+        self._workers = workers or os.cpu_count() or 1
+        self._rng = np.random.default_rng(seed)
+        self._executor = None
+
+    @staticmethod
+    def can_generate(rows, cols, mines):
+        """Check if mines can be placed out of 3x3 area around the first cell."""
+        return mines <= rows * cols - 9
+
+    def generate(self, rows, cols, mines, row, col, timeout=NO_GUESS_TIMEOUT, is_cancelled=None):
+        """Generate board solvable from cell (row, col) without guessing, return None on timeout.
+
+        CalculationCancelledError is raised if is_cancelled() returns True (checked every NO_GUESS_POLL_PERIOD).
+        """
+        if not self.can_generate(rows, cols, mines):
+            return None
+        if self._executor is None:  # workers are spawned, forking a process with running threads isn't safe
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                self._workers, mp_context=multiprocessing.get_context("spawn")
+            )
+
+        deadline = time.monotonic() + timeout
+        pending = set()
+        try:
+            while (now := time.monotonic()) < deadline:
+                _check_cancelled(is_cancelled)
+                while len(pending) < self._workers:
+                    job_seed = int(self._rng.integers(2 ** 63))
+                    pending.add(self._executor.submit(find_no_guess_seed, rows, cols, mines, row, col, job_seed))
+                done, pending = concurrent.futures.wait(
+                    pending, timeout=min(deadline - now, NO_GUESS_POLL_PERIOD),
+                    return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    if (seed := future.result()) is not None:
+                        return Board(no_guess_mines(rows, cols, mines, row, col, seed), seed=seed)
+            return None
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def close(self):
+        """Shutdown process pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,194 @@
+"""Statistics of finished games stored in SQLite.
+
+Games are written by a background thread: every batch of games recorded while the previous batch was written
+is inserted in one transaction, so recording a game never waits for the disk. Per-preset summaries (games,
+wins, win streaks) are updated in the same transaction, leaderboards and best times are read by index,
+so the queries don't depend on the number of stored games. sqlite3 is imported by the first connection,
+so importing this module adds nothing to the game startup.
+"""
+
+import collections
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    finished_at REAL NOT NULL,
+    rows INTEGER NOT NULL,
+    cols INTEGER NOT NULL,
+    mines INTEGER NOT NULL,
+    won INTEGER NOT NULL,
+    time_ms INTEGER NOT NULL,
+    clicks INTEGER NOT NULL,
+    bbbv INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_leaderboard ON games (rows, cols, mines, won, time_ms);
+CREATE TABLE IF NOT EXISTS presets (
+    rows INTEGER NOT NULL,
+    cols INTEGER NOT NULL,
+    mines INTEGER NOT NULL,
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    current_streak INTEGER NOT NULL,
+    best_streak INTEGER NOT NULL,
+    PRIMARY KEY (rows, cols, mines)
+) WITHOUT ROWID;
+"""
+
+INSERT_GAME = """
+INSERT INTO games (finished_at, rows, cols, mines, won, time_ms, clicks, bbbv) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+SELECT_PRESET = "SELECT games, wins, current_streak, best_streak FROM presets WHERE rows = ? AND cols = ? AND mines = ?"
+UPDATE_PRESET = "INSERT OR REPLACE INTO presets VALUES (?, ?, ?, ?, ?, ?, ?)"
+
+
+class StatsError(Exception):
+    """Raised when statistics can't be read."""
+
+
+class GameRecord:
+    """Result of a finished game."""
+
+    def __init__(self, rows, cols, mines, won, time_ms, clicks, bbbv, finished_at=None):
+        """Initialize."""
+        self.rows, self.cols, self.mines = rows, cols, mines
+        self.won = bool(won)
+        self.time_ms = time_ms
+        self.clicks = clicks
+        self.bbbv = bbbv
+        self.finished_at = time.time() if finished_at is None else finished_at
+
+
+class PresetSummary:
+    """Summary of games with the same field size and number of mines."""
+
+    def __init__(self, rows, cols, mines, games, wins, current_streak, best_streak, best_time_ms):
+        """Initialize."""
+        self.rows, self.cols, self.mines = rows, cols, mines
+        self.games, self.wins = games, wins
+        self.current_streak, self.best_streak = current_streak, best_streak
+        self.best_time_ms = best_time_ms  # None if there are no wins
+
+
+class StatsStore:
+    """SQLite store of game statistics with asynchronous batched writes."""
+
+    def __init__(self, path):
+        """Open store (database is created by writer thread if it doesn't exist)."""
+        self._path = str(path)
+        self._pending = collections.deque()
+        self._condition = threading.Condition()
+        self._writing = False
+        self._closed = False
+        self._stopped = False  # writer thread is stopped (closed or database can't be opened)
+        self._reader = None
+        self.last_error = None  # last error of writer thread
+        self._thread = threading.Thread(target=self._writer, name="StatsStore", daemon=True)
+        self._thread.start()
+
+    def record(self, record):
+        """Queue finished game for writing (returns immediately)."""
+        with self._condition:
+            self._pending.append(record)
+            self._condition.notify_all()
+
+    def flush(self):
+        """Wait until queued games are written."""
+        with self._condition:
+            self._condition.wait_for(lambda: (not self._pending and not self._writing) or self._stopped)
+
+    def close(self):
+        """Write queued games and stop writer thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def _connect(self):
+        """Open connection to database in WAL mode (readers don't wait for writer)."""
+        import sqlite3
+        connection = sqlite3.connect(self._path)
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        return connection
+
+    def _writer(self):
+        """Write queued games by batches (executed by writer thread)."""
+        import sqlite3
+        connection = None
+        try:
+            connection = self._connect()
+            connection.executescript(SCHEMA)
+            while True:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
+                    self._condition.wait_for(lambda: self._pending or self._closed)
+                    if not self._pending:
+                        return
+                    batch = list(self._pending)
+                    self._pending.clear()
+                    self._writing = True
+                try:
+                    with connection:
+                        self._write_batch(connection, batch)
+                except sqlite3.Error as e:  # batch is dropped, next batches are written
+                    self.last_error = e
+        except sqlite3.Error as e:
+            self.last_error = e
+        finally:
+            if connection is not None:
+                connection.close()
+            with self._condition:
+                self._writing = False
+                self._stopped = True
+                self._condition.notify_all()
+
+    @staticmethod
+    def _write_batch(connection, batch):
+        """Insert games and update preset summaries in current transaction."""
+        connection.executemany(INSERT_GAME, [
+            (record.finished_at, record.rows, record.cols, record.mines, int(record.won), record.time_ms,
+             record.clicks, record.bbbv)
+            for record in batch
+        ])
+        for record in batch:
+            preset = (record.rows, record.cols, record.mines)
+            row = connection.execute(SELECT_PRESET, preset).fetchone()
+            games, wins, current_streak, best_streak = row if row else (0, 0, 0, 0)
+            current_streak = current_streak + 1 if record.won else 0
+            connection.execute(UPDATE_PRESET, (*preset, games + 1, wins + record.won, current_streak,
+                                               max(best_streak, current_streak)))
+
+    def _read(self, query, parameters=()):
+        """Execute read query, return all rows (queued games are written before), raise StatsError on failure."""
+        import sqlite3
+        self.flush()
+        try:
+            if self._reader is None:
+                self._reader = self._connect()
+            return self._reader.execute(query, parameters).fetchall()
+        except sqlite3.Error as e:
+            raise StatsError(str(e)) from e
+
+    def presets(self):
+        """Get summaries of all played presets, most played first."""
+        rows = self._read(
+            "SELECT rows, cols, mines, games, wins, current_streak, best_streak, "
+            "(SELECT MIN(time_ms) FROM games AS g WHERE g.rows = p.rows AND g.cols = p.cols AND g.mines = p.mines "
+            "AND g.won = 1) FROM presets AS p ORDER BY games DESC, rows, cols, mines"
+        )
+        return [PresetSummary(*row) for row in rows]
+
+    def leaderboard(self, rows, cols, mines, limit=10):
+        """Get best won games of preset (fastest first)."""
+        records = self._read(
+            "SELECT rows, cols, mines, won, time_ms, clicks, bbbv, finished_at FROM games "
+            "WHERE rows = ? AND cols = ? AND mines = ? AND won = 1 ORDER BY time_ms, id LIMIT ?",
+            (rows, cols, mines, limit),
+        )
+        return [GameRecord(*record) for record in records]
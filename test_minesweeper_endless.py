@@ -0,0 +1,121 @@
+"""Tests of endless field: chunk generation, eviction and flood across chunks."""
+
+import collections
+
+import numpy as np
+import pytest
+
+import minesweeper_endless
+from minesweeper_endless import EndlessBoard, EndlessView
+from minesweeper_engine import CellState, MoveResult, count_neighbours
+
+
+def reference_flood(board, row, col):
+    """Get cells uncovered from cell by cell by cell flood (flags stop the flood), board isn't changed."""
+    uncovered = set()
+    queue = collections.deque([(row, col)])
+    while queue:
+        row, col = queue.popleft()
+        if (row, col) in uncovered or board.cell_state(row, col) != CellState.COVERED:
+            continue
+        uncovered.add((row, col))
+        if board.cell_neighbours(row, col) == 0:
+            queue.extend((row + i, col + j) for i in (-1, 0, 1) for j in (-1, 0, 1))
+    return uncovered
+
+
+def test_chunks_are_reproducible_and_numbers_cross_chunks():
+    """The same seed gives the same mines, numbers count mines of neighbour chunks."""
+    board = EndlessBoard(0.2, seed=7, chunk_size=8, max_chunks=4)
+    _state, neighbours, mines = board.region(-20, -20, 40, 40)
+    _state, _neighbours, padded_mines = board.region(-21, -21, 42, 42)
+    assert np.array_equal(count_neighbours(padded_mines)[1:-1, 1:-1], neighbours)
+    assert np.array_equal(EndlessBoard(0.2, seed=7, chunk_size=8).region(-20, -20, 40, 40)[2], mines)
+    assert not mines[19:22, 19:22].any()  # safe start area
+
+
+def test_evicted_chunks_keep_changed_states():
+    """Least recently used chunks are evicted, states of changed chunks are restored on load."""
+    board = EndlessBoard(0.2, seed=1, chunk_size=8, max_chunks=4)
+    mines = board.region(0, 0, 8, 8)[2].copy()
+    board.toggle_flag(3, 3)
+    board.region(100, 100, 24, 24)  # 9 chunks, the first one is evicted
+    assert board.loaded_chunks == 4
+    assert board.stored_deltas == 1  # only changed chunk is stored
+    assert board.cell_state(3, 3) == CellState.COVERED_FLAG
+    assert np.array_equal(board.region(0, 0, 8, 8)[2], mines)
+    assert board.stored_deltas == 0
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_flood_matches_cell_by_cell_flood(seed):
+    """Chunk by chunk flood uncovers the same cells as cell by cell flood, also with flags and evictions."""
+    rng = np.random.default_rng(seed)
+    board = EndlessBoard(0.12, seed=seed, chunk_size=8, max_chunks=16)
+    for row, col in rng.integers(-30, 30, (10, 2)).tolist():
+        board.toggle_flag(row, col)
+    for row, col in [(0, 0), *rng.integers(-40, 40, (20, 2)).tolist()]:
+        if board.finished:
+            break
+        state, _neighbours, mines = board.region(row, col, 1, 1)
+        if mines[0, 0] or state[0, 0] != CellState.COVERED:
+            continue
+        expected = reference_flood(board, row, col)
+        uncovered_before = board.uncovered_cells
+        _result, (rows, cols) = board.uncover(row, col)
+        assert set(zip(rows.tolist(), cols.tolist())) == expected
+        assert board.uncovered_cells == uncovered_before + len(expected)
+        assert all(board.cell_state(*cell) == CellState.UNCOVERED for cell in expected)
+
+
+def test_flood_stopped_by_limit_is_continued(monkeypatch):
+    """Seeds left by flood stopped at MAX_FLOOD_CELLS are uncovered by the next moves, no cell is lost."""
+    monkeypatch.setattr(minesweeper_endless, "MAX_FLOOD_CELLS", 30)
+    board = EndlessBoard(0.12, seed=6, chunk_size=8)
+    expected = reference_flood(board, 0, 0)
+    _result, (rows, cols) = board.uncover(0, 0)
+    revealed = set(zip(rows.tolist(), cols.tolist()))
+    assert 30 <= len(revealed) < len(expected)
+
+    state, neighbours, mines = board.region(1000, 0, 1, 100)
+    numbers = np.flatnonzero((state[0] == CellState.COVERED) & ~mines[0] & (neighbours[0] > 0)).tolist()
+    moves = 0
+    for col in numbers:  # every move uncovers a single number cell and continues the flood
+        if revealed == expected:
+            break
+        _result, (rows, cols) = board.uncover(1000, col)
+        moves += 1
+        revealed |= set(zip(rows.tolist(), cols.tolist())) - {(1000, col)}
+    assert revealed == expected
+    assert board.uncovered_cells == len(expected) + moves
+
+
+def test_view_moves_over_board():
+    """View translates window cells to board cells, cells out of window are dropped."""
+    board = EndlessBoard(0.2, seed=3, chunk_size=8)
+    view = EndlessView(board, 10, 10)
+    view.set_origin(4, 4)
+    result, (rows, cols) = view.uncover(4, 4)
+    assert result == MoveResult.CONTINUE
+    assert view.state[4, 4] == board.cell_state(0, 0) == CellState.UNCOVERED
+    assert ((rows >= 0) & (rows < 10) & (cols >= 0) & (cols < 10)).all()
+    assert view.recenter(9, 0) == (4, -5)
+    assert view.state[0, 9] == board.cell_state(0, 0)
+
+
+def test_wrong_flag_chord_remembers_exploded_cell():
+    """Chord with wrong flag explodes the mined cell around the number, view gives it in window coordinates."""
+    board = EndlessBoard(0.3, seed=5, chunk_size=8)
+    view = EndlessView(board, 20, 20)
+    state, neighbours, mines = board.region(-10, -10, 20, 20)
+    number = np.argwhere((state == CellState.COVERED) & ~mines & (neighbours > 0))
+    row, col = next((row, col) for row, col in number.tolist() if 1 <= row < 19 and 1 <= col < 19)
+    view.uncover(row, col)
+    safe = ~mines[row - 1:row + 2, col - 1:col + 2]
+    safe[1, 1] = False
+    for i, j in np.argwhere(safe)[:neighbours[row, col]].tolist():
+        assert view.toggle_flag(row - 1 + i, col - 1 + j)
+    assert view.chord(row, col)[0] == MoveResult.DEFEAT
+    exploded_row, exploded_col = view.exploded_cell
+    assert mines[exploded_row, exploded_col] and max(abs(exploded_row - row), abs(exploded_col - col)) == 1
+    assert board.exploded_cell == (exploded_row - 10, exploded_col - 10)
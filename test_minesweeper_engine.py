@@ -0,0 +1,182 @@
+"""Tests of board engine: reveal, chord, flags, mine moving and animation frames."""
+
+import collections
+
+import numpy as np
+import pytest
+
+from minesweeper_engine import Board, CellState, MoveResult, count_neighbours, defuse_frames, explode_frames
+
+MINES = np.array([
+    [0, 0, 0, 0, 1],
+    [0, 0, 0, 0, 0],
+    [0, 0, 0, 0, 0],
+    [1, 0, 0, 0, 0],
+], dtype=bool)
+
+
+def reference_reveal(board, seeds):
+    """Get cells uncovered from seeds by cell by cell flood (flags stop the flood)."""
+    state = board.state.copy()
+    revealed = set()
+    queue = collections.deque(seeds)
+    while queue:
+        row, col = queue.popleft()
+        if not (0 <= row < board.rows and 0 <= col < board.cols) or state[row, col] != CellState.COVERED:
+            continue
+        state[row, col] = CellState.UNCOVERED
+        revealed.add((row, col))
+        if board.neighbours[row, col] == 0:
+            queue.extend((row + i, col + j) for i in (-1, 0, 1) for j in (-1, 0, 1))
+    return revealed
+
+
+def cells(revealed):
+    """Convert (rows, cols) arrays to set of cells."""
+    return set(zip(np.asarray(revealed[0]).tolist(), np.asarray(revealed[1]).tolist()))
+
+
+def test_neighbours_are_counted_without_cell_itself():
+    """Numbers count mines in 3x3 area without the cell."""
+    board = Board(MINES)
+    assert board.neighbours.tolist() == [
+        [0, 0, 0, 1, 0],
+        [0, 0, 0, 1, 1],
+        [1, 1, 0, 0, 0],
+        [0, 1, 0, 0, 0],
+    ]
+    assert board.num_mines == 2
+
+
+def test_reveal_uncovers_region_with_its_border():
+    """Uncover of cell without mines around uncovers its whole region and numbers around it."""
+    board = Board(MINES)
+    result, revealed = board.uncover(0, 0)
+    assert result == MoveResult.VICTORY
+    assert cells(revealed) == {(row, col) for row in range(4) for col in range(5)} - {(0, 4), (3, 0)}
+    assert board.uncovered_cells == 18
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_reveal_matches_cell_by_cell_flood(seed):
+    """Array reveal uncovers the same cells as flood, also when flags are set inside regions."""
+    rng = np.random.default_rng(seed)
+    board = Board.random(20, 30, 60, seed=seed)
+    for row, col in rng.integers(0, (20, 30), (15, 2)).tolist():
+        board.toggle_flag(row, col)
+    for row, col in np.argwhere(~board.mines)[rng.permutation(540)[:10]].tolist():
+        if board.finished:
+            break
+        expected = reference_reveal(board, [(row, col)])
+        uncovered_before = board.uncovered_cells
+        _result, revealed = board.uncover(row, col)
+        assert cells(revealed) == expected
+        assert board.uncovered_cells == uncovered_before + len(expected)
+    assert board.uncovered_cells == np.count_nonzero(board.state == CellState.UNCOVERED)
+
+
+def test_uncover_mine_is_defeat():
+    """Uncover of mined cell finishes the game and remembers exploded cell, next moves are ignored."""
+    board = Board(MINES)
+    result, revealed = board.uncover(3, 0)
+    assert result == MoveResult.DEFEAT
+    assert not revealed[0].size
+    assert board.finished and board.exploded_cell == (3, 0)
+    assert board.uncover(0, 0)[0] == MoveResult.IGNORED
+    assert not board.toggle_flag(0, 0)
+
+
+def test_flag_blocks_uncover():
+    """Flagged cell isn't uncovered until flag is removed."""
+    board = Board(MINES)
+    assert board.toggle_flag(1, 1)
+    assert board.flagged_cells == 1
+    assert board.uncover(1, 1)[0] == MoveResult.IGNORED
+    assert board.toggle_flag(1, 1)
+    assert board.flagged_cells == 0
+    assert board.uncover(1, 1)[0] != MoveResult.IGNORED
+
+
+def test_chord_uncovers_cells_around_when_flags_match_number():
+    """Chord uncovers not flagged cells around number if number of flags around equals it."""
+    board = Board(MINES)
+    board.uncover(1, 3)
+    assert board.chord(1, 3)[0] == MoveResult.IGNORED  # no flags around
+    board.toggle_flag(0, 4)
+    expected = reference_reveal(board, [(0, 2), (0, 3), (1, 2), (1, 4), (2, 2), (2, 3), (2, 4)])
+    result, revealed = board.chord(1, 3)
+    assert result == MoveResult.VICTORY
+    assert cells(revealed) == expected
+    assert board.state[0, 4] == CellState.COVERED_FLAG
+
+
+def test_chord_with_wrong_flag_is_defeat():
+    """Chord uncovers mine if flag is set on not mined cell."""
+    board = Board(MINES)
+    board.uncover(1, 3)
+    board.toggle_flag(0, 3)
+    assert board.chord(1, 3)[0] == MoveResult.DEFEAT
+    assert board.exploded_cell == (0, 4)
+
+
+def test_uncover_cells_counts_repeated_cells_once():
+    """Batch uncover skips repeated and not covered cells."""
+    board = Board(MINES)
+    result, revealed = board.uncover_cells([1, 1, 2, 1], [3, 3, 0, 3])
+    assert result == MoveResult.CONTINUE
+    assert cells(revealed) == {(1, 3), (2, 0)}
+    assert board.uncovered_cells == 2
+    assert board.uncover_cells([1, 2], [3, 0])[0] == MoveResult.IGNORED
+
+
+def test_flag_cells_counts_repeated_cells_once():
+    """Batch flag skips repeated and not covered cells."""
+    board = Board(MINES)
+    board.uncover(1, 3)
+    flagged = board.flag_cells([0, 0, 1, 3, 0], [4, 4, 3, 0, 4])
+    assert cells(flagged) == {(0, 4), (3, 0)}
+    assert board.flagged_cells == 2
+    assert np.count_nonzero(board.state == CellState.COVERED_FLAG) == 2
+
+
+def test_first_uncovered_mine_is_moved():
+    """Mine under the first uncovered cell is moved away if first move is safe, numbers are recalculated."""
+    mines = np.zeros((5, 5), dtype=bool)
+    mines[2, 2] = mines[0, 0] = True
+    board = Board(mines, first_move_safe=True)
+    result, _revealed = board.uncover(2, 2)
+    assert result != MoveResult.DEFEAT
+    assert not board.is_mined(2, 2)
+    assert board.num_mines == np.count_nonzero(board.mines) == 2
+    assert board.mines[0, 1]  # the first not mined cell
+    assert np.array_equal(board.neighbours, count_neighbours(board.mines))
+
+
+def test_restore_state_recalculates_counters():
+    """Counters are restored from cell states, uncovered mine is rejected."""
+    board = Board(MINES)
+    state = np.zeros(MINES.shape, dtype=np.uint8)
+    state[1, 1] = CellState.UNCOVERED
+    state[0, 4] = CellState.COVERED_FLAG
+    board.restore_state(state)
+    assert (board.uncovered_cells, board.flagged_cells, board.result) == (1, 1, MoveResult.CONTINUE)
+    state[3, 0] = CellState.UNCOVERED
+    with pytest.raises(ValueError):
+        board.restore_state(state)
+
+
+def test_animation_frames_cover_all_mines_in_limited_frames():
+    """Explode and defuse frames show every mine once per state and fit into max_frames."""
+    board = Board.random(100, 100, 2000, seed=1)
+    for max_frames in (None, 10):
+        frames = explode_frames(board, 50, 50, max_frames)
+        assert max_frames is None or len(frames) <= max_frames
+        for cell_state in (CellState.UNCOVERED_MINE, CellState.UNCOVERED_MINE_BAD):
+            shown = [cell for rows, cols, state in frames if state == cell_state for cell in zip(rows, cols)]
+            assert sorted(shown) == sorted(map(tuple, np.argwhere(board.mines)))
+        distances = [np.maximum(abs(rows - 50), abs(cols - 50)) for rows, cols, _state in frames[::2]]
+        assert all(first.max() < second.min() for first, second in zip(distances, distances[1:]))
+
+        frames = defuse_frames(board, max_frames)
+        assert max_frames is None or len(frames) <= max_frames
+        assert sum(rows.size for rows, _cols, _state in frames) == board.num_mines
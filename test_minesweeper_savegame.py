@@ -0,0 +1,140 @@
+"""Tests of binary saved game format and move log."""
+
+import numpy as np
+import pytest
+
+from minesweeper_engine import Board, CellState, MoveResult
+from minesweeper_savegame import (
+    SAVE_HEADER, SAVE_MAGIC, MoveKind, MoveLog, dumps_game, load_game, loads_game, pack_states, read_log, replay,
+    save_game, unpack_states,
+)
+
+
+def played_board():
+    """Get unfinished board with uncovered and flagged cells."""
+    board = Board.random(13, 7, 15, seed=2 ** 70 + 5, first_move_safe=True)
+    board.uncover(6, 3)
+    board.toggle_flag(*np.argwhere(board.mines)[0])
+    board.toggle_flag(*np.argwhere(board.state == CellState.COVERED)[-1])
+    assert not board.finished
+    return board
+
+
+def test_states_are_packed_by_two_bits():
+    """Four cells are packed into one byte, first cell in high bits."""
+    state = np.array([[0, 1, 2], [2, 1, 0]], dtype=np.uint8)
+    packed = pack_states(state)
+    assert packed.tolist() == [0b00011010, 0b01000000]
+    assert np.array_equal(unpack_states(packed.tobytes(), 2, 3), state)
+
+
+def test_saved_game_layout():
+    """Saved game is header, seed, bit-packed mines and 2-bit states."""
+    board = played_board()
+    data = dumps_game(board, elapsed_ms=12345)
+    magic, version, flags, rows, cols, elapsed_ms, seed_size = SAVE_HEADER.unpack_from(data)
+    assert (magic, version, flags, rows, cols, elapsed_ms) == (SAVE_MAGIC, 1, 1, 13, 7, 12345)
+    assert int.from_bytes(data[SAVE_HEADER.size:SAVE_HEADER.size + seed_size], "little") == board.seed
+    assert len(data) == SAVE_HEADER.size + seed_size + -(-91 // 8) + -(-91 // 4)
+    mines_offset = SAVE_HEADER.size + seed_size
+    assert data[mines_offset:mines_offset + 12] == np.packbits(board.mines).tobytes()
+
+
+def test_saved_game_round_trip(tmp_path):
+    """Loaded board has the same mines, states, counters, seed and elapsed time."""
+    board = played_board()
+    save_game(tmp_path / "game.sav", board, elapsed_ms=777)
+    loaded, elapsed_ms = load_game(tmp_path / "game.sav")
+    assert elapsed_ms == 777
+    assert np.array_equal(loaded.mines, board.mines)
+    assert np.array_equal(loaded.state, board.state)
+    assert (loaded.uncovered_cells, loaded.flagged_cells) == (board.uncovered_cells, board.flagged_cells)
+    assert (loaded.seed, loaded.first_move_safe) == (board.seed, board.first_move_safe)
+    assert not (tmp_path / "game.sav.tmp").exists()
+
+
+def test_board_without_seed_is_saved():
+    """Seed is optional."""
+    board = Board(played_board().mines)
+    loaded, _elapsed_ms = loads_game(dumps_game(board))
+    assert loaded.seed is None
+    assert np.array_equal(loaded.mines, board.mines)
+
+
+@pytest.mark.parametrize("corrupt", [
+    lambda data: data[:5],
+    lambda data: data[:-1],
+    lambda data: data + b"\0",
+    lambda data: b"XXXX" + data[4:],
+    lambda data: data[:4] + b"\x02" + data[5:],
+])
+def test_broken_saved_game_is_rejected(corrupt):
+    """Truncated, extended or unknown data raises ValueError."""
+    with pytest.raises(ValueError):
+        loads_game(corrupt(dumps_game(played_board())))
+
+
+def test_finished_game_isnt_saved():
+    """Only unfinished game can be saved."""
+    board = played_board()
+    board.uncover(*np.argwhere(board.mines & (board.state == CellState.COVERED))[0])
+    with pytest.raises(ValueError):
+        dumps_game(board)
+
+
+def test_move_log_replay(tmp_path):
+    """Replayed log gives the same board, truncated last record is ignored."""
+    path = tmp_path / "moves.log"
+    board = Board.random(10, 10, 12, seed=1, first_move_safe=True)
+    log = MoveLog(path)
+    log.start(board)
+    moves = [(MoveKind.UNCOVER, 5, 5), (MoveKind.FLAG, 0, 0), (MoveKind.FLAG, 0, 0), (MoveKind.FLAG, 9, 9)]
+    moves += [(MoveKind.UNCOVER, int(row), int(col)) for row, col in np.argwhere(~board.mines)[:5]]
+    for kind, row, col in moves:
+        log.write_move(kind, row, col)
+        if kind == MoveKind.UNCOVER:
+            board.uncover(row, col)
+        else:
+            board.toggle_flag(row, col)
+    log.close()
+
+    records = list(read_log(path))
+    assert records[0][0] == MoveKind.BOARD
+    assert [record[:3] for record in records[1:]] == moves
+    assert np.array_equal(replay(path).state, board.state)
+
+    with open(path, "ab") as file:
+        file.write(bytes([MoveKind.UNCOVER, 1, 2]))
+    assert len(list(read_log(path))) == len(records)
+
+
+def test_batch_uncover_is_replayed_at_once(tmp_path):
+    """Batch uncover with a mine (wrong flag was trusted) is replayed as defeat without uncovered cells."""
+    path = tmp_path / "moves.log"
+    board = Board(np.array([[0, 0, 0, 0, 1], [0, 0, 0, 0, 0], [0, 0, 0, 0, 0], [1, 0, 0, 0, 0]], dtype=bool))
+    log = MoveLog(path)
+    log.start(board)
+    log.write_move(MoveKind.UNCOVER, 1, 3)
+    board.uncover(1, 3)
+    log.write_move(MoveKind.FLAG, 0, 3)
+    board.toggle_flag(0, 3)
+    rows, cols = [0, 0, 1, 2, 2, 2, 1], [2, 4, 2, 2, 3, 4, 4]  # safe cells by the wrong flag, mine at (0, 4)
+    log.write_uncover_cells(rows, cols)
+    assert board.uncover_cells(rows, cols)[0] == MoveResult.DEFEAT
+    log.close()
+
+    moves = []
+    replayed = replay(path, on_move=lambda kind, row, col, time_ms, result, revealed: moves.append((kind, result)))
+    assert moves[-1] == (MoveKind.UNCOVER_CELLS, MoveResult.DEFEAT)
+    assert replayed.exploded_cell == board.exploded_cell == (0, 4)
+    assert replayed.uncovered_cells == board.uncovered_cells == 1
+    assert np.array_equal(replayed.state, board.state)
+
+
+def test_move_log_is_disabled_when_file_cant_be_written(tmp_path):
+    """Log can't be opened: moves are ignored and error is kept."""
+    log = MoveLog(tmp_path)  # directory can't be opened as file
+    log.start(Board.random(5, 5, 3, seed=1))
+    log.write_move(MoveKind.UNCOVER, 0, 0)
+    log.close()
+    assert isinstance(log.error, OSError)
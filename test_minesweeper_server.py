@@ -0,0 +1,153 @@
+"""Tests of JSON-lines protocol of the game server."""
+
+import asyncio
+import json
+
+import numpy as np
+
+from minesweeper_server import GameServer
+
+
+class FakeWriter:
+    """Stream writer of spectator collecting sent messages."""
+
+    def __init__(self):
+        """Initialize."""
+        self.messages = []
+
+    def is_closing(self):
+        """Writer is never closed."""
+        return False
+
+    def write(self, data):
+        """Collect message."""
+        self.messages.append(json.loads(data))
+
+
+def request(server, writer=None, **fields):
+    """Send request line to server, return response."""
+    return server.handle_line(json.dumps(fields).encode(), writer)
+
+
+def new_game(server, rows=9, cols=9, mines=10, seed=1):
+    """Start game, return its id and mines mask (same seed gives the same mines)."""
+    response = request(server, id=1, op="new", rows=rows, cols=cols, mines=mines, seed=seed, first_move_safe=False)
+    assert response["ok"]
+    return response["game"], server.games[response["game"]].board.mines
+
+
+def test_new_game_and_uncover():
+    """Uncover response contains uncovered cells with numbers."""
+    server = GameServer()
+    game_id, mines = new_game(server)
+    row, col = np.argwhere(~mines)[0].tolist()
+    response = request(server, id=2, op="uncover", game=game_id, row=row, col=col)
+    assert response["id"] == 2 and response["ok"]
+    assert response["result"] in {"continue", "victory"}
+    board = server.games[game_id].board
+    assert sorted(map(tuple, response["uncovered"])) == sorted(
+        (row, col, int(board.neighbours[row, col])) for row, col in np.argwhere(board.state == 2).tolist())
+
+
+def test_same_seed_gives_same_mines():
+    """Games with the same seed are the same."""
+    server = GameServer()
+    first_id, first_mines = new_game(server, seed=42)
+    second_id, second_mines = new_game(server, seed=42)
+    assert first_id != second_id
+    assert np.array_equal(first_mines, second_mines)
+    assert request(server, op="list")["games"] == [first_id, second_id]
+
+
+def test_flag_and_state():
+    """State shows flags and uncovered numbers as row strings."""
+    server = GameServer()
+    game_id, _mines = new_game(server)
+    assert request(server, op="flag", game=game_id, row=0, col=0)["flagged"] == [[0, 0]]
+    state = request(server, op="state", game=game_id)
+    assert state["cells"][0] == "F........"
+    assert request(server, op="flag", game=game_id, row=0, col=0)["unflagged"] == [[0, 0]]
+
+
+def test_defeat_reveals_mines():
+    """Move on mine finishes the game and response contains all mines."""
+    server = GameServer()
+    game_id, mines = new_game(server)
+    row, col = np.argwhere(mines)[0].tolist()
+    response = request(server, op="uncover", game=game_id, row=row, col=col)
+    assert response["result"] == "defeat"
+    assert sorted(map(tuple, response["mines"])) == sorted(map(tuple, np.argwhere(mines).tolist()))
+    assert request(server, op="uncover", game=game_id, row=0, col=0)["result"] == "ignored"
+
+
+def test_batch_skips_moves_after_game_end():
+    """Batch returns result of every made move, moves after defeat are skipped."""
+    server = GameServer()
+    game_id, mines = new_game(server)
+    (safe_row, safe_col), (mine_row, mine_col) = np.argwhere(~mines)[0].tolist(), np.argwhere(mines)[0].tolist()
+    moves = [["flag", mine_row, mine_col], ["flag", mine_row, mine_col], ["uncover", mine_row, mine_col],
+             ["uncover", safe_row, safe_col]]
+    results = request(server, op="batch", game=game_id, moves=moves)["results"]
+    assert [result["result"] for result in results] == ["continue", "continue", "defeat"]
+
+
+def test_invalid_batch_changes_nothing():
+    """Batch with invalid move is rejected before any move is made."""
+    server = GameServer()
+    game_id, _mines = new_game(server)
+    for bad_move in (["uncover", 9, 0], ["jump", 0, 0]):
+        response = request(server, op="batch", game=game_id, moves=[["flag", 0, 0], bad_move])
+        assert not response["ok"]
+        assert response["error"].startswith("Move 1: ")
+    assert server.games[game_id].board.flagged_cells == 0
+
+
+def test_errors():
+    """Errors are reported with request id."""
+    server = GameServer()
+    assert server.handle_line(b"not json", None)["error"].startswith("Invalid JSON")
+    assert request(server, id=5, op="nope", game=1) == {"id": 5, "ok": False, "error": "Unknown game 1"}
+    assert not request(server, op="new", rows=100000, cols=100000, mines=1)["ok"]
+    assert not request(server, op="new", rows=3, cols=3, mines=9)["ok"]
+    game_id, _mines = new_game(server)
+    assert request(server, op="nope", game=game_id)["error"] == "Unknown operation 'nope'"
+    assert not request(server, op="uncover", game=game_id, row=-1, col=0)["ok"]
+
+
+def test_spectator_gets_moves():
+    """Watcher gets every move of the game and game close."""
+    server = GameServer()
+    game_id, _mines = new_game(server)
+    watcher = FakeWriter()
+    assert request(server, watcher, op="watch", game=game_id)["cells"][0] == "........."
+    request(server, op="flag", game=game_id, row=2, col=3)
+    request(server, op="close", game=game_id)
+    assert watcher.messages == [
+        {"event": "move", "game": game_id, "move": "flag", "row": 2, "col": 3, "flagged": [[2, 3]],
+         "result": "continue"},
+        {"event": "closed", "game": game_id},
+    ]
+    assert request(server, op="list")["games"] == []
+
+
+def test_server_over_socket():
+    """Requests and responses are sent as JSON lines over TCP."""
+    async def session():
+        game_server = GameServer()
+        server = await asyncio.start_server(game_server.handle_client, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        responses = []
+        for line in ({"id": 1, "op": "new", "rows": 5, "cols": 5, "mines": 3, "seed": 3}, {"id": 2, "op": "list"}):
+            writer.write(json.dumps(line).encode() + b"\n")
+            await writer.drain()
+            responses.append(json.loads(await reader.readline()))
+        writer.close()
+        await writer.wait_closed()
+        server.close()
+        await server.wait_closed()
+        return responses
+
+    new, games = asyncio.run(session())
+    assert new == {"id": 1, "ok": True, "game": 1, "rows": 5, "cols": 5, "mines": 3, "seed": 3}
+    assert games == {"id": 2, "ok": True, "games": [1]}
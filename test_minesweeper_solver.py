@@ -0,0 +1,92 @@
+"""Tests of solver soundness: moves and probabilities are checked against exact enumeration of mines."""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from minesweeper_engine import Board, CellState
+from minesweeper_solver import (
+    CalculationCancelledError, find_moves, frontier_constraints, mine_probabilities, solve, split_components,
+)
+
+
+def consistent_mines(board, known_mines):
+    """Get all mines masks (layouts, rows, cols) matching visible numbers, known mines and number of mines."""
+    unknown = np.flatnonzero((board.state <= CellState.COVERED_FLAG) & ~known_mines)
+    remaining = board.num_mines - int(np.count_nonzero(known_mines))
+    combinations = np.array(list(itertools.combinations(unknown, remaining)), dtype=np.intp)
+    layouts = np.repeat(known_mines.ravel()[np.newaxis], len(combinations), axis=0)
+    layouts[np.arange(len(combinations))[:, np.newaxis], combinations] = True
+    layouts = layouts.reshape(-1, board.rows, board.cols)
+
+    padded = np.pad(layouts, ((0, 0), (1, 1), (1, 1))).astype(np.uint8)
+    numbers = sum(padded[:, i:i + board.rows, j:j + board.cols] for i in range(3) for j in range(3)) - layouts
+    uncovered = board.state == CellState.UNCOVERED
+    return layouts[(numbers[:, uncovered] == board.neighbours[uncovered]).all(axis=1)]
+
+
+def random_position(seed):
+    """Get small board with some safe cells uncovered and some mines flagged."""
+    rng = np.random.default_rng(seed)
+    board = Board.random(4, 5, int(rng.integers(2, 7)), seed=seed)
+    for row, col in rng.permutation(np.argwhere(~board.mines))[:rng.integers(1, 5)].tolist():
+        board.uncover(row, col)
+    for row, col in rng.permutation(np.argwhere(board.mines))[:rng.integers(0, 2)].tolist():
+        board.toggle_flag(row, col)
+    return board
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_find_moves_is_sound(seed):
+    """Every found safe cell is safe and every found mine is mined in all consistent layouts."""
+    board = random_position(seed)
+    if board.finished:
+        return
+    known_mines = board.state == CellState.COVERED_FLAG
+    safe, mines = find_moves(board.state, board.neighbours, known_mines, board.num_mines)
+    layouts = consistent_mines(board, known_mines)
+    assert not (safe & layouts).any()
+    assert (layouts[:, mines]).all()
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_mine_probabilities_match_enumeration(seed):
+    """Probabilities are shares of consistent layouts with mine in the cell, other cells get NaN."""
+    board = random_position(seed)
+    if board.finished:
+        return
+    known_mines = board.state == CellState.COVERED_FLAG
+    probabilities = mine_probabilities(board.state, board.neighbours, known_mines, board.num_mines)
+    expected = consistent_mines(board, known_mines).mean(axis=0)
+    unknown = (board.state <= CellState.COVERED_FLAG) & ~known_mines
+    assert np.allclose(probabilities[unknown], expected[unknown])
+    assert np.isnan(probabilities[~unknown]).all()
+
+
+def test_components_are_independent():
+    """Constraints are split by shared cells only."""
+    board = Board(np.array([
+        [1, 0, 0, 0, 0, 0, 1],
+        [0, 0, 0, 0, 0, 0, 0],
+    ], dtype=bool))
+    board.uncover(1, 3)
+    constraints = frontier_constraints(board.state, board.neighbours, np.zeros((2, 7), dtype=bool))
+    assert len(split_components(constraints)) == 2
+
+
+def test_cancelled_calculation_raises():
+    """Calculation stops when is_cancelled returns True."""
+    board = Board.random(30, 30, 150, seed=1, first_move_safe=True)
+    board.uncover(15, 15)
+    with pytest.raises(CalculationCancelledError):
+        mine_probabilities(board.state, board.neighbours, np.zeros((30, 30), dtype=bool), board.num_mines,
+                           is_cancelled=lambda: True)
+
+
+def test_solve_wins_board_without_guessing():
+    """Solver never uncovers mine: it either wins or stops when guessing is needed."""
+    for seed in range(20):
+        board = Board.random(9, 9, 10, seed=seed, first_move_safe=True)
+        solve(board, 4, 4)
+        assert board.exploded_cell is None